@@ -8,4 +8,24 @@ import sys
 def add_notion_to_sys_path() -> None:
     root_dir = pathlib.Path(__file__).parent.parent
     assert (root_dir / "auto_notion" / "__init__.py").exists()
-    sys.path.append(os.fspath(root_dir))
+    if os.fspath(root_dir) not in sys.path:
+        sys.path.append(os.fspath(root_dir))
+
+
+def get_client(token=None, **transport_options):
+    """Returns the shared `auto_notion` client.
+
+    The client shares the connection pool, rate limiter & retries of all the
+    `auto_notion` databases of the process.
+
+    Args:
+        token: Notion token (default to `$NOTION_API_TOKEN`)
+        **transport_options: Forwarded to `auto_notion.transport.configure`
+            (e.g. `max_connections=64`, `read_timeout=30`)
+    """
+    add_notion_to_sys_path()
+    from auto_notion import transport, utils
+
+    if transport_options:
+        transport.configure(**transport_options)
+    return utils.get_client(token)
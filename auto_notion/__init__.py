@@ -9,4 +9,15 @@ if sys.version_info < (3, 11):
 
 del sys
 
+from auto_notion.async_database import AsyncDatabase
+from auto_notion.checkpoint import Checkpoint
 from auto_notion.database import Database
+
+
+def __getattr__(name: str):
+    # Optional exports, imported on first use (e.g. `sqlite3`)
+    if name == "SQLiteMirror":
+        from auto_notion.sqlite_mirror import SQLiteMirror
+
+        return SQLiteMirror
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,187 @@
+"""Arrow / Parquet snapshots of a database.
+
+```python
+from auto_notion import arrow
+
+# Write today's snapshot in `<root>/snapshot_date=YYYY-MM-DD/<time>.arrow`
+path = arrow.write_snapshot(db, '~/notion_history/todo')
+
+table = arrow.read_snapshot(path)  # Memory-mapped (no copy)
+history = arrow.open_history('~/notion_history/todo')  # All snapshots
+```
+
+The Arrow schema is derived from the database `PropertiesInfo`. Rows are
+decoded with the columnar decoders (see `columnar.py`) directly into Arrow
+arrays, without creating the `DatabasePage` / `Property` objects (nor a
+`pd.DataFrame`).
+
+Requires `pyarrow`.
+"""
+
+from __future__ import annotations
+
+import datetime
+import os
+import pathlib
+import typing
+from collections.abc import Iterable
+from typing import Literal
+
+from auto_notion import columnar
+
+if typing.TYPE_CHECKING:
+    from auto_notion import database, property_info
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+# Page metadata columns (property snake names never start with `_`)
+ID_COLUMN = "_id"
+LAST_EDITED_COLUMN = "_last_edited_time"
+
+_PARTITION = "snapshot_date"
+_SUFFIXES = {"arrow": ".arrow", "parquet": ".parquet"}
+
+Format = Literal["arrow", "parquet"]
+
+
+def _arrow_type(info: property_info.PropertyInfo) -> pa.DataType:
+    import pyarrow as pa
+
+    timestamp = pa.timestamp("us", tz="UTC")
+    return {
+        "number": pa.float64(),
+        "checkbox": pa.bool_(),
+        "select": pa.dictionary(pa.int32(), pa.string()),
+        "status": pa.dictionary(pa.int32(), pa.string()),
+        "created_by": pa.dictionary(pa.int32(), pa.string()),
+        "last_edited_by": pa.dictionary(pa.int32(), pa.string()),
+        "multi_select": pa.list_(pa.string()),
+        "people": pa.list_(pa.string()),
+        "relation": pa.list_(pa.string()),
+        "date": timestamp,
+        "created_time": timestamp,
+        "last_edited_time": timestamp,
+    }.get(info.type, pa.string())
+
+
+def arrow_schema(
+    props: property_info.PropertiesInfo,
+    *,
+    names: Iterable[str] | None = None,
+) -> pa.Schema:
+    """Arrow schema of the database (`_id`, `_last_edited_time` + properties)."""
+    import pyarrow as pa
+
+    infos = props._props
+    if names is not None:
+        infos = {k: infos[k] for k in names}
+    return pa.schema(
+        [
+            pa.field(ID_COLUMN, pa.string(), nullable=False),
+            pa.field(LAST_EDITED_COLUMN, pa.timestamp("us", tz="UTC")),
+            *(pa.field(k, _arrow_type(info)) for k, info in infos.items()),
+        ]
+    )
+
+
+def to_table(view: database.DatabaseView) -> pa.Table:
+    """Fetch the rows as a `pa.Table` (`view.to_arrow()`)."""
+    import pyarrow as pa
+
+    pages = view._iter_raw_pages()
+    schema = arrow_schema(view._db.props, names=view._properties)
+
+    columns = view._make_columns()
+    ids = []
+    last_edited = []
+    for results in pages:
+        pages = results["results"]
+        columnar.append_pages(columns, pages)
+        ids.extend(p["id"] for p in pages)
+        last_edited.extend(p["last_edited_time"] for p in pages)
+
+    arrays = [
+        pa.array(ids, type=schema.field(ID_COLUMN).type),
+        pa.array(
+            [columnar.parse_time(v) for v in last_edited],
+            type=schema.field(LAST_EDITED_COLUMN).type,
+        ),
+        *(col.to_arrow(schema.field(k).type) for k, col in columns.items()),
+    ]
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def write_snapshot(
+    view: database.Database | database.DatabaseView,
+    root: str | os.PathLike[str],
+    *,
+    format: Format = "arrow",
+    date: datetime.date | None = None,
+) -> pathlib.Path:
+    """Write the snapshot in the `<root>/snapshot_date=<date>/` partition.
+
+    Args:
+        view: Database (or filtered view) to export
+        root: Directory of the snapshot history
+        format: `arrow` (uncompressed IPC file, memory-mappable) or `parquet`
+            (compressed, smaller on disk)
+        date: Partition date (default to today)
+
+    Returns:
+        The path of the written file.
+    """
+    now = datetime.datetime.now()
+    date = date or now.date()
+    partition = pathlib.Path(root).expanduser() / f"{_PARTITION}={date.isoformat()}"
+    partition.mkdir(parents=True, exist_ok=True)
+    path = partition / f"{now:%H%M%S%f}{_SUFFIXES[format]}"
+
+    table = view.to_arrow().unify_dictionaries()
+    tmp_path = path.with_name(path.name + ".tmp")
+    if format == "arrow":
+        import pyarrow as pa
+
+        with pa.OSFile(os.fspath(tmp_path), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    else:
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)  # Readers never see partial files
+    return path
+
+
+def read_snapshot(path: str | os.PathLike[str]) -> pa.Table:
+    """Read a snapshot file (Arrow files are memory-mapped, without copy)."""
+    import pyarrow as pa
+
+    path = pathlib.Path(path).expanduser()
+    if path.suffix == _SUFFIXES["parquet"]:
+        import pyarrow.parquet as pq
+
+        return pq.read_table(path, memory_map=True)
+    with pa.memory_map(os.fspath(path), "r") as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def open_history(
+    root: str | os.PathLike[str],
+    *,
+    format: Format = "arrow",
+) -> ds.Dataset:
+    """Returns all the snapshots as a dataset, partitioned by `snapshot_date`.
+
+    ```python
+    history = arrow.open_history(root)
+    history.to_table(filter=ds.field('snapshot_date') >= '2024-01-01')
+    ```
+    """
+    import pyarrow.dataset as ds
+
+    return ds.dataset(
+        pathlib.Path(root).expanduser(),
+        format="ipc" if format == "arrow" else "parquet",
+        partitioning="hive",
+        exclude_invalid_files=True,
+    )
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import datetime
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pytest
+
+import auto_notion
+from auto_notion import arrow
+
+
+@pytest.fixture
+def db_json(server):
+    return server.add_database(num_rows=120)
+
+
+@pytest.fixture
+def db(db_json):
+    return auto_notion.Database(db_json.id)
+
+
+def test_to_arrow(db):
+    table = db.to_arrow()
+    assert table.schema == arrow.arrow_schema(db.props)
+    assert table.num_rows == 120
+
+    # Same values as `db.df`
+    df = db.df
+    assert table[arrow.ID_COLUMN].to_pylist() == df.index.tolist()
+    for name in ("name", "done", "priority", "notes", "status"):
+        expected = df[name].astype(object).where(df[name].notna(), None)
+        assert table[name].to_pylist() == expected.tolist()
+    # Select options keep the schema order
+    statuses = table["status"].chunk(0).dictionary.to_pylist()
+    assert statuses == list(df["status"].cat.categories)
+    assert table["tags"].to_pylist() == df["tags"].tolist()
+    for name in ("due", "created"):
+        times = pd.Series(table[name].to_pylist(), dtype="datetime64[us, UTC]")
+        pd.testing.assert_series_equal(
+            times,
+            df[name].astype("datetime64[us, UTC]").reset_index(drop=True),
+            check_names=False,
+        )
+
+
+def test_to_arrow_select(db):
+    table = db.select("name", "priority").to_arrow()
+    assert table.column_names == [
+        arrow.ID_COLUMN,
+        arrow.LAST_EDITED_COLUMN,
+        "name",
+        "priority",
+    ]
+    assert table.num_rows == 120
+
+
+def test_write_arrow(db, tmp_path):
+    path = arrow.write_snapshot(db, tmp_path, date=datetime.date(2024, 6, 1))
+    assert path.parent.name == "snapshot_date=2024-06-01"
+    assert path.suffix == ".arrow"
+    assert not list(tmp_path.rglob("*.tmp"))
+
+    allocated = pa.total_allocated_bytes()
+    table = arrow.read_snapshot(path)
+    # Memory-mapped: the buffers are not copied in memory
+    assert pa.total_allocated_bytes() == allocated
+    assert table.equals(db.to_arrow().unify_dictionaries())
+
+
+def test_write_parquet(db, tmp_path):
+    path = arrow.write_snapshot(db, tmp_path, format="parquet")
+    assert path.suffix == ".parquet"
+    table = arrow.read_snapshot(path)
+    assert table.to_pylist() == db.to_arrow().to_pylist()
+
+
+@pytest.mark.parametrize("format", ["arrow", "parquet"])
+def test_open_history(db_json, db, tmp_path, format):
+    arrow.write_snapshot(db, tmp_path, format=format, date=datetime.date(2024, 6, 1))
+    db_json.update(db_json.page_id(0), {"properties": {"p6": {"rich_text": []}}})
+    arrow.write_snapshot(db, tmp_path, format=format, date=datetime.date(2024, 6, 2))
+
+    history = arrow.open_history(tmp_path, format=format)
+    assert history.count_rows() == 2 * 120
+    latest = history.to_table(filter=ds.field("snapshot_date") >= "2024-06-02")
+    assert latest.num_rows == 120
+    row = latest.filter(ds.field(arrow.ID_COLUMN) == db_json.page_id(0))
+    assert row["notes"].to_pylist() == [""]
@@ -0,0 +1,305 @@
+"""Asyncio database element.
+
+```python
+db = auto_notion.AsyncDatabase('<db_id>')
+await db.load()
+
+async for row in db[~db.filter.done]:
+    await row.set(snooze=None)
+```
+
+All requests of the database (queries and writes) share a semaphore, so
+concurrent tasks (`asyncio.gather`) are bounded by `max_concurrency`.
+
+Only iteration (with filters, `select`, `prefetch` and `changed_since`) and
+row updates are supported. The other `Database` features (`df`, `snapshot`,
+`mirror`, `insert_many`, `apply_df`, `resolve`, `row.INFO.content()`,...)
+raise `NotImplementedError`: use `auto_notion.Database` for those.
+"""
+
+from __future__ import annotations
+
+import datetime
+import functools
+import time
+import typing
+from collections.abc import AsyncIterator
+from typing import Any
+
+from auto_notion import cache as cachelib
+from auto_notion import checkpoint as checkpointlib
+from auto_notion import database, utils
+from auto_notion import page as pagelib
+from auto_notion.typing import Json
+
+if typing.TYPE_CHECKING:
+    import notion_client
+
+
+class AsyncDatabase(database.Database):
+
+    # Set by `refresh()`: the schema is re-fetched by the next `load()`
+    _stale: bool = False
+
+    def __init__(self, id: str, *, cache: bool = True, max_concurrency: int = 8):
+        import asyncio
+
+        self.id = id
+        self.api = utils.get_async_client()
+        self._cache = cache
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def request(self, fn, *args, **kwargs) -> Json:
+        """Call the `AsyncClient` method, bounded by the semaphore."""
+        async with self._semaphore:
+            return await fn(*args, **kwargs)
+
+    async def load(self) -> None:
+        """Fetch the schema (required before `.props`, `.filter`,...)."""
+        if "_retrive" in self.__dict__ and not self._stale:
+            return
+        if self._cache:
+            schema_cache = cachelib.get_schema_cache()
+            json_ = schema_cache.lookup(self.id)
+            if json_ is None:
+                json_ = await self.request(self.api.databases.retrieve, self.id)
+                json_ = schema_cache.store(self.id, json_)
+        else:
+            json_ = await self.request(self.api.databases.retrieve, self.id)
+        for name in ("props", "codec"):
+            self.__dict__.pop(name, None)
+        self.__dict__["_retrive"] = json_
+        self._stale = False
+
+    def refresh(self) -> None:
+        """Force re-fetching the schema at the next `await db.load()`.
+
+        The current schema is kept until then, so `.props`, `.filter`,... and
+        the rows being iterated remain usable.
+        """
+        if self._cache:
+            cachelib.get_schema_cache().invalidate(self.id)
+        self._stale = True
+
+    @functools.cached_property
+    def _retrive(self) -> Json:
+        raise RuntimeError(
+            f"Schema of {self.id!r} not loaded. Call `await db.load()` first."
+        )
+
+    def __iter__(self):
+        raise TypeError("Use `async for row in db:` for `AsyncDatabase`.")
+
+    def __aiter__(self) -> AsyncDatabaseView:
+        return AsyncDatabaseView(self)
+
+    def __getitem__(self, filters) -> AsyncDatabaseView:
+        return AsyncDatabaseView(self, filter=filters)
+
+    def prefetch(self, depth: int = 2) -> AsyncDatabaseView:
+        return AsyncDatabaseView(self).prefetch(depth)
+
+    def select(self, *names: str) -> AsyncDatabaseView:
+        return AsyncDatabaseView(self).select(*names)
+
+    def changed_since(
+        self,
+        since: datetime.datetime | checkpointlib.Checkpoint | None,
+    ) -> AsyncDatabaseView:
+        return AsyncDatabaseView(self).changed_since(since)
+
+    @property
+    def df(self):
+        raise TypeError("`.df` is not supported on `AsyncDatabase`.")
+
+    def resolve(self, *names: str):
+        raise _not_supported("resolve")
+
+    def iter_batches(self, batch_size: int = 1000):
+        raise _not_supported("iter_batches")
+
+    def snapshot(self):
+        raise _not_supported("snapshot")
+
+    def to_arrow(self):
+        raise _not_supported("to_arrow")
+
+    def mirror(self):
+        raise _not_supported("mirror")
+
+    def insert_many(self, records, **kwargs):
+        raise _not_supported("insert_many")
+
+    def insert_df(self, df, **kwargs):
+        raise _not_supported("insert_df")
+
+    def apply_df(self, df, **kwargs):
+        raise _not_supported("apply_df")
+
+
+def _not_supported(name: str) -> NotImplementedError:
+    return NotImplementedError(
+        f"`{name}` is not supported on `AsyncDatabase`. Use `auto_notion.Database`."
+    )
+
+
+class AsyncDatabaseView(database.DatabaseView):
+    _db: AsyncDatabase
+
+    def __next__(self):
+        raise TypeError("Use `async for row in view:` for `AsyncDatabase`.")
+
+    @property
+    def df(self):
+        raise TypeError("`.df` is not supported on `AsyncDatabase`.")
+
+    def resolve(self, *names: str):
+        raise _not_supported("resolve")
+
+    def iter_batches(self, batch_size: int = 1000):
+        raise _not_supported("iter_batches")
+
+    def snapshot(self):
+        raise _not_supported("snapshot")
+
+    def to_arrow(self):
+        raise _not_supported("to_arrow")
+
+    def __aiter__(self) -> AsyncDatabaseView:
+        return self
+
+    async def __anext__(self) -> AsyncPropertyProxy:
+        if self._pages is None:
+            await self._db.load()
+            self._pages = self._iter_pages()
+            if self._prefetch:
+                self._pages = _prefetch(self._pages, depth=self._prefetch)
+        start = time.perf_counter()
+        while not self._results:
+            fetch_start = time.perf_counter()
+            try:
+                results = await anext(self._pages)
+            except StopAsyncIteration:
+                self._fetch_seconds += time.perf_counter() - fetch_start
+                self._rows_seconds += fetch_start - start
+                self._record_metrics()
+                raise
+            rows = results["results"]
+            if rows and not self._num_rows:  # Check the (possibly cached) schema
+                complete = self._properties is None
+                if not self._db.codec.matches(rows[0]["properties"], complete=complete):
+                    self._db.refresh()
+            self._db.codec.flush_metrics()
+            await self._db.load()  # Re-fetch the schema if it was refreshed
+            self._fetch_seconds += time.perf_counter() - fetch_start
+            start += time.perf_counter() - fetch_start
+            if self._checkpoint is not None:
+                self._checkpoint.observe(results)
+            self._results.extend(rows)
+            self._num_rows += len(rows)
+        row = AsyncPropertyProxy(self._results.popleft(), codec=self._db.codec)
+        self._rows_seconds += time.perf_counter() - start
+        return row
+
+    def _iter_pages(self) -> AsyncIterator[Json]:
+        return _iter_query_pages(self._db, **self._query_kwargs())
+
+
+async def _iter_query_pages(db: AsyncDatabase, **query_kwargs) -> AsyncIterator[Json]:
+    next_cursor = None
+    has_more = True
+    while has_more:
+        results = await db.request(
+            db.api.databases.query, start_cursor=next_cursor, **query_kwargs
+        )
+        yield results
+        next_cursor = results["next_cursor"]
+        has_more = results["has_more"]
+
+
+async def _prefetch(it: AsyncIterator[Json], *, depth: int) -> AsyncIterator[Json]:
+    """Consume `it` in a background task, at most `depth` items ahead."""
+    import asyncio
+
+    q = asyncio.Queue(maxsize=depth)
+    done = object()
+
+    async def _worker():
+        try:
+            async for item in it:
+                await q.put((item, None))
+        except Exception as e:  # Forward the error to the consumer
+            await q.put((done, e))
+        else:
+            await q.put((done, None))
+
+    task = asyncio.create_task(_worker())
+    try:
+        while True:
+            item, error = await q.get()
+            if error is not None:
+                raise error
+            if item is done:
+                return
+            yield item
+    finally:
+        task.cancel()
+
+
+class AsyncDatabasePage(pagelib.DatabasePage):
+    db: AsyncDatabase
+
+    @property
+    def api(self) -> notion_client.AsyncClient:
+        return self.db.api
+
+    @property
+    def props(self):
+        # `Property.value = ...` would call the async `update` without awaiting
+        raise TypeError(
+            "`row.INFO.props` is not supported on `AsyncDatabase`. Read the "
+            "values with `row.<name>` and write them with "
+            "`await row.set(**values)`."
+        )
+
+    def content(self, *, max_concurrency: int = 8):
+        raise _not_supported("content")
+
+    def batch(self):
+        raise TypeError("Use `await row.set(**values)` for `AsyncDatabase`.")
+
+    async def update(self, properties: Json) -> None:
+        try:
+            new_page = await self.db.request(
+                self.api.pages.update,
+                self.id,
+                properties=properties,
+            )
+        except Exception as e:
+            e.add_note(f"query: {properties}")
+            raise
+        self._merge(new_page)
+
+
+class AsyncPropertyProxy(database.PropertyProxy):
+    """Like `PropertyProxy`, but writes are done with `await row.set()`."""
+
+    __slots__ = ()
+
+    _PAGE_CLS = AsyncDatabasePage
+
+    def __dir__(self) -> list[str]:
+        return super().__dir__()[:-1] + ["set"]
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        raise AttributeError(
+            f"Cannot assign {key!r} on `AsyncDatabase` rows. Use "
+            f"`await row.set({key}=...)`."
+        )
+
+    async def set(self, **values: Any) -> None:
+        """Update all the given properties in a single request."""
+        fields = {k: self._field(k) for k in values}
+        await self.INFO.update(
+            {fields[k].id: fields[k].encode(v) for k, v in values.items()}
+        )
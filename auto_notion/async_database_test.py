@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+import auto_notion
+
+
+def test_iter(server):
+    db_json = server.add_database(num_rows=150)
+    db = auto_notion.AsyncDatabase(db_json.id)
+
+    async def collect(view):
+        return [row async for row in view]
+
+    rows = asyncio.run(collect(db))
+    assert len(rows) == 150
+
+    async def load_and_filter():
+        await db.load()
+        return await collect(db[db.filter.done])
+
+    done = asyncio.run(load_and_filter())
+    assert done and all(row.done for row in done)
+
+
+def test_changed_since(server):
+    db_json = server.add_database(num_rows=20)
+    db = auto_notion.AsyncDatabase(db_json.id)
+    view = db.changed_since(None)
+    assert isinstance(view, auto_notion.async_database.AsyncDatabaseView)
+
+    async def collect():
+        return [row async for row in view]
+
+    rows = asyncio.run(collect())
+    edited = [row.INFO.last_edited.time for row in rows]
+    assert edited == sorted(edited, reverse=True)
+
+
+def test_select(server):
+    db_json = server.add_database(num_rows=20)
+    db = auto_notion.AsyncDatabase(db_json.id)
+
+    async def collect():
+        await db.load()
+        return [row async for row in db.select("name")]
+
+    rows = asyncio.run(collect())
+    assert [row.name for row in rows] == [
+        row.name for row in auto_notion.Database(db_json.id)
+    ]
+    with pytest.raises(AttributeError, match="done"):
+        rows[0].done
+
+
+def test_renamed_column(server):
+    db_json = server.add_database(num_rows=5)
+    asyncio.run(auto_notion.AsyncDatabase(db_json.id).load())  # Cache the schema
+    db_json.update_property("Notes", new_name="Comments")
+    db = auto_notion.AsyncDatabase(db_json.id)
+
+    async def collect():
+        return [row.comments async for row in db]
+
+    assert len(asyncio.run(collect())) == 5
+    assert server.requests["databases.retrieve"] == 2
+    assert db.props.comments.name == "Comments"
+
+
+def test_renamed_column_while_iterating(server):
+    server.page_size = 10
+    db_json = server.add_database(num_rows=30)
+    db = auto_notion.AsyncDatabase(db_json.id)
+
+    async def collect():
+        values = []
+        async for row in db:
+            if len(values) == 5:
+                db_json.update_property("Notes", new_name="Comments")
+            values.append(row.comments if len(values) >= 10 else row.notes)
+        return values
+
+    # The rows fetched after the rename refresh the schema (instead of raising
+    # `not loaded`)
+    assert len(asyncio.run(collect())) == 30
+    assert server.requests["databases.retrieve"] == 2
+    assert db.props.comments.name == "Comments"
+
+
+@pytest.mark.parametrize(
+    "fn",
+    [
+        lambda db: db.resolve("name"),
+        lambda db: db.snapshot(),
+        lambda db: db.iter_batches(),
+        lambda db: db.to_arrow(),
+        lambda db: db.mirror(),
+        lambda db: db.insert_many([{"name": "a"}]),
+        lambda db: db.insert_df(None),
+        lambda db: db.apply_df(None),
+        lambda db: db.changed_since(None).snapshot(),
+        lambda db: db.changed_since(None).resolve("name"),
+    ],
+)
+def test_unsupported(server, fn):
+    db_json = server.add_database(num_rows=1)
+    db = auto_notion.AsyncDatabase(db_json.id)
+    with pytest.raises(NotImplementedError, match="AsyncDatabase"):
+        fn(db)
+
+
+@pytest.mark.parametrize(
+    "fn, error",
+    [
+        (lambda row: row.INFO.props, TypeError),
+        (lambda row: setattr(row.INFO.props.notes, "value", "a"), TypeError),
+        (lambda row: row.INFO.content(), NotImplementedError),
+    ],
+)
+def test_page_unsupported(server, fn, error):
+    db_json = server.add_database(num_rows=1)
+    db = auto_notion.AsyncDatabase(db_json.id)
+
+    async def first_row():
+        return await anext(aiter(db))
+
+    row = asyncio.run(first_row())
+    with pytest.raises(error, match="AsyncDatabase"):
+        fn(row)
+    assert server.requests["pages.update"] == 0
+    assert server.requests["blocks.children.list"] == 0
@@ -0,0 +1,247 @@
+"""Page content (nested blocks).
+
+```python
+for row in db:
+    for block in row.INFO.content():
+        print(block.type, block.text)
+
+# Bodies of many pages, fetched together
+contents = blocks.load_contents(row.INFO for row in db)
+```
+
+Block trees are walked breadth-first: the children of all the blocks of a
+level are listed concurrently (each paginated). Trees are cached on disk,
+keyed by page id and the page `last_edited_time`, so re-reading an unchanged
+page costs no request. As Notion truncates `last_edited_time` to the minute,
+trees fetched within the minute of the last edit are re-fetched.
+
+Sub-pages (`child_page`, `child_database`) are not expanded.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import datetime
+import functools
+import json
+import pathlib
+import typing
+from collections.abc import Iterable, Iterator
+from typing import Self
+
+from auto_notion import cache as cachelib
+from auto_notion import metrics as metricslib
+from auto_notion import text as textlib
+from auto_notion import utils
+from auto_notion.typing import Json
+
+if typing.TYPE_CHECKING:
+    import notion_client
+
+    from auto_notion import page as pagelib
+
+# Blocks whose children are separate pages
+_SUBPAGE_TYPES = frozenset({"child_page", "child_database"})
+
+# Resolution of `last_edited_time`: later edits in the same minute keep it as-is
+_EDIT_RESOLUTION = datetime.timedelta(minutes=1)
+
+
+@dataclasses.dataclass
+class Block:
+    """Content block, with its (recursively loaded) children."""
+
+    id: str
+    type: str
+    json: Json
+    children: list[Block] = dataclasses.field(default_factory=list)
+
+    @classmethod
+    def from_json(cls, json: Json) -> Self:
+        """Build the tree from the `to_json()` output."""
+        block = json["block"]
+        return cls(
+            id=block["id"],
+            type=block["type"],
+            json=block,
+            children=[cls.from_json(child) for child in json["children"]],
+        )
+
+    def to_json(self) -> Json:
+        return {
+            "block": self.json,
+            "children": [child.to_json() for child in self.children],
+        }
+
+    @property
+    def text(self) -> str:
+        """Plain text of the block (empty for blocks without text)."""
+        value = self.json[self.type]
+        if isinstance(value, dict) and "rich_text" in value:
+            return textlib.json_to_str(value["rich_text"])
+        return ""
+
+    def walk(self) -> Iterator[tuple[int, Block]]:
+        """Yields `(depth, block)` of the tree, depth-first."""
+        yield 0, self
+        for child in self.children:
+            for depth, block in child.walk():
+                yield depth + 1, block
+
+
+def to_text(blocks: list[Block]) -> str:
+    """Plain text of the blocks (children indented), e.g. for indexing."""
+    return "\n".join(
+        "  " * depth + block.text
+        for top in blocks
+        for depth, block in top.walk()
+        if block.text
+    )
+
+
+@dataclasses.dataclass
+class BlockCache:
+    """Persistent page content cache, keyed by page id & `last_edited_time`.
+
+    Entries fetched less than a minute after `last_edited_time` are not
+    trusted, as the page may have been edited again in the same minute.
+
+    Files are written atomically, so the cache can be shared across processes.
+    """
+
+    cache_dir: pathlib.Path = dataclasses.field(
+        default_factory=cachelib.default_cache_dir
+    )
+
+    def lookup(self, id: str, last_edited_time: str) -> list[Block] | None:
+        """Returns the cached content, or `None` if missing or outdated."""
+        try:
+            entry = json.loads(self._path(id).read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if entry["last_edited_time"] != last_edited_time or "fetched_at" not in entry:
+            return None
+        fetched_at = datetime.datetime.fromisoformat(entry["fetched_at"])
+        if fetched_at < _parse_time(last_edited_time) + _EDIT_RESOLUTION:
+            return None
+        return [Block.from_json(b) for b in entry["blocks"]]
+
+    def store(
+        self,
+        id: str,
+        last_edited_time: str,
+        blocks: list[Block],
+        *,
+        fetched_at: datetime.datetime,
+    ) -> None:
+        """Cache the `blocks` (`fetched_at`: time at which the fetch started)."""
+        content = json.dumps(
+            {
+                "last_edited_time": last_edited_time,
+                "fetched_at": fetched_at.isoformat(),
+                "blocks": [b.to_json() for b in blocks],
+            }
+        )
+        utils.atomic_write(self._path(id), content)
+
+    def invalidate(self, id: str) -> None:
+        self._path(id).unlink(missing_ok=True)
+
+    def _path(self, id: str) -> pathlib.Path:
+        return self.cache_dir / "blocks" / f"{id.replace('-', '')}.json"
+
+
+def _parse_time(value: str) -> datetime.datetime:
+    return datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+@functools.cache
+def get_block_cache() -> BlockCache:
+    return BlockCache()
+
+
+def load_contents(
+    pages: Iterable[pagelib.DatabasePage],
+    *,
+    max_concurrency: int = 8,
+) -> dict[str, list[Block]]:
+    """Returns the content of each page (page id -> top-level blocks).
+
+    The block trees of all the (non-cached) pages are walked together, so
+    the requests of the different pages are interleaved.
+    """
+    pages = list(pages)
+    if not pages:
+        return {}
+    cache = get_block_cache()
+    metrics = metricslib.get_metrics()
+    contents = {}
+    missing = {}
+    for page in pages:
+        edited = page.json["last_edited_time"]
+        blocks = cache.lookup(page.id, edited)
+        if blocks is None:
+            missing[page.id] = edited
+        else:
+            contents[page.id] = blocks
+    if contents:
+        metrics.add("auto_notion.block_cache", len(contents), result="hit")
+    if missing:
+        metrics.add("auto_notion.block_cache", len(missing), result="miss")
+        fetched_at = datetime.datetime.now(datetime.timezone.utc)
+        trees = _fetch_trees(pages[0].api, missing, max_concurrency=max_concurrency)
+        for id, blocks in trees.items():
+            cache.store(id, missing[id], blocks, fetched_at=fetched_at)
+        contents.update(trees)
+    return contents
+
+
+def _fetch_trees(
+    api: notion_client.Client,
+    ids: Iterable[str],
+    *,
+    max_concurrency: int,
+) -> dict[str, list[Block]]:
+    """Walk the block trees breadth-first, listing each level concurrently."""
+    import concurrent.futures
+
+    ids = list(ids)
+    # Parent id -> children blocks
+    children: dict[str, list[Json]] = {}
+
+    def list_children(id: str) -> list[Json]:
+        blocks = []
+        cursor = None
+        while True:
+            kwargs = {} if cursor is None else {"start_cursor": cursor}
+            response = api.blocks.children.list(id, page_size=100, **kwargs)
+            blocks.extend(response["results"])
+            if not response["has_more"]:
+                return blocks
+            cursor = response["next_cursor"]
+
+    # Requests are throttled by the process-wide rate limiter of the client
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrency) as ex:
+        level = ids
+        while level:
+            fetched = dict(zip(level, ex.map(list_children, level)))
+            children.update(fetched)
+            level = [
+                block["id"]
+                for blocks in fetched.values()
+                for block in blocks
+                if block["has_children"] and block["type"] not in _SUBPAGE_TYPES
+            ]
+
+    def build(id: str) -> list[Block]:
+        return [
+            Block(
+                id=block["id"],
+                type=block["type"],
+                json=block,
+                children=build(block["id"]) if block["id"] in children else [],
+            )
+            for block in children[id]
+        ]
+
+    return {id: build(id) for id in ids}
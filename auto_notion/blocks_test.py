@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import datetime
+
+import pytest
+
+import auto_notion
+from auto_notion import blocks as blockslib
+
+
+@pytest.fixture
+def db_json(server):
+    return server.add_database(num_rows=60)
+
+
+def _rows(db_json, *indices):
+    db = auto_notion.Database(db_json.id)
+    rows = {row.INFO.id: row for row in db}
+    return [rows[db_json.page_id(i)] for i in indices]
+
+
+def _expected(db_json, parent_id: str) -> list[tuple[str, list]]:
+    """`(id, children)` of the fake blocks, fetched recursively."""
+    blocks = db_json.children(parent_id, start_cursor=0, page_size=1000)["results"]
+    return [
+        (b["id"], _expected(db_json, b["id"]) if b["has_children"] else [])
+        for b in blocks
+    ]
+
+
+def _ids(blocks: list[blockslib.Block]) -> list[tuple[str, list]]:
+    return [(b.id, _ids(b.children)) for b in blocks]
+
+
+def test_load_contents(server, db_json):
+    pages = [row.INFO for row in _rows(db_json, 1, 2, 3)]
+    contents = blockslib.load_contents(pages)
+    assert list(contents) == [p.id for p in pages]
+    for page in pages:
+        assert _ids(contents[page.id]) == _expected(db_json, page.id)
+    # Nested blocks are loaded (breadth-first, one request per parent)
+    blocks = [b for p in pages for top in contents[p.id] for _, b in top.walk()]
+    assert max(depth for p in pages for t in contents[p.id] for depth, _ in t.walk())
+    num_parents = len(pages) + sum(b.json["has_children"] for b in blocks)
+    assert server.requests["blocks.children.list"] == num_parents
+
+
+def test_pagination(server, db_json):
+    (row,) = _rows(db_json, 50)  # Long page
+    content = row.INFO.content()
+    assert len(content) == 150
+    assert _ids(content) == _expected(db_json, row.INFO.id)
+    nested = sum(b.json["has_children"] for top in content for _, b in top.walk())
+    assert server.requests["blocks.children.list"] == 2 + nested
+
+
+def test_content_cache(server, db_json):
+    (row,) = _rows(db_json, 1)
+    content = row.INFO.content()
+    num_requests = server.requests["blocks.children.list"]
+    assert num_requests
+
+    # Unchanged page: cache hit
+    (row,) = _rows(db_json, 1)
+    assert _ids(row.INFO.content()) == _ids(content)
+    assert server.requests["blocks.children.list"] == num_requests
+
+    # Edited page: cache miss
+    row.notes = "edited"
+    row.INFO.content()
+    assert server.requests["blocks.children.list"] == 2 * num_requests
+    # Edited within the last minute: further edits may keep the same
+    # `last_edited_time`, so the content is re-fetched
+    row.INFO.content()
+    assert server.requests["blocks.children.list"] == 3 * num_requests
+
+
+def test_block_cache(tmp_path):
+    cache = blockslib.BlockCache(tmp_path)
+    json = {"id": "b", "type": "paragraph", "paragraph": {"rich_text": []}}
+    blocks = [blockslib.Block(id="b", type="paragraph", json=json)]
+    edited = "2024-06-01T10:00:00.000Z"
+    edited_time = datetime.datetime(2024, 6, 1, 10, tzinfo=datetime.timezone.utc)
+
+    assert cache.lookup("page", edited) is None
+    cache.store("page", edited, blocks, fetched_at=edited_time)
+    assert cache.lookup("page", edited) is None  # Fetched in the edit minute
+    cache.store(
+        "page",
+        edited,
+        blocks,
+        fetched_at=edited_time + datetime.timedelta(seconds=59),
+    )
+    assert cache.lookup("page", edited) is None
+    cache.store(
+        "page",
+        edited,
+        blocks,
+        fetched_at=edited_time + datetime.timedelta(minutes=1),
+    )
+    assert cache.lookup("page", edited) == blocks
+    assert cache.lookup("page", "2024-06-01T10:01:00.000Z") is None  # Outdated
+    cache.invalidate("page")
+    assert cache.lookup("page", edited) is None
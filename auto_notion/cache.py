@@ -0,0 +1,83 @@
+"""Disk cache for the database schemas."""
+
+from __future__ import annotations
+
+import dataclasses
+import functools
+import json
+import os
+import pathlib
+import time
+from collections.abc import Callable
+
+from auto_notion import utils
+from auto_notion.typing import Json
+
+# Schema older than this are re-fetched from the API. Queries already refresh
+# the schema when the returned rows do not match it (renamed columns,...), so
+# this only bounds the staleness of the other info (e.g. select options).
+_DEFAULT_TTL = 24 * 60 * 60  # 1 day
+
+
+def default_cache_dir() -> pathlib.Path:
+    if cache_dir := os.environ.get("AUTO_NOTION_CACHE_DIR"):
+        return pathlib.Path(cache_dir)
+    xdg_dir = os.environ.get("XDG_CACHE_HOME", "~/.cache")
+    return pathlib.Path(xdg_dir).expanduser() / "auto_notion"
+
+
+@dataclasses.dataclass
+class SchemaCache:
+    """Persistent `databases.retrieve` cache, keyed by database id.
+
+    Entries younger than `ttl` are served without any network call. Older
+    entries are simply re-fetched (the API has no cheaper conditional check).
+
+    Schema edits are picked up before the TTL by revalidating against the
+    query results: when the properties of the returned rows do not match the
+    cached schema, the database calls `invalidate` (`db.refresh()`) and
+    re-fetches it.
+
+    Files are written atomically, so the cache can be shared across processes.
+    """
+
+    cache_dir: pathlib.Path = dataclasses.field(default_factory=default_cache_dir)
+    ttl: float = _DEFAULT_TTL
+
+    def get(self, id: str, *, fetch: Callable[[], Json]) -> Json:
+        json_ = self.lookup(id)
+        if json_ is None:
+            json_ = self.store(id, fetch())
+        return json_
+
+    def lookup(self, id: str) -> Json | None:
+        """Returns the cached schema, or `None` if missing or expired."""
+        entry = self._read(id)
+        if entry is not None and time.time() - entry["fetched_at"] < self.ttl:
+            return entry["json"]
+        return None
+
+    def store(self, id: str, new_json: Json) -> Json:
+        self._write(id, new_json)
+        return new_json
+
+    def invalidate(self, id: str) -> None:
+        self._path(id).unlink(missing_ok=True)
+
+    def _path(self, id: str) -> pathlib.Path:
+        return self.cache_dir / "schemas" / f"{id.replace('-', '')}.json"
+
+    def _read(self, id: str) -> Json | None:
+        try:
+            return json.loads(self._path(id).read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write(self, id: str, json_: Json) -> None:
+        content = json.dumps({"fetched_at": time.time(), "json": json_})
+        utils.atomic_write(self._path(id), content)
+
+
+@functools.cache
+def get_schema_cache() -> SchemaCache:
+    return SchemaCache()
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import pytest
+
+import auto_notion
+from auto_notion import cache as cachelib
+
+
+def test_schema_cache(tmp_path):
+    cache = cachelib.SchemaCache(cache_dir=tmp_path)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return {"id": "db", "last_edited_time": str(len(calls))}
+
+    assert cache.get("db", fetch=fetch)["last_edited_time"] == "1"
+    assert cache.get("db", fetch=fetch)["last_edited_time"] == "1"
+    assert len(calls) == 1
+
+    cache.invalidate("db")
+    assert cache.get("db", fetch=fetch)["last_edited_time"] == "2"
+
+
+def test_schema_cache_ttl(tmp_path):
+    cache = cachelib.SchemaCache(cache_dir=tmp_path, ttl=0)
+    cache.store("db", {"id": "db", "last_edited_time": "1"})
+    assert cache.lookup("db") is None  # Expired entries are re-fetched
+
+
+@pytest.mark.parametrize(
+    "load",
+    [
+        lambda db: db.df["comments"].tolist(),
+        lambda db: [v for df in db.iter_batches(7) for v in df["comments"]],
+        lambda db: db.snapshot().column("comments"),
+        lambda db: db.to_arrow().column("comments").to_pylist(),
+        lambda db: db.select("name", "comments").df["comments"].tolist(),
+        lambda db: [row.comments for row in db],
+    ],
+)
+def test_renamed_column(server, load):
+    db_json = server.add_database(num_rows=20)
+    notes = auto_notion.Database(db_json.id).df["notes"].tolist()
+
+    # Renamed while the schema is cached
+    db_json.update_property("Notes", new_name="Comments")
+    db = auto_notion.Database(db_json.id)
+    assert "notes" in db.codec.fields
+    assert load(db) == notes
+    assert server.requests["databases.retrieve"] == 2  # Refreshed once
+    assert "comments" in db.codec.fields
+
+
+def test_unchanged_schema(server):
+    db_json = server.add_database(num_rows=20)
+    auto_notion.Database(db_json.id).df
+    db = auto_notion.Database(db_json.id)
+    db.df
+    db.select("name").df
+    assert server.requests["databases.retrieve"] == 1
@@ -0,0 +1,72 @@
+"""Incremental sync checkpoints.
+
+```python
+checkpoint = auto_notion.Checkpoint('todo_cron')
+
+for row in db.changed_since(checkpoint):
+    ...
+
+checkpoint.commit()  # Only once all the rows were processed
+```
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import os
+import pathlib
+from collections.abc import Iterator
+
+from auto_notion import cache as cachelib
+from auto_notion import utils
+from auto_notion.typing import Json
+
+
+class Checkpoint:
+    """Persisted `last_edited_time` of the last processed edit.
+
+    Args:
+        name: Checkpoint name (saved in the `auto_notion` cache dir), or path of
+            the file.
+    """
+
+    def __init__(self, name: str | os.PathLike[str]):
+        if isinstance(name, os.PathLike) or os.sep in name:
+            self.path = pathlib.Path(name)
+        else:
+            self.path = cachelib.default_cache_dir() / "checkpoints" / f"{name}.json"
+        self.time = self._load()
+        # Latest `last_edited_time` seen since the last commit
+        self.pending: datetime.datetime | None = None
+
+    def _load(self) -> datetime.datetime | None:
+        try:
+            content = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return None
+        return datetime.datetime.fromisoformat(content["last_edited_time"])
+
+    def track(self, pages: Iterator[Json]) -> Iterator[Json]:
+        """Record the latest edit of the query results."""
+        for results in pages:
+            self.observe(results)
+            yield results
+
+    def observe(self, results: Json) -> None:
+        for page in results["results"]:
+            time = datetime.datetime.fromisoformat(page["last_edited_time"])
+            if self.pending is None or time > self.pending:
+                self.pending = time
+
+    def commit(self) -> None:
+        """Atomically save the latest edit seen."""
+        if self.pending is None or (self.time and self.pending <= self.time):
+            return
+        content = json.dumps({"last_edited_time": self.pending.isoformat()})
+        utils.atomic_write(self.path, content)
+        self.time = self.pending
+        self.pending = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({os.fspath(self.path)!r}, time={self.time})"
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import pytest
+
+import auto_notion
+
+
+@pytest.fixture
+def db_json(server):
+    return server.add_database(num_rows=120)
+
+
+@pytest.fixture
+def db(db_json):
+    return auto_notion.Database(db_json.id)
+
+
+def _edit(db_json, index: int) -> None:
+    db_json.update(db_json.page_id(index), {"properties": {"p1": {"checkbox": True}}})
+
+
+def test_changed_since(db_json, db):
+    checkpoint = auto_notion.Checkpoint("todo")
+    assert checkpoint.time is None
+
+    # First sync: all the rows, most recently edited first
+    rows = list(db.changed_since(checkpoint))
+    assert len(rows) == 120
+    edited = [row.INFO.last_edited.time for row in rows]
+    assert edited == sorted(edited, reverse=True)
+    checkpoint.commit()
+    assert checkpoint.time == edited[0]
+    assert auto_notion.Checkpoint("todo").time == edited[0]  # Persisted
+
+    # Next syncs: only the rows edited since the checkpoint (including the
+    # ones of the checkpoint minute)
+    _edit(db_json, 3)
+    _edit(db_json, 7)
+    checkpoint = auto_notion.Checkpoint("todo")
+    ids = {row.INFO.id for row in db.changed_since(checkpoint)}
+    assert ids == {db_json.page_id(3), db_json.page_id(7), rows[0].INFO.id}
+    checkpoint.commit()
+    # Rows edited during the checkpoint minute are returned again
+    ids = {row.INFO.id for row in db.changed_since(checkpoint)}
+    assert ids == {db_json.page_id(3), db_json.page_id(7)}
+
+
+def test_no_commit(db_json, db):
+    checkpoint = auto_notion.Checkpoint("todo")
+    list(db.changed_since(checkpoint))
+    checkpoint.commit()
+    _edit(db_json, 3)
+    checkpoint = auto_notion.Checkpoint("todo")
+    list(db.changed_since(checkpoint))
+    checkpoint.commit()
+    time = checkpoint.time
+
+    _edit(db_json, 4)
+    checkpoint = auto_notion.Checkpoint("todo")
+    with pytest.raises(ValueError):
+        for _ in db.changed_since(checkpoint):
+            raise ValueError("Processing failed")
+    # Not committed: the rows are returned again on the next sync
+    assert auto_notion.Checkpoint("todo").time == time
+    checkpoint = auto_notion.Checkpoint("todo")
+    ids = {row.INFO.id for row in db.changed_since(checkpoint)}
+    assert ids == {db_json.page_id(3), db_json.page_id(4)}
+
+
+def test_commit_without_edits(tmp_path, db):
+    checkpoint = auto_notion.Checkpoint(tmp_path / "todo.json")
+    checkpoint.commit()  # Nothing seen
+    assert not checkpoint.path.exists()
+
+    list(db.changed_since(checkpoint))
+    checkpoint.commit()
+    content = checkpoint.path.read_text()
+    list(db.changed_since(checkpoint))  # Only the already committed rows
+    checkpoint.commit()
+    assert checkpoint.path.read_text() == content
+
+
+def test_changed_since_view(db_json, db):
+    checkpoint = auto_notion.Checkpoint("todo")
+    db.changed_since(checkpoint).df  # The batch APIs also record the edits
+    checkpoint.commit()
+    assert checkpoint.time is not None
+    _edit(db_json, 5)
+    db.changed_since(checkpoint).snapshot()
+    checkpoint.commit()
+
+    _edit(db_json, 3)
+    db_json.update(db_json.page_id(4), {"properties": {"p1": {"checkbox": False}}})
+    # Combined with the filters
+    view = db[db.filter.done].changed_since(checkpoint)
+    # Row 5 was edited during the checkpoint minute
+    assert {row.INFO.id for row in view} == {db_json.page_id(3), db_json.page_id(5)}
+    table = db.changed_since(checkpoint).snapshot()
+    assert set(table.ids) == {db_json.page_id(i) for i in (3, 4, 5)}
@@ -0,0 +1,105 @@
+"""Notion clients (imported on first use, as `notion_client` is slow to import)."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+import httpx
+import notion_client
+
+from auto_notion import decoding
+from auto_notion import metrics as metricslib
+from auto_notion import rate_limit
+
+
+class _InstrumentedMixin:
+    """Record the response sizes & JSON decoding time in the process-wide metrics.
+
+    Successful responses are decoded with the fast JSON decoder (see
+    `decoding.py`). This also skips the `notion_client` debug log, which
+    formats the full body of each response even when disabled.
+
+    The `httpx` client (connection pool) is shared by the clients of all the
+    tokens (see `transport.py`), so the token is sent with each request rather
+    than set on the `httpx` client.
+    """
+
+    @property
+    def client(self) -> httpx.Client | httpx.AsyncClient:
+        return self._clients[-1]
+
+    @client.setter
+    def client(self, client: httpx.Client | httpx.AsyncClient) -> None:
+        # Unlike `notion_client`, keep the timeouts & headers of the transport
+        client.base_url = httpx.URL(f"{self.options.base_url}/v1/")
+        client.headers["Notion-Version"] = self.options.notion_version
+        self._clients.append(client)
+
+    def _build_request(
+        self,
+        method: str,
+        path: str,
+        query: Any = None,
+        body: Any = None,
+        auth: str | None = None,
+    ) -> httpx.Request:
+        return super()._build_request(
+            method, path, query, body, auth=auth or self.options.auth
+        )
+
+    def _parse_response(self, response: httpx.Response) -> Any:
+        metrics = metricslib.get_metrics()
+        endpoint = metricslib.endpoint_name(
+            response.request.method, response.request.url.path
+        )
+        metrics.add("notion.response.bytes", len(response.content), endpoint=endpoint)
+        if not response.is_success:
+            return super()._parse_response(response)  # Raise the API error
+        start = time.perf_counter()
+        json = decoding.loads(response.content)
+        duration = time.perf_counter() - start
+        metrics.record("auto_notion.json.duration", duration, endpoint=endpoint)
+        return json
+
+
+class _Client(_InstrumentedMixin, notion_client.Client):
+    """Client sharing the process-wide rate limiter, with retries."""
+
+    retry = rate_limit.RetryOptions()
+
+    def request(self, path: str, method: str, **kwargs) -> Any:
+        endpoint = metricslib.endpoint_name(method, path)
+        metrics = metricslib.get_metrics()
+
+        def send():
+            with metrics.track_request(endpoint):
+                return super(_Client, self).request(path, method, **kwargs)
+
+        return rate_limit.call(
+            send,
+            limiter=rate_limit.get_rate_limiter(),
+            retry=self.retry,
+            endpoint=endpoint,
+        )
+
+
+class _AsyncClient(_InstrumentedMixin, notion_client.AsyncClient):
+    """Async client sharing the process-wide rate limiter, with retries."""
+
+    retry = rate_limit.RetryOptions()
+
+    async def request(self, path: str, method: str, **kwargs) -> Any:
+        endpoint = metricslib.endpoint_name(method, path)
+        metrics = metricslib.get_metrics()
+
+        async def send():
+            with metrics.track_request(endpoint):
+                return await super(_AsyncClient, self).request(path, method, **kwargs)
+
+        return await rate_limit.call_async(
+            send,
+            limiter=rate_limit.get_rate_limiter(),
+            retry=self.retry,
+            endpoint=endpoint,
+        )
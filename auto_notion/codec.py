@@ -0,0 +1,129 @@
+"""Row codec compiled once per database schema."""
+
+from __future__ import annotations
+
+import dataclasses
+from typing import Any, Self
+
+from auto_notion import database
+from auto_notion import metrics as metricslib
+from auto_notion import property as propertylib
+from auto_notion import utils
+from auto_notion.typing import Json
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class FieldCodec:
+    """Decoder/encoder of a single property."""
+
+    id: str
+    name: str
+    type: str
+    # `Property` built from the schema, only used for its `parse`/`serialize`
+    prop: propertylib.Property
+
+    def decode(self, json: Json) -> Any:
+        """Raw page property (`{'type': ..., <type>: ...}`) -> Python value."""
+        val = json[self.type]
+        if val is None:
+            return val
+        return self.prop.parse(val)
+
+    def encode(self, value: Any) -> Json:
+        """Python value -> `pages.update` payload."""
+        return self.prop.to_query(value)
+
+
+class _Counter:
+    """Lock-free counter (concurrent increments may rarely be lost)."""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+
+@dataclasses.dataclass(frozen=True)
+class RowCodec:
+    """Table `snake_name -> FieldCodec`, shared by all the rows of the database."""
+
+    db: database.Database
+    fields: dict[str, FieldCodec]
+    # `(name, id, type) -> FieldCodec` built from the page json, for the
+    # properties which do not match the (possibly outdated) cached schema
+    _page_fields: dict[tuple[str, str, str], FieldCodec] = dataclasses.field(
+        default_factory=dict, repr=False, compare=False
+    )
+    # Values decoded by `row.<name>`, added to the metrics once per query page
+    # (recording each value would slow down the per-cell access)
+    num_decoded: _Counter = dataclasses.field(
+        default_factory=_Counter, repr=False, compare=False
+    )
+
+    @classmethod
+    def from_db(cls, db: database.Database) -> Self:
+        fields = {}
+        for name, json in db._retrive["properties"].items():
+            prop = propertylib.Property.from_json(json, name=name, db=db, page=None)
+            fields[utils.to_snake_case(name)] = FieldCodec(
+                id=json["id"],
+                name=name,
+                type=json["type"],
+                prop=prop,
+            )
+        return cls(db=db, fields=fields)
+
+    def matches(self, props: Json, *, complete: bool = True) -> bool:
+        """Whether the page `props` match the schema (same names & types).
+
+        Args:
+            props: Page properties
+            complete: If `False`, `props` can be a subset of the schema (e.g.
+                `select()`-ed properties)
+        """
+        types = {f.name: f.type for f in self.fields.values()}
+        if complete and len(props) != len(types):
+            return False
+        return all(types.get(name) == json["type"] for name, json in props.items())
+
+    def flush_metrics(self) -> None:
+        """Add the values decoded since the last flush to the metrics."""
+        num_decoded, self.num_decoded.value = self.num_decoded.value, 0
+        if num_decoded:
+            metricslib.get_metrics().add(
+                "auto_notion.decoded_values", num_decoded, kind="proxy"
+            )
+
+    def field(self, key: str, props: Json) -> FieldCodec | None:
+        """Returns the field `key` of the page `props` (`None` if missing).
+
+        When the page does not match the schema (column renamed or re-typed
+        since the schema was cached), the field is built from the page json
+        and the database schema is refreshed, so the next rows use an
+        up-to-date codec.
+        """
+        field = self.fields.get(key)
+        if field is not None:
+            json = props.get(field.name)
+            if json is not None and json["type"] == field.type:
+                return field
+        for name, json in props.items():
+            if utils.to_snake_case(name) == key:
+                break
+        else:
+            return None  # Not in the page (e.g. `select()`-ed out)
+        cache_key = (name, json["id"], json["type"])
+        page_field = self._page_fields.get(cache_key)
+        if page_field is None:
+            page_field = FieldCodec(
+                id=json["id"],
+                name=name,
+                type=json["type"],
+                prop=propertylib.Property.from_json(
+                    json, name=name, db=self.db, page=None
+                ),
+            )
+            self._page_fields[cache_key] = page_field
+            if self.db.__dict__.get("codec") is self:
+                self.db.refresh()
+        return page_field
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import pytest
+
+import auto_notion
+
+
+def test_renamed_column(server):
+    db_json = server.add_database(num_rows=5)
+    row = next(iter(auto_notion.Database(db_json.id)))
+    notes = row.notes
+
+    # The schema is still cached when the column is renamed
+    db_json.update_property("Notes", new_name="Comments")
+    db = auto_notion.Database(db_json.id)
+    assert "notes" in db.codec.fields
+    rows = list(db)
+    assert rows[0].comments == notes
+    assert "comments" in dir(rows[0])
+    with pytest.raises(AttributeError, match="comments"):
+        rows[0].notes
+    assert [row.comments for row in rows]
+    # The schema was refreshed once
+    assert "comments" in db.codec.fields
+    assert server.requests["databases.retrieve"] == 2
+
+
+def test_retyped_column(server):
+    db_json = server.add_database(num_rows=5)
+    db = auto_notion.Database(db_json.id)
+    assert db.codec.fields["priority"].type == "number"
+
+    db_json.update_property("Priority", type="rich_text")
+    db = auto_notion.Database(db_json.id)
+    rows = list(db)
+    assert all(isinstance(row.priority, str) for row in rows)
+    assert db.codec.fields["priority"].type == "rich_text"
+
+    rows[0].priority = "high"
+    assert rows[0].priority == "high"
@@ -0,0 +1,303 @@
+"""Columnar decoding of the query results into a `pd.DataFrame` (or Arrow).
+
+Rather than building the `DatabasePage` / `Property` objects for each row,
+the decoder of each column is selected once from the database schema and
+applied directly on the raw query JSON.
+"""
+
+from __future__ import annotations
+
+import datetime
+import time
+import typing
+from collections.abc import Iterable
+from typing import Any, ClassVar
+
+from auto_notion import metrics as metricslib
+from auto_notion import text as textlib
+from auto_notion import utils
+from auto_notion.typing import Json
+
+if typing.TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
+
+class Column:
+    """Accumulate the values of a single property."""
+
+    TYPE: ClassVar[str | None] = None
+
+    _TYPE_TO_CLS: ClassVar[dict[str, type[Column]]] = {}
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        if cls.TYPE:
+            cls._TYPE_TO_CLS[cls.TYPE] = cls
+        super().__init_subclass__(**kwargs)
+
+    def __init__(self, name: str, json: Json):
+        self.name = name
+        self.json = json  # Schema of the property
+        self.type = json["type"]
+        self.values = []
+
+    @classmethod
+    def from_json(cls, json: Json, *, name: str) -> Column:
+        child_cls = cls._TYPE_TO_CLS.get(json["type"], cls)
+        return child_cls(name=name, json=json)
+
+    def append(self, json: Json) -> None:
+        val = json[self.type]
+        self.values.append(None if val is None else self.decode(val))
+
+    def decode(self, value: Json) -> Any:
+        return value
+
+    def clear(self) -> None:
+        self.values = []
+
+    def to_series(self) -> pd.Series:
+        import pandas as pd
+
+        return pd.Series(self.values, dtype=object)
+
+    def to_arrow(self, type: pa.DataType) -> pa.Array:
+        """Returns the values as `pa.Array` of the given (schema) type."""
+        import pyarrow as pa
+
+        values = self.values
+        if pa.types.is_string(type):
+            # Unsupported types (formula, rollup,...) are stored as str
+            values = [v if v is None or isinstance(v, str) else str(v) for v in values]
+        return pa.array(values, type=type)
+
+
+class _Text(Column):
+
+    def decode(self, value: Json) -> str:
+        return textlib.json_to_str(value)
+
+    def to_series(self) -> pd.Series:
+        import pandas as pd
+
+        return pd.Series(self.values, dtype="string")
+
+
+class Title(_Text):
+    TYPE = "title"
+
+
+class RichText(_Text):
+    TYPE = "rich_text"
+
+
+class _String(Column):
+
+    def to_series(self) -> pd.Series:
+        import pandas as pd
+
+        return pd.Series(self.values, dtype="string")
+
+
+class Url(_String):
+    TYPE = "url"
+
+
+class Email(_String):
+    TYPE = "email"
+
+
+class PhoneNumber(_String):
+    TYPE = "phone_number"
+
+
+class Number(Column):
+    TYPE = "number"
+
+    def to_series(self) -> pd.Series:
+        import pandas as pd
+
+        # The schema does not tell whether the values are integers, so always
+        # float (the dtype does not depend on the values of the batch)
+        return pd.Series(pd.array(self.values, dtype="Float64"))
+
+
+class Checkbox(Column):
+    TYPE = "checkbox"
+
+    def to_series(self) -> pd.Series:
+        import pandas as pd
+
+        return pd.Series(self.values, dtype="boolean")
+
+
+class _Choice(Column):
+
+    def decode(self, value: Json) -> str:
+        return value["name"]
+
+    def _categories(self) -> list[str]:
+        categories = [opt["name"] for opt in self.json[self.type]["options"]]
+        # Values added after the schema was cached
+        known = set(categories)
+        categories.extend(
+            v for v in dict.fromkeys(self.values) if v is not None and v not in known
+        )
+        return categories
+
+    def to_series(self) -> pd.Series:
+        import pandas as pd
+
+        categories = self._categories()
+        return pd.Series(pd.Categorical(self.values, categories=categories))
+
+    def to_arrow(self, type: pa.DataType) -> pa.Array:
+        import pyarrow as pa
+
+        categories = self._categories()
+        index = {c: i for i, c in enumerate(categories)}
+        indices = pa.array([index.get(v) for v in self.values], type=type.index_type)
+        return pa.DictionaryArray.from_arrays(indices, pa.array(categories))
+
+
+class Select(_Choice):
+    TYPE = "select"
+
+
+class Status(_Choice):
+    TYPE = "status"
+
+
+class MultiSelect(Column):
+    TYPE = "multi_select"
+
+    def decode(self, value: Json) -> list[str]:
+        return [v["name"] for v in value]
+
+
+class _Time(Column):
+
+    def to_series(self) -> pd.Series:
+        import pandas as pd
+
+        # Notion mix dates (`2022-01-01`) and datetimes with various offsets,
+        # so everything is normalized to UTC.
+        return pd.Series(pd.to_datetime(self.values, utc=True, format="ISO8601"))
+
+    def to_arrow(self, type: pa.DataType) -> pa.Array:
+        import pyarrow as pa
+
+        return pa.array([parse_time(v) for v in self.values], type=type)
+
+
+def parse_time(value: str | None) -> datetime.datetime | None:
+    """Parse the ISO date or datetime (dates & naive datetimes are UTC)."""
+    if value is None:
+        return None
+    time = datetime.datetime.fromisoformat(value)
+    if time.tzinfo is None:
+        time = time.replace(tzinfo=datetime.timezone.utc)
+    return time
+
+
+class Date(_Time):
+    TYPE = "date"
+
+    def decode(self, value: Json) -> str:
+        # TODO(epot): Support `end`
+        return value["start"]
+
+
+class CreatedTime(_Time):
+    TYPE = "created_time"
+
+
+class LastEditedTime(_Time):
+    TYPE = "last_edited_time"
+
+
+class _Ids(Column):
+
+    def decode(self, value: Json) -> list[str]:
+        return [v["id"] for v in value]
+
+
+class People(_Ids):
+    TYPE = "people"
+
+
+class Relation(_Ids):
+    TYPE = "relation"
+
+
+class _User(Column):
+
+    def decode(self, value: Json) -> str:
+        return value["id"]
+
+    def to_series(self) -> pd.Series:
+        import pandas as pd
+
+        return pd.Series(self.values, dtype="string")
+
+
+class CreatedBy(_User):
+    TYPE = "created_by"
+
+
+class LastEditedBy(_User):
+    TYPE = "last_edited_by"
+
+
+class Formula(Column):
+    TYPE = "formula"
+
+    def decode(self, value: Json) -> Any:
+        return value[value["type"]]
+
+
+def make_columns(
+    schema: Json,
+    *,
+    names: Iterable[str] | None = None,
+) -> dict[str, Column]:
+    """Returns the columns (`snake_name -> Column`) for the database schema.
+
+    Args:
+        schema: The `properties` of `databases.retrieve`
+        names: If set, only the given properties (snake names) are returned
+    """
+    columns = {
+        utils.to_snake_case(name): Column.from_json(json, name=name)
+        for name, json in schema.items()
+    }
+    if names is not None:
+        columns = {k: columns[k] for k in names}
+    return columns
+
+
+def append_pages(columns: dict[str, Column], pages: Iterable[Json]) -> None:
+    """Decode the raw `databases.query` results into the columns."""
+    start = time.perf_counter()
+    columns = list(columns.values())
+    num_rows = 0
+    for page in pages:
+        props = page["properties"]
+        for col in columns:
+            col.append(props[col.name])
+        num_rows += 1
+    metrics = metricslib.get_metrics()
+    metrics.add("auto_notion.rows", num_rows, kind="columnar")
+    duration = time.perf_counter() - start
+    metrics.record("auto_notion.decode.duration", duration, kind="columnar")
+
+
+def clear(columns: dict[str, Column]) -> None:
+    for col in columns.values():
+        col.clear()
+
+
+def to_df(columns: dict[str, Column]) -> pd.DataFrame:
+    import pandas as pd
+
+    return pd.DataFrame({k: col.to_series() for k, col in columns.items()})
@@ -0,0 +1,35 @@
+"""Test fixtures (offline, against `testing.FakeNotion`)."""
+
+from __future__ import annotations
+
+import pytest
+
+from auto_notion import blocks as blockslib
+from auto_notion import cache as cachelib
+from auto_notion import metrics as metricslib
+from auto_notion import relation as relationlib
+from auto_notion import testing
+
+
+def _clear_caches() -> None:
+    cachelib.get_schema_cache.cache_clear()
+    blockslib.get_block_cache.cache_clear()
+    relationlib.get_page_cache.cache_clear()
+    relationlib._get_database.cache_clear()
+    metricslib.get_metrics().reset()
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Isolate the on-disk & process-wide caches of each test."""
+    monkeypatch.setenv("AUTO_NOTION_CACHE_DIR", str(tmp_path / "cache"))
+    _clear_caches()
+    yield tmp_path / "cache"
+    _clear_caches()
+
+
+@pytest.fixture
+def server():
+    server = testing.FakeNotion()
+    with server.install():
+        yield server
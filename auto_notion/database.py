@@ -3,12 +3,29 @@
 from __future__ import annotations
 
 import collections
+import contextlib
+import datetime
 import functools
+import itertools
+import time
 import typing
+from collections.abc import Iterable, Iterator, Mapping
 from typing import Any
 
+from auto_notion import arrow as arrowlib
+from auto_notion import cache as cachelib
+from auto_notion import checkpoint as checkpointlib
+from auto_notion import codec as codeclib
+from auto_notion import columnar
+from auto_notion import diff as difflib
+from auto_notion import insert as insertlib
+from auto_notion import metrics as metricslib
+from auto_notion import mirror as mirrorlib
 from auto_notion import page as pagelib
-from auto_notion import property_info, utils
+from auto_notion import property_info
+from auto_notion import relation as relationlib
+from auto_notion import table as tablelib
+from auto_notion import utils
 from auto_notion.typing import Json
 
 if True:
@@ -16,20 +33,38 @@ if True:
     from auto_notion import filters as filterslib
 
 if typing.TYPE_CHECKING:
+    import notion_client
     import pandas as pd
+    import pyarrow as pa
 
 
 class Database:
 
-    def __init__(self, id: str):
-        # TODO: Add caching
+    def __init__(self, id: str, *, cache: bool = True):
         # TODO: Better way of controlling client
         self.id = id
         self.api = utils.get_client()
+        self._cache = cache
 
     @functools.cached_property
     def _retrive(self) -> Json:
-        return self.api.databases.retrieve(self.id)
+        if not self._cache:
+            return self.api.databases.retrieve(self.id)
+        return cachelib.get_schema_cache().get(
+            self.id,
+            fetch=lambda: self.api.databases.retrieve(self.id),
+        )
+
+    @functools.cached_property
+    def codec(self) -> codeclib.RowCodec:
+        return codeclib.RowCodec.from_db(self)
+
+    def refresh(self) -> None:
+        """Force re-fetching the schema (e.g. after adding a column)."""
+        if self._cache:
+            cachelib.get_schema_cache().invalidate(self.id)
+        for name in ("_retrive", "props", "codec"):
+            self.__dict__.pop(name, None)
 
     @functools.cached_property
     def props(self) -> property_info.PropertiesInfo:
@@ -44,70 +79,356 @@ class Database:
     def __getitem__(self, filters: filterslib.Filter) -> DatabaseView:
         return DatabaseView(self, filter=filters)
 
+    def prefetch(self, depth: int = 2) -> DatabaseView:
+        return DatabaseView(self).prefetch(depth)
+
+    def select(self, *names: str) -> DatabaseView:
+        return DatabaseView(self).select(*names)
+
+    def resolve(self, *names: str) -> DatabaseView:
+        return DatabaseView(self).resolve(*names)
+
     @property
     def df(self) -> pd.DataFrame:
         return DatabaseView(self).df
 
+    def iter_batches(self, batch_size: int = 1000) -> Iterator[pd.DataFrame]:
+        return DatabaseView(self).iter_batches(batch_size)
+
+    def snapshot(self) -> tablelib.DatabaseTable:
+        return DatabaseView(self).snapshot()
+
+    def to_arrow(self) -> pa.Table:
+        return DatabaseView(self).to_arrow()
+
+    def changed_since(
+        self,
+        since: datetime.datetime | checkpointlib.Checkpoint | None,
+    ) -> DatabaseView:
+        return DatabaseView(self).changed_since(since)
+
+    def mirror(self) -> mirrorlib.LocalMirror:
+        """Returns a synced local replica of the database (see `mirror.py`)."""
+        mirror = mirrorlib.LocalMirror(self)
+        mirror.sync()
+        return mirror
+
+    def insert_many(
+        self,
+        records: Iterable[Mapping[str, Any]],
+        *,
+        key: str | None = None,
+        max_concurrency: int = 8,
+    ) -> insertlib.InsertResult:
+        """Create one page per record (`{snake_name: value}`), concurrently.
+
+        Failures are reported per row in the returned `InsertResult`. Records
+        whose `key` property already exists are skipped (see `insert.py`).
+        """
+        return insertlib.insert_many(
+            self, records, key=key, max_concurrency=max_concurrency
+        )
+
+    def insert_df(
+        self,
+        df: pd.DataFrame,
+        *,
+        key: str | None = None,
+        max_concurrency: int = 8,
+    ) -> insertlib.InsertResult:
+        """Create one page per row of `df` (columns are the snake names)."""
+        return insertlib.insert_df(self, df, key=key, max_concurrency=max_concurrency)
+
+    def apply_df(
+        self,
+        df: pd.DataFrame,
+        *,
+        original: pd.DataFrame | None = None,
+        max_concurrency: int = 8,
+    ) -> difflib.ApplyResult:
+        """Push the edits of `db.df` (only the changed cells, see `diff.py`)."""
+        return difflib.apply_df(
+            self, df, original=original, max_concurrency=max_concurrency
+        )
+
     @property
-    def filters(self) -> filterslib.FilterProperties:
+    def filter(self) -> filterslib.FilterProperties:
         return filterslib.FilterProperties.from_json(
             self._retrive["properties"],
             db=self,
         )
 
+    filters = filter  # Alias
+
     # TODO: Custom __repr__
 
 
 class DatabaseView:
 
-    def __init__(self, db: Database, *, filter: filterslib.Filter | None = None):
+    def __init__(
+        self,
+        db: Database,
+        *,
+        filter: filterslib.Filter | None = None,
+        prefetch: int = 0,
+        properties: tuple[str, ...] | None = None,
+        sorts: list[Json] | None = None,
+        checkpoint: checkpointlib.Checkpoint | None = None,
+        resolve: tuple[str, ...] = (),
+    ):
         self._db = db
         # Could use
         # from notion_client.helpers import iterate_paginated_api
         # instead
         self._results = collections.deque()
-        self._next_cursor = None
-        self._has_more = True
+        self._pages: Iterator[Json] | None = None
+        # Number of rows & seconds spent in `__next__` (for the metrics), split
+        # between waiting for the query pages and building the rows
+        self._num_rows = 0
+        self._fetch_seconds = 0.0
+        self._rows_seconds = 0.0
         self._filter = filter
+        # Number of query pages fetched ahead in a background thread
+        self._prefetch = prefetch
+        # Subset of properties (snake names) to fetch
+        self._properties = properties
+        self._sorts = sorts
+        # Checkpoint updated with the `last_edited_time` of the fetched rows
+        self._checkpoint = checkpoint
+        # Relation properties (snake names) whose pages are fetched by batch
+        self._resolve = resolve
 
         if filter is not None and not isinstance(filter, filterslib.Filter):
             raise TypeError(f"Invalid filter: {filter!r}")
 
+    def prefetch(self, depth: int = 2) -> DatabaseView:
+        """Fetch the next `depth` query pages while the current one is consumed."""
+        return self._replace(prefetch=depth)
+
+    def select(self, *names: str) -> DatabaseView:
+        """Only fetch the given properties (e.g. `db.select('done', 'snooze')`)."""
+        self._get_props(names)
+        return self._replace(properties=names)
+
+    def resolve(self, *names: str) -> DatabaseView:
+        """Fetch the related pages of the rows by batch (see `relation.py`).
+
+        ```python
+        for row in db.resolve('project'):
+            row.project[0].page.name
+        ```
+        """
+        all_props = self._get_props(names)
+        for name in names:
+            if all_props[name].type != "relation":
+                raise ValueError(
+                    f"Cannot resolve {name!r}: {all_props[name].type} property "
+                    "(expected relation)."
+                )
+        return self._replace(resolve=self._resolve + names)
+
+    def _get_props(self, names: Iterable[str]) -> dict[str, Any]:
+        """Returns the schema properties, validating the `names`.
+
+        The schema is refreshed once if some names are unknown (column added or
+        renamed since the schema was cached).
+        """
+        all_props = self._db.props._props
+        if any(name not in all_props for name in names):
+            self._db.refresh()
+            all_props = self._db.props._props
+        for name in names:
+            if name not in all_props:
+                raise KeyError(
+                    f"Unknown property {name!r}. Available: {list(all_props)}"
+                )
+        return all_props
+
+    def changed_since(
+        self,
+        since: datetime.datetime | checkpointlib.Checkpoint | None,
+    ) -> DatabaseView:
+        """Only fetch the rows edited since the given time or checkpoint.
+
+        Rows are returned most recently edited first. When `since` is a
+        `Checkpoint`, it records the latest edit seen, to be saved with
+        `checkpoint.commit()` once the rows are processed.
+
+        Note: Notion `last_edited_time` is rounded to the minute, so rows edited
+        during the checkpoint minute are returned again on the next sync.
+        """
+        kwargs = {}
+        if isinstance(since, checkpointlib.Checkpoint):
+            kwargs["checkpoint"] = since
+            since = since.time
+        if since is not None:
+            since_filter = filterslib.last_edited_time >= since
+            if self._filter is not None:
+                since_filter = self._filter & since_filter
+            kwargs["filter"] = since_filter
+        return self._replace(
+            sorts=[{"timestamp": "last_edited_time", "direction": "descending"}],
+            **kwargs,
+        )
+
+    def _replace(self, **kwargs: Any) -> DatabaseView:
+        kwargs = {
+            "filter": self._filter,
+            "prefetch": self._prefetch,
+            "properties": self._properties,
+            "sorts": self._sorts,
+            "checkpoint": self._checkpoint,
+            "resolve": self._resolve,
+            **kwargs,
+        }
+        return type(self)(self._db, **kwargs)
+
     def __iter__(self) -> DatabaseView:
         return self
 
     def __next__(self) -> PropertyProxy:
-        if not self._results:
-            if not self._has_more:
-                # No more results
-                raise StopIteration
-            else:
-                # Fetch the next results
-                results = self._db.api.databases.query(
-                    database_id=self._db.id,
-                    start_cursor=self._next_cursor,
-                    # filter_properties
-                    # page_size
-                    # sorts
-                    filter=self._json_filter,
-                )
-                self._results.extend(results["results"])
-                self._next_cursor = results["next_cursor"]
-                self._has_more = results["has_more"]
-        page = pagelib.DatabasePage.from_json(self._results.popleft(), db=self._db)
-        return PropertyProxy(page)
+        start = time.perf_counter()
+        if self._pages is None:
+            self._pages = self._iter_raw_pages()
+        while not self._results:
+            fetch_start = time.perf_counter()
+            try:
+                results = next(self._pages)["results"]
+            except StopIteration:
+                self._fetch_seconds += time.perf_counter() - fetch_start
+                self._rows_seconds += fetch_start - start
+                self._record_metrics()
+                raise
+            self._fetch_seconds += time.perf_counter() - fetch_start
+            start += time.perf_counter() - fetch_start
+            self._db.codec.flush_metrics()
+            self._results.extend(results)
+            self._num_rows += len(results)
+        row = PropertyProxy(self._results.popleft(), codec=self._db.codec)
+        self._rows_seconds += time.perf_counter() - start
+        return row
+
+    def _record_metrics(self) -> None:
+        """Record the iteration metrics (time spent in the user code excluded)."""
+        metrics = metricslib.get_metrics()
+        self._db.codec.flush_metrics()
+        metrics.add("auto_notion.rows", self._num_rows, kind="iter")
+        metrics.record("auto_notion.iter.duration", self._fetch_seconds, stage="fetch")
+        metrics.record("auto_notion.iter.duration", self._rows_seconds, stage="rows")
+        self._num_rows = 0
+        self._fetch_seconds = 0.0
+        self._rows_seconds = 0.0
+
+    def _iter_raw_pages(self) -> Iterator[Json]:
+        pages = self._iter_pages()
+        if self._resolve:
+            # Resolved in the prefetch thread, if any
+            pages = relationlib.resolve_pages(
+                pages,
+                api=self._db.api,
+                names=[self._db.props._props[name].name for name in self._resolve],
+                cache_rows=self._properties is None,
+            )
+        if self._prefetch:
+            pages = utils.prefetch(pages, depth=self._prefetch)
+        if self._checkpoint is not None:
+            pages = self._checkpoint.track(pages)
+        return self._check_schema(pages)
+
+    def _check_schema(self, pages: Iterator[Json]) -> Iterator[Json]:
+        """Fetch the first rows, and refresh the schema if they do not match it.
+
+        Called before the decoders are built from the (possibly cached) schema,
+        so a column renamed or re-typed since the schema was cached is picked up.
+        """
+        head = []
+        for results in pages:
+            head.append(results)
+            if rows := results["results"]:
+                complete = self._properties is None
+                if not self._db.codec.matches(rows[0]["properties"], complete=complete):
+                    self._db.refresh()
+                break
+        return itertools.chain(head, pages)
+
+    def _iter_pages(self) -> Iterator[Json]:
+        # Only forward the query args (and not `self`), so an abandoned
+        # prefetching view can still be garbage collected.
+        return _iter_query_pages(self._db.api, **self._query_kwargs())
+
+    def _query_kwargs(self) -> Json:
+        query_kwargs = {
+            "database_id": self._db.id,
+            # page_size
+            "filter": self._json_filter,
+        }
+        if self._properties is not None:
+            query_kwargs["filter_properties"] = [
+                self._db.props._props[name].id for name in self._properties
+            ]
+        if self._sorts is not None:
+            query_kwargs["sorts"] = self._sorts
+        return query_kwargs
 
     @property
     def df(self) -> pd.DataFrame:
-        all_rows = list(self)
-
+        """Rows as `pd.DataFrame` (indexed by page id), see `db.apply_df`."""
         import pandas as pd
 
-        return pd.DataFrame(
-            {
-                k: _extract_all_values_for_field(all_rows, k)
-                for k in all_rows[0].INFO.props._props.keys()
-            }
+        # Decode the raw JSON directly, without creating the `PropertyProxy`
+        pages = self._iter_raw_pages()
+        columns = self._make_columns()
+        ids = []
+        for results in pages:
+            columnar.append_pages(columns, results["results"])
+            ids.extend(page["id"] for page in results["results"])
+        df = columnar.to_df(columns)
+        df.index = pd.Index(ids, name="id")
+        difflib.register_snapshot(df)
+        return df
+
+    def iter_batches(self, batch_size: int = 1000) -> Iterator[pd.DataFrame]:
+        """Yields the rows as `pd.DataFrame` of (at most) `batch_size` rows.
+
+        Rows are decoded as the query paginates, so only a single batch is kept
+        in memory.
+        """
+        if batch_size <= 0:
+            raise ValueError(f"Invalid batch_size: {batch_size}")
+        pages = self._iter_raw_pages()
+        columns = self._make_columns()
+        num_rows = 0
+        for results in pages:
+            rows = results["results"]
+            while rows:
+                chunk = rows[: batch_size - num_rows]
+                rows = rows[len(chunk) :]
+                columnar.append_pages(columns, chunk)
+                num_rows += len(chunk)
+                if num_rows == batch_size:
+                    yield columnar.to_df(columns)
+                    columnar.clear(columns)
+                    num_rows = 0
+        if num_rows:
+            yield columnar.to_df(columns)
+
+    def snapshot(self) -> tablelib.DatabaseTable:
+        """Load all rows into a compact in-memory `DatabaseTable`."""
+        pages = self._iter_raw_pages()
+        return tablelib.DatabaseTable.from_pages(
+            (page for results in pages for page in results["results"]),
+            codec=self._db.codec,
+            names=self._properties,
+        )
+
+    def to_arrow(self) -> pa.Table:
+        """Fetch the rows as a `pa.Table` (see `arrow.py` to save snapshots)."""
+        return arrowlib.to_table(self)
+
+    def _make_columns(self) -> dict[str, columnar.Column]:
+        return columnar.make_columns(
+            self._db._retrive["properties"],
+            names=self._properties,
         )
 
     @property
@@ -118,27 +439,78 @@ class DatabaseView:
             return self._filter.to_json()
 
 
-def _extract_all_values_for_field(rows: PropertyProxy, key: str):
-    return [getattr(r, key) for r in rows]
+def _iter_query_pages(api: notion_client.Client, **query_kwargs) -> Iterator[Json]:
+    next_cursor = None
+    has_more = True
+    while has_more:
+        results = api.databases.query(start_cursor=next_cursor, **query_kwargs)
+        yield results
+        next_cursor = results["next_cursor"]
+        has_more = results["has_more"]
 
 
 class PropertyProxy:
-    """Wrap the page to allow easy access to property fields."""
+    """Wrap the page to allow easy access to property fields.
+
+    Values are decoded lazily from the raw query JSON with the database
+    `RowCodec`. The `DatabasePage` (`row.INFO`) is only created when accessed.
+    """
+
+    __slots__ = ("_json", "_codec", "_page")
 
-    def __init__(self, page):
-        object.__setattr__(self, "_page", page)
+    _PAGE_CLS: typing.ClassVar[type[pagelib.DatabasePage]] = pagelib.DatabasePage
 
-    # Could merge with PropertiesBase (by unifying `get_props_fn`)
+    def __init__(self, json: Json, *, codec: codeclib.RowCodec):
+        object.__setattr__(self, "_json", json)
+        object.__setattr__(self, "_codec", codec)
+        object.__setattr__(self, "_page", None)
 
     def __dir__(self) -> list[str]:
-        return list(self._page.props._props) + ["INFO"]
+        fields = [utils.to_snake_case(name) for name in self._json["properties"]]
+        return fields + ["INFO", "batch"]
 
     def __getattr__(self, key: str) -> Any:
-        return self._page.props._props[key].value
+        field = self._field(key)
+        page = self._page
+        if page is not None and page._pending and field.id in page._pending:
+            return page._pending[field.id][0]
+        self._codec.num_decoded.value += 1
+        return field.decode(self._json["properties"][field.name])
 
     def __setattr__(self, key: str, value: Any) -> None:
-        self._page.props._props[key].value = value
+        field = self._field(key)
+        query = field.encode(value)
+        metrics = metricslib.get_metrics()
+        metrics.add("auto_notion.writes", type=field.type)
+        page = self._page
+        pending = None if page is None else page._pending
+        if (pending is None or field.id not in pending) and field.prop.is_noop(
+            self._json["properties"][field.name], query
+        ):
+            metrics.add("auto_notion.writes.skipped", type=field.type)
+            return
+        page = self.INFO
+        if page._pending is not None:  # Inside `with row.batch():`
+            page._pending[field.id] = (value, query)
+        else:
+            page.update({field.id: query})
+
+    def _field(self, key: str) -> codeclib.FieldCodec:
+        field = self._codec.field(key, self._json["properties"])
+        if field is None:
+            raise AttributeError(
+                f"{type(self).__name__} has no property {key!r}. Available: "
+                f"{self.__dir__()[:-2]}"
+            )
+        return field
+
+    def batch(self) -> contextlib.AbstractContextManager[None]:
+        """Send all assignments inside the block as a single update."""
+        return self.INFO.batch()
 
     @property
     def INFO(self) -> pagelib.DatabasePage:
+        if self._page is None:
+            page = self._PAGE_CLS.from_json(self._json, db=self._codec.db)
+            object.__setattr__(self, "_page", page)
         return self._page
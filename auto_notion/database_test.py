@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+import auto_notion
+from auto_notion import metrics as metricslib
+
+
+@pytest.fixture
+def db_json(server):
+    return server.add_database(num_rows=230)
+
+
+@pytest.fixture
+def db(db_json):
+    return auto_notion.Database(db_json.id)
+
+
+def test_df(db):
+    df = db.df
+    rows = list(db)
+    assert df.index.name == "id"
+    assert df.index.tolist() == [row.INFO.id for row in rows]
+    assert list(df.columns) == [
+        "name",
+        "done",
+        "status",
+        "tags",
+        "priority",
+        "due",
+        "notes",
+        "created",
+    ]
+    assert df.dtypes.astype(str).to_dict() == {
+        "name": "string",
+        "done": "boolean",
+        "status": "category",
+        "tags": "object",
+        "priority": "Float64",
+        "due": "datetime64[us, UTC]",
+        "notes": "string",
+        "created": "datetime64[us, UTC]",
+    }
+    # Same values as the rows
+    for row, (_, values) in zip(rows[:20], df.iterrows()):
+        assert values["name"] == row.name
+        assert values["done"] == row.done
+        assert values["tags"] == row.tags
+        if row.priority is None:
+            assert pd.isna(values["priority"])
+        else:
+            assert values["priority"] == row.priority
+        if row.status is None:
+            assert pd.isna(values["status"])
+        else:
+            assert values["status"] == row.status
+    # Status categories are the schema options
+    assert list(df["status"].cat.categories) == db.props.status.choices
+
+
+def test_df_view(db):
+    done = db[db.filter.done].df
+    assert len(done) and done["done"].all()
+    assert len(done) == sum(row.done for row in db)
+
+    selected = db.select("name", "priority").df
+    assert list(selected.columns) == ["name", "priority"]
+    assert len(selected) == 230
+
+    empty = db[db.filter.name == "unknown"].df
+    assert len(empty) == 0
+    assert list(empty.columns) == list(db.df.columns)
+
+
+def _response_bytes() -> float:
+    return metricslib.get_metrics().counter(
+        "notion.response.bytes", endpoint="POST databases/{id}/query"
+    )
+
+
+def test_select(db):
+    rows = list(db)
+    full_bytes = _response_bytes()
+    selected = list(db.select("name", "done"))
+    # Only the selected properties are sent by the API
+    assert _response_bytes() - full_bytes < full_bytes
+    assert [row.INFO.id for row in selected] == [row.INFO.id for row in rows]
+    for row, selected_row in zip(rows, selected):
+        assert (selected_row.name, selected_row.done) == (row.name, row.done)
+    with pytest.raises(AttributeError, match="priority"):
+        selected[0].priority
+    # Updates still work on the selected properties
+    selected[0].done = not rows[0].done
+    assert next(iter(db)).done != rows[0].done
+
+
+def test_select_view(db):
+    view = db[db.filter.done].select("priority")
+    rows = list(view)
+    assert len(rows) == sum(row.done for row in db)
+    assert {row.INFO.id: row.priority for row in rows} == {
+        row.INFO.id: row.priority for row in db if row.done
+    }
+    with pytest.raises(AttributeError, match="done"):
+        rows[0].done
+
+
+def test_select_unknown(db_json, db):
+    with pytest.raises(KeyError, match="unknown"):
+        db.select("unknown")
+    # Column added since the schema was cached
+    db_json.update_property("Notes", new_name="Comments")
+    rows = list(db.select("comments"))
+    assert len(rows) == 230
+    assert db.props.comments.name == "Comments"
+
+
+@pytest.mark.parametrize("batch_size", [7, 100, 1000])
+def test_iter_batches(db, batch_size):
+    batches = list(db.iter_batches(batch_size))
+    sizes = [len(df) for df in batches]
+    assert sum(sizes) == 230
+    assert all(size == batch_size for size in sizes[:-1])
+    assert 0 < sizes[-1] <= batch_size
+    # Same rows & columns as `db.df`
+    df = pd.concat(batches, ignore_index=True)
+    expected = db.df.reset_index(drop=True)
+    pd.testing.assert_frame_equal(df, expected)
+
+
+def test_iter_batches_dtypes(db_json, db):
+    # A float only in the last batch
+    db_json.update(db_json.page_id(200), {"properties": {"p4": {"number": 2.5}}})
+    batches = list(db.iter_batches(100))
+    assert len(batches) == 3
+    # The dtypes come from the schema, not from the values of the batch
+    dtypes = [df.dtypes.to_dict() for df in batches]
+    assert dtypes[0] == dtypes[1] == dtypes[2]
+    assert dtypes[0]["priority"] == "Float64"
+    assert 2.5 in batches[2]["priority"].tolist()
+
+
+def test_iter_batches_invalid(db):
+    with pytest.raises(ValueError, match="batch_size"):
+        next(db.iter_batches(0))
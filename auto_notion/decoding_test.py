@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import json
+import sys
+
+import orjson
+import pytest
+
+import auto_notion
+from auto_notion import decoding
+
+
+@pytest.fixture(autouse=True)
+def clear_loads():
+    decoding.get_loads.cache_clear()
+    yield
+    decoding.get_loads.cache_clear()
+
+
+@pytest.mark.parametrize(
+    "name, loads",
+    [(None, orjson.loads), ("orjson", orjson.loads), ("json", json.loads)],
+)
+def test_get_loads(monkeypatch, name, loads):
+    if name is None:
+        monkeypatch.delenv("AUTO_NOTION_JSON", raising=False)
+    else:
+        monkeypatch.setenv("AUTO_NOTION_JSON", name)
+    assert decoding.get_loads() is loads
+    assert decoding.loads(b'{"a": [1, "\\u00e9"]}') == {"a": [1, "é"]}
+
+
+def test_get_loads_without_orjson(monkeypatch):
+    monkeypatch.setitem(sys.modules, "orjson", None)  # Not installed
+    monkeypatch.delenv("AUTO_NOTION_JSON", raising=False)
+    assert decoding.get_loads() is json.loads
+
+    decoding.get_loads.cache_clear()
+    monkeypatch.setenv("AUTO_NOTION_JSON", "orjson")
+    with pytest.raises(ImportError):
+        decoding.get_loads()
+
+
+def test_get_loads_invalid(monkeypatch):
+    monkeypatch.setenv("AUTO_NOTION_JSON", "simplejson")
+    with pytest.raises(ValueError, match="simplejson"):
+        decoding.get_loads()
+
+
+def test_same_rows(server, monkeypatch):
+    db_json = server.add_database(num_rows=120)
+
+    def fetch(name: str):
+        monkeypatch.setenv("AUTO_NOTION_JSON", name)
+        decoding.get_loads.cache_clear()
+        db = auto_notion.Database(db_json.id)
+        return [(row.INFO.id, row.INFO.last_edited.time, row.name) for row in db], db.df
+
+    rows, df = fetch("orjson")
+    json_rows, json_df = fetch("json")
+    assert json_rows == rows
+    assert len(rows) == 120
+    assert json_df.equals(df)
@@ -0,0 +1,192 @@
+"""Diff-based bulk update from a `pd.DataFrame`.
+
+```python
+df = db.df  # Indexed by page id
+df.loc[df.snooze == 'In 1 Day', 'reminder'] = tomorrow
+df.loc[df.snooze == 'In 1 Day', 'snooze'] = None
+
+db.apply_df(df)  # Only send the changed cells (one `pages.update` per page)
+```
+
+`db.df` keeps a (copy-on-write) snapshot of the frame it returns, which
+`apply_df` compares against (found through `df.attrs`, so it also works on
+copies / subsets of the frame). Only the latest snapshots are kept.
+"""
+
+from __future__ import annotations
+
+import collections
+import dataclasses
+import typing
+from typing import Any
+
+from auto_notion import insert as insertlib
+from auto_notion.typing import Json
+
+if typing.TYPE_CHECKING:
+    import pandas as pd
+
+    from auto_notion import database
+
+_ATTR = "auto_notion.snapshot"
+
+_MAX_SNAPSHOTS = 4
+
+# Token (in `df.attrs`) -> frame as returned by `db.df` (most recent last)
+_SNAPSHOTS: collections.OrderedDict[str, pd.DataFrame] = collections.OrderedDict()
+
+
+@dataclasses.dataclass
+class ApplyResult:
+    """Outcome of `apply_df`.
+
+    Attributes:
+        updated: Ids of the updated pages
+        errors: Page id -> error, for the pages which were not updated
+    """
+
+    updated: list[str] = dataclasses.field(default_factory=list)
+    errors: dict[str, Exception] = dataclasses.field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+def register_snapshot(df: pd.DataFrame) -> None:
+    """Keep a snapshot of the frame, for the later `apply_df`."""
+    import uuid
+
+    import pandas as pd
+
+    # With copy-on-write (default in pandas 3), the copy is free until `df` is
+    # edited.
+    deep = int(pd.__version__.split(".")[0]) < 3
+    token = uuid.uuid4().hex
+    df.attrs[_ATTR] = token
+    _SNAPSHOTS[token] = df.copy(deep=deep)
+    while len(_SNAPSHOTS) > _MAX_SNAPSHOTS:
+        _SNAPSHOTS.popitem(last=False)
+
+
+def _get_snapshot(df: pd.DataFrame) -> pd.DataFrame:
+    snapshot = _SNAPSHOTS.get(df.attrs.get(_ATTR))
+    if snapshot is None:
+        raise ValueError(
+            "Could not find the snapshot the frame comes from (only the "
+            f"{_MAX_SNAPSHOTS} latest `db.df` are kept). Please pass `original=`."
+        )
+    return snapshot
+
+
+def _is_missing(value: Any) -> bool:
+    import pandas as pd
+
+    return not isinstance(value, (list, tuple)) and pd.isna(value)
+
+
+def _same(a: Any, b: Any) -> bool:
+    if _is_missing(a) or _is_missing(b):
+        return _is_missing(a) and _is_missing(b)
+    return bool(a == b)
+
+
+def diff_df(
+    original: pd.DataFrame,
+    edited: pd.DataFrame,
+) -> dict[str, dict[str, Any]]:
+    """Returns the changed cells, as `{page_id: {snake_name: new_value}}`."""
+    if not edited.index.isin(original.index).all():
+        new_ids = edited.index[~edited.index.isin(original.index)]
+        raise ValueError(
+            f"Rows not in the original frame: {list(new_ids[:5])}. Use "
+            "`db.insert_df` to create new pages."
+        )
+    if missing := [k for k in edited.columns if k not in original.columns]:
+        raise KeyError(f"Columns not in the original frame: {missing}")
+
+    changes = {}
+    original = original.loc[edited.index]
+    for k in edited.columns:
+        old_values = original[k].astype(object).tolist()
+        new_values = edited[k].astype(object).tolist()
+        for id, old, new in zip(edited.index, old_values, new_values):
+            if not _same(old, new):
+                new = None if _is_missing(new) else insertlib._from_pandas(new)
+                changes.setdefault(id, {})[k] = new
+    return changes
+
+
+def apply_df(
+    db: database.Database,
+    edited: pd.DataFrame,
+    *,
+    original: pd.DataFrame | None = None,
+    max_concurrency: int = 8,
+) -> ApplyResult:
+    """Send the cells of `edited` which differ from `original`.
+
+    Args:
+        db: Database the frame comes from
+        edited: The edited `db.df` (indexed by page id)
+        original: Frame to compare against (default to the `db.df` snapshot
+            `edited` comes from)
+        max_concurrency: Number of concurrent `pages.update`
+
+    Returns:
+        The updated pages and per-page errors. The `db.df` snapshot is updated
+        with the applied values, so re-applying the frame only re-sends the
+        failed pages.
+    """
+    import concurrent.futures
+
+    from_snapshot = original is None
+    if from_snapshot:
+        original = _get_snapshot(edited)
+    changes = diff_df(original, edited)
+
+    # Only the edited columns are validated (e.g. unchanged read-only columns
+    # like `created_time` are fine)
+    edited_columns = dict.fromkeys(k for values in changes.values() for k in values)
+    fields = insertlib._get_fields(db.codec, edited_columns)
+    result = ApplyResult()
+    queries = {}
+    for id, values in changes.items():
+        try:
+            queries[id] = {fields[k].id: fields[k].encode(v) for k, v in values.items()}
+        except Exception as e:  # pylint: disable=broad-except
+            result.errors[id] = e
+
+    def update(id: str, properties: Json) -> None:
+        db.api.pages.update(id, properties=properties)
+
+    # Requests are throttled by the process-wide rate limiter of the client
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrency) as ex:
+        futures = {ex.submit(update, id, q): id for id, q in queries.items()}
+        for future in concurrent.futures.as_completed(futures):
+            id = futures[future]
+            try:
+                future.result()
+            except Exception as e:  # pylint: disable=broad-except
+                e.add_note(f"Page {id}: {changes[id]}")
+                result.errors[id] = e
+            else:
+                result.updated.append(id)
+
+    if from_snapshot:
+        _mark_applied(original, edited, changes, result.updated)
+    return result
+
+
+def _mark_applied(
+    original: pd.DataFrame,
+    edited: pd.DataFrame,
+    changes: dict[str, dict[str, Any]],
+    ids: list[str],
+) -> None:
+    """Copy the applied cells into the snapshot."""
+    columns = {k for id in ids for k in changes[id]}
+    for k in columns:
+        col = original[k].astype(object)
+        col.loc[ids] = edited.loc[ids, k].astype(object)
+        original[k] = col
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+import auto_notion
+from auto_notion import diff as difflib
+
+
+def test_diff_df():
+    original = pd.DataFrame(
+        {"a": [1.0, None, 3.0], "b": ["x", "y", None]}, index=["p1", "p2", "p3"]
+    )
+    edited = original.copy()
+    edited.loc["p1", "a"] = 10.0
+    edited.loc["p2", "b"] = None
+    edited.loc["p3", "b"] = None  # Unchanged missing value
+    assert difflib.diff_df(original, edited) == {"p1": {"a": 10}, "p2": {"b": None}}
+    # Subsets of the rows / columns
+    assert difflib.diff_df(original, edited.loc[["p2"], ["b"]]) == {"p2": {"b": None}}
+
+    with pytest.raises(ValueError, match="insert_df"):
+        difflib.diff_df(original, pd.DataFrame({"a": [1]}, index=["p4"]))
+    with pytest.raises(KeyError, match="c"):
+        difflib.diff_df(original, edited.assign(c=1))
+
+
+def test_apply_df_round_trip(server):
+    db_json = server.add_database(num_rows=50)
+    db = auto_notion.Database(db_json.id)
+    assert db.codec.fields["created"].type == "created_time"
+
+    # Unedited read-only columns are not sent
+    result = db.apply_df(db.df)
+    assert result.ok and not result.updated
+    assert server.requests["pages.update"] == 0
+
+
+def test_apply_df(server):
+    db_json = server.add_database(num_rows=50)
+    db = auto_notion.Database(db_json.id)
+    df = db.df
+    ids = list(df.index[:3])
+    df.loc[ids[0], "priority"] = 42
+    df.loc[ids[1], "done"] = not df.loc[ids[1], "done"]
+    df.loc[ids[1], "notes"] = "edited"
+    df.loc[ids[2], "due"] = pd.Timestamp("2030-01-01", tz="UTC")
+
+    result = db.apply_df(df)
+    assert result.ok
+    assert sorted(result.updated) == sorted(ids)
+    assert server.requests["pages.update"] == 3  # One request per page
+    assert db_json.retrieve(ids[0])["properties"]["Priority"]["number"] == 42
+    notes = db_json.retrieve(ids[1])["properties"]["Notes"]["rich_text"]
+    assert notes[0]["plain_text"] == "edited"
+    due = db_json.retrieve(ids[2])["properties"]["Due"]["date"]["start"]
+    assert due.startswith("2030-01-01")
+
+    # The snapshot is updated, so re-applying sends nothing
+    assert not db.apply_df(df).updated
+    assert server.requests["pages.update"] == 3
+
+
+def test_apply_df_read_only(server):
+    db_json = server.add_database(num_rows=5)
+    db = auto_notion.Database(db_json.id)
+    df = db.df
+    df.loc[df.index[0], "created"] = pd.Timestamp("2020-01-01", tz="UTC")
+    with pytest.raises(ValueError, match="read-only"):
+        db.apply_df(df)
+    assert server.requests["pages.update"] == 0
+
+
+def test_apply_df_errors(server):
+    db_json = server.add_database(num_rows=5)
+    db = auto_notion.Database(db_json.id)
+    df = db.df
+    status = "Blocked" if df["status"].iloc[0] != "Blocked" else "Done"
+    df["status"] = df["status"].astype(object)
+    df.loc[df.index[0], "status"] = "Unknown status"
+    df.loc[df.index[1], "priority"] = 7
+    result = db.apply_df(df)
+    assert list(result.errors) == [df.index[0]]
+    assert result.updated == [df.index[1]]
+
+    # Only the failed page is re-sent
+    df.loc[df.index[0], "status"] = status
+    result = db.apply_df(df)
+    assert result.updated == [df.index[0]]
+    assert server.requests["pages.update"] == 2
+
+
+def test_apply_df_original(server):
+    db_json = server.add_database(num_rows=5)
+    db = auto_notion.Database(db_json.id)
+    original = db.df
+    edited = original.copy()
+    edited.attrs.clear()
+    with pytest.raises(ValueError, match="original="):
+        db.apply_df(edited)
+    edited.loc[edited.index[0], "priority"] = 9
+    assert db.apply_df(edited, original=original).updated == [edited.index[0]]
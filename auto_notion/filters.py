@@ -1,15 +1,54 @@
-"""."""
+"""Database query filters.
+
+Filters are built from `db.filter.<field_name>` and can be composed with `&`,
+`|` and `~`:
+
+```python
+db[~db.filter.done & (db.filter.snooze.is_not_empty | (db.filter.size > 5))]
+```
+
+Note: Python `&`, `|` bind more tightly than comparisons, so comparisons
+should be wrapped in parenthesis when composed.
+"""
 
 from __future__ import annotations
 
 import dataclasses
-from typing import ClassVar, Self
+import datetime
+from typing import Any, ClassVar, Self
 
 from auto_notion import database, property_base
-from auto_notion.typing import Json
+from auto_notion.typing import Json, JsonValue
+
+# Condition -> negated condition. Conditions missing here cannot be inverted.
+_INVERTED_CONDITIONS = {
+    "equals": "does_not_equal",
+    "contains": "does_not_contain",
+    "is_empty": "is_not_empty",
+    "greater_than": "less_than_or_equal_to",
+    "less_than": "greater_than_or_equal_to",
+    "before": "on_or_after",
+    "after": "on_or_before",
+}
+_INVERTED_CONDITIONS.update({v: k for k, v in _INVERTED_CONDITIONS.items()})
 
+# Conditions which never match empty values. Their inversion also has to match
+# the empty values, so `~f` is the complement of `f`.
+_COMPARISONS = frozenset(
+    {
+        "greater_than",
+        "greater_than_or_equal_to",
+        "less_than",
+        "less_than_or_equal_to",
+        "before",
+        "after",
+        "on_or_before",
+        "on_or_after",
+    }
+)
 
-@dataclasses.dataclass
+
+@dataclasses.dataclass(eq=False)
 class Filter:
     bool_state: bool = True
 
@@ -19,23 +58,131 @@ class Filter:
     def __invert__(self) -> Self:
         return self.replace(bool_state=not self.bool_state)
 
+    def __and__(self, other: Filter) -> And:
+        return And.make(self, other)
+
+    def __or__(self, other: Filter) -> Or:
+        return Or.make(self, other)
+
     replace = dataclasses.replace
 
 
-@dataclasses.dataclass
-class FilterProperty(Filter, property_base.PropertyBase):
+@dataclasses.dataclass(eq=False)
+class _Compound(Filter):
+    """`and` / `or` of multiple filters."""
 
-    _TYPE_TO_CLS: ClassVar[dict[str, type[FilterProperty]]] = {}
+    OP: ClassVar[str]
+
+    filters: tuple[Filter, ...] = ()
+
+    @classmethod
+    def make(cls, *filters: Filter) -> Self:
+        flat_filters = []
+        for f in filters:
+            if not isinstance(f, Filter):
+                raise TypeError(f"Invalid filter: {f!r}")
+            if type(f) is cls and f.bool_state:  # Flatten `(a & b) & c`
+                flat_filters.extend(f.filters)
+            else:
+                flat_filters.append(f)
+        return cls(filters=tuple(flat_filters))
 
     def to_json(self) -> Json:
-        return {
-            "property": self.id,
-            self.type: self._to_json_inner(),
-        }
+        op = self.OP
+        filters = self.filters
+        if not self.bool_state:  # De Morgan: `~(a & b) == ~a | ~b`
+            op = {"and": "or", "or": "and"}[op]
+            filters = [~f for f in filters]
+        jsons = []
+        for f in filters:
+            json = f.to_json()
+            if list(json) == [op]:  # Flatten, as Notion limits the nesting depth
+                jsons.extend(json[op])
+            else:
+                jsons.append(json)
+        return {op: jsons}
+
+
+class And(_Compound):
+    OP = "and"
+
+
+class Or(_Compound):
+    OP = "or"
+
+
+@dataclasses.dataclass(eq=False)
+class _Condition(Filter):
+    """Filter with a single `{condition: value}` (e.g. `{'equals': 5}`)."""
 
-    def _to_json_inner(self) -> Json:
+    condition: tuple[str, JsonValue] | None = None
+
+    # Whether the values can be empty (e.g. not for `created_time`)
+    _NULLABLE: ClassVar[bool] = True
+    # Whether the filter is on a date (no `does_not_equal` condition)
+    _IS_DATE: ClassVar[bool] = False
+
+    def _with(self, condition: str, value: JsonValue = True) -> Self:
+        return self.replace(condition=(condition, value))
+
+    def to_json(self) -> Json:
+        jsons = [self._make_json(c) for c in self._condition_jsons()]
+        return jsons[0] if len(jsons) == 1 else {"or": jsons}
+
+    def _make_json(self, condition: Json) -> Json:
+        """Returns the filter json of the single `{condition: value}`."""
+        raise NotImplementedError
+
+    def _condition_jsons(self) -> list[Json]:
+        """Returns the `{condition: value}` of the filter (matched if any is)."""
+        if self.condition is None:
+            raise ValueError(
+                f"Filter {self._filter_name!r} has no condition. Use "
+                "`==`, `.is_empty`,..."
+            )
+        condition, value = self.condition
+        if self.bool_state:
+            return [{condition: value}]
+        if condition == "equals" and self._IS_DATE:
+            conditions = [{"before": value}, {"after": value}]
+        elif condition in _INVERTED_CONDITIONS:
+            conditions = [{_INVERTED_CONDITIONS[condition]: value}]
+        else:
+            raise ValueError(
+                f"Filter {self._filter_name!r}: {condition!r} cannot be inverted."
+            )
+        if self._NULLABLE and (len(conditions) > 1 or condition in _COMPARISONS):
+            # Empty values match neither `f` nor the inverted condition
+            conditions.append({"is_empty": True})
+        return conditions
+
+    @property
+    def _filter_name(self) -> str:
         raise NotImplementedError
 
+    # Conditions common to all types (except checkbox)
+
+    @property
+    def is_empty(self) -> Self:
+        return self._with("is_empty")
+
+    @property
+    def is_not_empty(self) -> Self:
+        return self._with("is_not_empty")
+
+
+@dataclasses.dataclass(eq=False)
+class FilterProperty(_Condition, property_base.PropertyBase):
+
+    _TYPE_TO_CLS: ClassVar[dict[str, type[FilterProperty]]] = {}
+
+    def _make_json(self, condition: Json) -> Json:
+        return {"property": self.id, self.type: condition}
+
+    @property
+    def _filter_name(self) -> str:
+        return self.name
+
 
 class FilterProperties(property_base.PropertiesBase[FilterProperty]):
     """Wrap the page to allow easy access to property fields."""
@@ -43,10 +190,225 @@ class FilterProperties(property_base.PropertiesBase[FilterProperty]):
     _PROP_CLS = FilterProperty
 
 
-class Checkbox(FilterProperty):
+# Conditions mixins
+
+
+class _Equals:
+
+    def __eq__(self, value: Any) -> Self:
+        return self._with("equals", self._serialize(value))
+
+    def __ne__(self, value: Any) -> Self:
+        return self._with("does_not_equal", self._serialize(value))
+
+    def _serialize(self, value: Any) -> JsonValue:
+        return value
+
+
+class _Contains:
+
+    def contains(self, value: Any) -> Self:
+        return self._with("contains", self._serialize(value))
+
+    def does_not_contain(self, value: Any) -> Self:
+        return self._with("does_not_contain", self._serialize(value))
+
+    def _serialize(self, value: Any) -> JsonValue:
+        return value
+
+
+class _Comparable(_Equals):
+
+    def __gt__(self, value: Any) -> Self:
+        return self._with("greater_than", self._serialize(value))
+
+    def __ge__(self, value: Any) -> Self:
+        return self._with("greater_than_or_equal_to", self._serialize(value))
+
+    def __lt__(self, value: Any) -> Self:
+        return self._with("less_than", self._serialize(value))
+
+    def __le__(self, value: Any) -> Self:
+        return self._with("less_than_or_equal_to", self._serialize(value))
+
+
+class _Text(_Equals, _Contains):
+
+    def starts_with(self, value: str) -> Self:
+        return self._with("starts_with", value)
+
+    def ends_with(self, value: str) -> Self:
+        return self._with("ends_with", value)
+
+
+class _Choice:
+
+    def _serialize(self, value: str) -> str:
+        choices = [opt["name"] for opt in self.json[self.TYPE]["options"]]
+        if value not in choices:
+            # TODO: difflib for hint ?
+            raise ValueError(f"Unexpected {self.name!r} value: {value!r}.")
+        return value
+
+
+class _Date(_Equals):
+
+    _IS_DATE = True
+
+    # Note: Notion date filters use `before`/`after` rather than
+    # `less_than`/`greater_than`
+
+    def __gt__(self, value: datetime.date) -> Self:
+        return self._with("after", self._serialize(value))
+
+    def __ge__(self, value: datetime.date) -> Self:
+        return self._with("on_or_after", self._serialize(value))
+
+    def __lt__(self, value: datetime.date) -> Self:
+        return self._with("before", self._serialize(value))
+
+    def __le__(self, value: datetime.date) -> Self:
+        return self._with("on_or_before", self._serialize(value))
+
+    def __ne__(self, value: datetime.date) -> Self:
+        return (self < value) | (self > value)
+
+    def _serialize(self, value: datetime.date) -> str:
+        if not isinstance(value, datetime.date):
+            raise TypeError(f"Unexpected {self._filter_name!r} value: {value!r}")
+        return value.isoformat()
+
+    # Relative conditions
+
+    @property
+    def past_week(self) -> Self:
+        return self._with("past_week", {})
+
+    @property
+    def past_month(self) -> Self:
+        return self._with("past_month", {})
+
+    @property
+    def past_year(self) -> Self:
+        return self._with("past_year", {})
+
+    @property
+    def next_week(self) -> Self:
+        return self._with("next_week", {})
+
+    @property
+    def next_month(self) -> Self:
+        return self._with("next_month", {})
+
+    @property
+    def next_year(self) -> Self:
+        return self._with("next_year", {})
+
+
+class _Id(_Contains):
+    """People & relations."""
+
+    def _serialize(self, value: Any) -> str:
+        return getattr(value, "id", value)  # Accept `User`, `DatabasePage`
+
+
+# Properties
+
+
+class Checkbox(_Equals, FilterProperty):
     TYPE = "checkbox"
 
-    def _to_json_inner(self) -> Json:
-        return {
-            "equals": self.bool_state,
-        }
+    _NULLABLE = False
+
+    def _condition_jsons(self) -> list[Json]:
+        # `db.filter.done` is a valid filter by itself
+        if self.condition is None:
+            return [{"equals": self.bool_state}]
+        return super()._condition_jsons()
+
+
+class Number(_Comparable, FilterProperty):
+    TYPE = "number"
+
+
+class Title(_Text, FilterProperty):
+    TYPE = "title"
+
+
+class RichText(_Text, FilterProperty):
+    TYPE = "rich_text"
+
+
+class Url(_Text, FilterProperty):
+    TYPE = "url"
+
+
+class Email(_Text, FilterProperty):
+    TYPE = "email"
+
+
+class PhoneNumber(_Text, FilterProperty):
+    TYPE = "phone_number"
+
+
+class Select(_Choice, _Equals, FilterProperty):
+    TYPE = "select"
+
+
+class Status(_Choice, _Equals, FilterProperty):
+    TYPE = "status"
+
+
+class MultiSelect(_Choice, _Contains, FilterProperty):
+    TYPE = "multi_select"
+
+
+class Date(_Date, FilterProperty):
+    TYPE = "date"
+
+
+class CreatedTime(_Date, FilterProperty):
+    TYPE = "created_time"
+    _NULLABLE = False
+
+
+class LastEditedTime(_Date, FilterProperty):
+    TYPE = "last_edited_time"
+    _NULLABLE = False
+
+
+class People(_Id, FilterProperty):
+    TYPE = "people"
+
+
+class CreatedBy(_Id, FilterProperty):
+    TYPE = "created_by"
+
+
+class LastEditedBy(_Id, FilterProperty):
+    TYPE = "last_edited_by"
+
+
+class Relation(_Id, FilterProperty):
+    TYPE = "relation"
+
+
+# Page timestamps (available even when the database has no matching column)
+
+
+@dataclasses.dataclass(eq=False)
+class Timestamp(_Date, _Condition):
+    timestamp: str = "last_edited_time"
+
+    _NULLABLE = False
+
+    def _make_json(self, condition: Json) -> Json:
+        return {"timestamp": self.timestamp, self.timestamp: condition}
+
+    @property
+    def _filter_name(self) -> str:
+        return self.timestamp
+
+
+created_time = Timestamp(timestamp="created_time")
+last_edited_time = Timestamp(timestamp="last_edited_time")
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import datetime
+
+import pytest
+
+import auto_notion
+from auto_notion import filters as filterslib
+
+
+@pytest.fixture
+def db(server):
+    db_json = server.add_database(num_rows=200)
+    return auto_notion.Database(db_json.id)
+
+
+# Rows are created every minute from 2024-01-01
+_CREATED = datetime.datetime(2024, 1, 1, 0, 5, tzinfo=datetime.timezone.utc)
+
+
+def _ids(view) -> set[str]:
+    return {row.INFO.id for row in view}
+
+
+def test_invert_condition(db):
+    f = db.filter
+    assert (~f.done).to_json() == {"property": "p1", "checkbox": {"equals": False}}
+    # Empty values match neither `f` nor its inverted condition
+    assert (~(f.priority > 3)).to_json() == {
+        "or": [
+            {"property": "p4", "number": {"less_than_or_equal_to": 3}},
+            {"property": "p4", "number": {"is_empty": True}},
+        ]
+    }
+    assert (~(f.priority <= 3)).to_json()["or"][0]["number"] == {"greater_than": 3}
+    assert (~(f.status == "Done")).to_json()["select"] == {"does_not_equal": "Done"}
+    assert (~f.tags.contains("work")).to_json()["multi_select"] == {
+        "does_not_contain": "work"
+    }
+    assert (~f.due.is_empty).to_json()["date"] == {"is_not_empty": True}
+    assert (~(f.due < datetime.date(2024, 6, 1))).to_json()["or"][0]["date"] == {
+        "on_or_after": "2024-06-01"
+    }
+    # Notion has no `does_not_equal` for dates
+    assert (~(f.due == datetime.date(2024, 6, 1))).to_json() == {
+        "or": [
+            {"property": "p5", "date": {"before": "2024-06-01"}},
+            {"property": "p5", "date": {"after": "2024-06-01"}},
+            {"property": "p5", "date": {"is_empty": True}},
+        ]
+    }
+    # Timestamps are never empty
+    after = filterslib.last_edited_time > datetime.date(2024, 6, 1)
+    assert (~after).to_json() == {
+        "timestamp": "last_edited_time",
+        "last_edited_time": {"on_or_before": "2024-06-01"},
+    }
+    # Double inversion is the identity
+    assert (~~(f.priority > 3)).to_json() == (f.priority > 3).to_json()
+
+
+def test_invert_compound(db):
+    f = db.filter
+    done = f.done.to_json()
+    not_done = (~f.done).to_json()
+    high = (f.priority > 3).to_json()
+    not_high = (~(f.priority > 3)).to_json()
+    # Nested `or` are flattened, as Notion limits the nesting depth
+    assert (~(f.done & (f.priority > 3))).to_json() == {
+        "or": [not_done, *not_high["or"]]
+    }
+    assert (~(f.done | (f.priority > 3))).to_json() == {"and": [not_done, not_high]}
+    # Nested: `~(a & ~(b | c)) == ~a | b | c`
+    tags = f.tags.contains("home")
+    assert (~(f.done & ~((f.priority > 3) | tags))).to_json() == {
+        "or": [not_done, high, tags.to_json()]
+    }
+    # Compounds of a different op are not flattened into their parent
+    assert (~(f.done & f.done) & f.done).to_json() == {
+        "and": [{"or": [not_done, not_done]}, done]
+    }
+
+
+def test_not_invertible(db):
+    with pytest.raises(ValueError, match="cannot be inverted"):
+        (~db.filter.name.starts_with("call")).to_json()
+    with pytest.raises(ValueError, match="cannot be inverted"):
+        (~db.filter.due.past_week).to_json()
+
+
+def test_date_does_not_equal(server, db):
+    # Notion rejects `does_not_equal` on dates
+    query = {"property": "p5", "date": {"does_not_equal": "2024-06-01"}}
+    with pytest.raises(Exception, match="Unsupported date condition"):
+        db.api.databases.query(db.id, filter=query)
+
+
+@pytest.mark.parametrize(
+    "make_filter",
+    [
+        lambda f: f.done,
+        lambda f: f.status == "Done",
+        lambda f: f.tags.contains("work"),
+        lambda f: f.priority.is_empty,
+        lambda f: f.done & f.tags.contains("home"),
+        lambda f: f.done | (f.status == "Blocked"),
+        lambda f: f.priority > 3,
+        lambda f: f.priority <= 2,
+        lambda f: (f.priority >= 2) & f.done,
+        lambda f: f.due < datetime.date(2024, 6, 1),
+        lambda f: f.due == datetime.date(2025, 12, 1),
+        lambda f: f.due.is_empty | (f.due >= datetime.date(2024, 6, 1)),
+        lambda f: f.created < _CREATED,
+        lambda f: f.created == _CREATED,
+    ],
+)
+def test_invert_query(db, make_filter):
+    # `~f` is the complement of `f`, including for the empty values
+    filter = make_filter(db.filter)
+    all_ids = _ids(db)
+    ids = _ids(db[filter])
+    assert ids and ids != all_ids
+    assert _ids(db[~filter]) == all_ids - ids
@@ -0,0 +1,249 @@
+"""Bulk page creation.
+
+```python
+result = db.insert_many([
+    {'name': 'Buy milk', 'done': False},
+    {'name': 'Call mom', 'snooze': 'In 1 Day'},
+])
+result.ids  # Created page ids (`None` for failed rows)
+
+# Resume only the failed rows
+db.insert_many([records[i] for i in result.errors], key='name')
+```
+
+Creations are not retried after a 5xx, a timeout or a lost connection (the
+page may have been created even though no response was received), those rows
+are reported in `result.errors` instead.
+
+To safely resume them, pass a `key` property (unique per record, e.g. an
+external id column): the pages whose key already exists in the database are
+not created again (their id is returned in `result.ids`).
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import datetime
+import functools
+import operator
+import typing
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from auto_notion import codec as codeclib
+from auto_notion.typing import Json
+
+if typing.TYPE_CHECKING:
+    import pandas as pd
+
+    from auto_notion import database
+
+# Maximum number of conditions in a compound filter
+_MAX_FILTERS = 100
+
+# Computed properties, which cannot be set
+_READ_ONLY_TYPES = frozenset(
+    {
+        "created_time",
+        "created_by",
+        "last_edited_time",
+        "last_edited_by",
+        "formula",
+        "rollup",
+        "unique_id",
+    }
+)
+
+
+@dataclasses.dataclass
+class InsertResult:
+    """Per-row outcome of `insert_many`.
+
+    Attributes:
+        ids: Created page id of each record (`None` if it failed)
+        errors: Record index -> error (validation or API), for the rows which
+            were not created
+        existing: Indices of the records whose `key` was already in the
+            database (not created again)
+    """
+
+    ids: list[str | None]
+    errors: dict[int, Exception] = dataclasses.field(default_factory=dict)
+    existing: set[int] = dataclasses.field(default_factory=set)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def raise_for_errors(self) -> None:
+        """Raise an `ExceptionGroup` if some rows failed."""
+        if self.errors:
+            raise ExceptionGroup(
+                f"{len(self.errors)}/{len(self.ids)} rows failed to be inserted.",
+                [_with_note(e, f"Row {i}") for i, e in sorted(self.errors.items())],
+            )
+
+
+def _with_note(e: Exception, note: str) -> Exception:
+    e.add_note(note)
+    return e
+
+
+def _get_fields(
+    codec: codeclib.RowCodec, names: Iterable[str]
+) -> dict[str, codeclib.FieldCodec]:
+    """Validate the column names (once per column, not per row)."""
+    fields = {}
+    for name in names:
+        field = codec.fields.get(name)
+        if field is None:
+            raise KeyError(
+                f"Unknown property {name!r}. Available: {list(codec.fields)}"
+            )
+        if field.type in _READ_ONLY_TYPES:
+            raise ValueError(f"{field.type} ({field.name}) property is read-only.")
+        fields[name] = field
+    return fields
+
+
+def encode_columns(
+    codec: codeclib.RowCodec,
+    columns: Mapping[str, list[Any]],
+    *,
+    num_rows: int,
+) -> tuple[list[Json | None], dict[int, Exception]]:
+    """Encode the columns into the `pages.create` properties of each row.
+
+    Returns:
+        The properties of each row (`None` for the invalid rows) and the
+        encoding errors.
+    """
+    fields = _get_fields(codec, columns)
+    rows = [{} for _ in range(num_rows)]
+    errors = {}
+    for name, values in columns.items():
+        field = fields[name]
+        for i, value in enumerate(values):
+            if value is None or i in errors:  # Missing values are left empty
+                continue
+            try:
+                rows[i][field.id] = field.encode(value)
+            except Exception as e:  # pylint: disable=broad-except
+                errors[i] = _with_note(e, f"Property {field.name!r}: {value!r}")
+    return [None if i in errors else r for i, r in enumerate(rows)], errors
+
+
+def insert_many(
+    db: database.Database,
+    records: Iterable[Mapping[str, Any]],
+    *,
+    key: str | None = None,
+    max_concurrency: int = 8,
+) -> InsertResult:
+    """Create one page per record (keyed by property snake names)."""
+    records = list(records)
+    names = dict.fromkeys(k for record in records for k in record)
+    columns = {k: [record.get(k) for record in records] for k in names}
+    return _create_pages(
+        db, columns, num_rows=len(records), key=key, workers=max_concurrency
+    )
+
+
+def insert_df(
+    db: database.Database,
+    df: pd.DataFrame,
+    *,
+    key: str | None = None,
+    max_concurrency: int = 8,
+) -> InsertResult:
+    """Create one page per `df` row (columns are property snake names).
+
+    Errors are indexed by the row position (not the `df.index`).
+    """
+    columns = {}
+    for k in df.columns:
+        col = df[k].astype(object)
+        col = col.where(col.notna(), None)  # `NaN`, `NA`, `NaT` -> `None`
+        columns[k] = [_from_pandas(v) for v in col.tolist()]
+    return _create_pages(
+        db, columns, num_rows=len(df), key=key, workers=max_concurrency
+    )
+
+
+def _from_pandas(value: Any) -> Any:
+    """Convert pandas/numpy scalars to Python values."""
+    if isinstance(value, datetime.datetime):  # `pd.Timestamp`
+        return getattr(value, "to_pydatetime", lambda: value)()
+    if not isinstance(value, (list, tuple)) and hasattr(value, "item"):
+        return value.item()  # numpy scalars
+    return value
+
+
+def _find_existing(
+    db: database.Database, key: str, values: list[Any]
+) -> dict[Any, str]:
+    """Returns the `key value -> page id` of the pages already in `db`."""
+    prop = getattr(db.filter, key)
+    values = list(dict.fromkeys(v for v in values if v is not None))
+    existing = {}
+    for start in range(0, len(values), _MAX_FILTERS):
+        conditions = [prop == v for v in values[start : start + _MAX_FILTERS]]
+        view = db[functools.reduce(operator.or_, conditions)].select(key)
+        for row in view:
+            existing.setdefault(getattr(row, key), row.INFO.id)
+    return existing
+
+
+def _create_pages(
+    db: database.Database,
+    columns: Mapping[str, list[Any]],
+    *,
+    num_rows: int,
+    key: str | None,
+    workers: int,
+) -> InsertResult:
+    import concurrent.futures
+
+    rows, errors = encode_columns(db.codec, columns, num_rows=num_rows)
+    result = InsertResult(ids=[None] * num_rows, errors=errors)
+    if key is not None:
+        if key not in columns:
+            raise KeyError(f"Key {key!r} is not in the records: {list(columns)}")
+        existing = _find_existing(db, key, columns[key])
+        for i, value in enumerate(columns[key]):
+            if rows[i] is not None and value is not None and value in existing:
+                result.ids[i] = existing[value]
+                result.existing.add(i)
+                rows[i] = None
+
+    import httpx
+    import notion_client
+
+    def create(properties: Json) -> str:
+        try:
+            page = db.api.pages.create(
+                parent={"database_id": db.id},
+                properties=properties,
+            )
+        except (notion_client.errors.RequestTimeoutError, httpx.TransportError) as e:
+            raise _with_note(e, "The page may have been created.")
+        except notion_client.errors.HTTPResponseError as e:
+            if e.status >= 500:
+                raise _with_note(e, "The page may have been created.")
+            raise
+        return page["id"]
+
+    # Requests are throttled by the process-wide rate limiter of the client
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(create, properties): i
+            for i, properties in enumerate(rows)
+            if properties is not None
+        }
+        for future in concurrent.futures.as_completed(futures):
+            i = futures[future]
+            try:
+                result.ids[i] = future.result()
+            except Exception as e:  # pylint: disable=broad-except
+                result.errors[i] = e
+    return result
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import notion_client
+import pytest
+
+import auto_notion
+from auto_notion import client as clientlib
+from auto_notion import rate_limit
+from auto_notion import testing
+
+
+def _records(n: int) -> list[dict]:
+    return [{"name": f"task {i}", "priority": i, "done": i % 2 == 0} for i in range(n)]
+
+
+def test_insert_many(server):
+    db_json = server.add_database(num_rows=10)
+    db = auto_notion.Database(db_json.id)
+    result = db.insert_many(_records(5))
+    assert result.ok
+    assert server.requests["pages.create"] == 5
+    assert db_json.num_rows == 15
+    pages = [db_json.retrieve(id) for id in result.ids]
+    assert [p["properties"]["Priority"]["number"] for p in pages] == list(range(5))
+
+
+def test_insert_validation_errors(server):
+    db_json = server.add_database(num_rows=10)
+    db = auto_notion.Database(db_json.id)
+    records = _records(4)
+    records[2]["status"] = "Unknown"
+    result = db.insert_many(records)
+    assert list(result.errors) == [2]
+    assert result.ids[2] is None and all(result.ids[i] for i in (0, 1, 3))
+    assert server.requests["pages.create"] == 3
+    with pytest.raises(ExceptionGroup):
+        result.raise_for_errors()
+
+    with pytest.raises(KeyError, match="unknown"):
+        db.insert_many([{"unknown": 1}])
+
+
+@pytest.fixture
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(
+        clientlib._Client, "retry", rate_limit.RetryOptions(base_delay=0.001)
+    )
+
+
+def test_insert_rate_limited(fast_retries):
+    server = testing.FakeNotion(error_rate=0.3, seed=1)
+    db_json = server.add_database(num_rows=10)
+    with server.install():
+        result = auto_notion.Database(db_json.id).insert_many(_records(30))
+    assert result.ok
+    # `429` are retried (the page was not created)
+    assert server.requests["429"] > 0
+    assert db_json.num_rows == 10 + 30
+
+
+def test_insert_resume(fast_retries):
+    server = testing.FakeNotion(seed=1)
+    db_json = server.add_database(num_rows=10)
+    records = _records(30)
+    with server.install():
+        db = auto_notion.Database(db_json.id)
+        db.props
+        server.timeout_rate = 0.3
+        result = db.insert_many(records)
+
+        # Timed out creations are not retried
+        assert result.errors
+        assert len(result.errors) == server.requests["timeout"]
+        assert server.requests["pages.create"] == 30
+        for i, e in result.errors.items():
+            assert isinstance(e, notion_client.errors.RequestTimeoutError)
+            assert "The page may have been created." in e.__notes__
+            assert result.ids[i] is None
+        # Timed out pages were created by the server (the response was lost)
+        assert db_json.num_rows == 10 + 30
+
+        server.timeout_rate = 0.0
+        retried = db.insert_many([records[i] for i in result.errors], key="name")
+    assert retried.ok
+    # The timed out pages exist, so none is created again
+    assert retried.existing == set(range(len(result.errors)))
+    assert server.requests["pages.create"] == 30
+    assert db_json.num_rows == 10 + 30
+    for i, id in zip(result.errors, retried.ids):
+        page = db_json.retrieve(id)
+        assert page["properties"]["Name"]["title"][0]["plain_text"] == f"task {i}"
+
+
+def test_insert_key(server):
+    db_json = server.add_database(num_rows=10)
+    db = auto_notion.Database(db_json.id)
+    result = db.insert_many(_records(3), key="name")
+    assert result.ok and not result.existing
+    # Only the new records are created
+    again = db.insert_many(_records(5), key="name")
+    assert again.ok
+    assert again.existing == {0, 1, 2}
+    assert again.ids[:3] == result.ids
+    assert server.requests["pages.create"] == 5
+    names = [row.name for row in db]
+    assert sorted(n for n in names if n.startswith("task")) == [
+        f"task {i}" for i in range(5)
+    ]
+
+    with pytest.raises(KeyError, match="status"):
+        db.insert_many(_records(1), key="status")
+
+
+def test_insert_server_error(fast_retries):
+    server = testing.FakeNotion(seed=1)
+    db_json = server.add_database(num_rows=10)
+    with server.install():
+        db = auto_notion.Database(db_json.id)
+        db.props
+        server.server_error_rate = 0.3
+        result = db.insert_many(_records(30))
+        server.server_error_rate = 0.0
+        # `5xx` creations are not retried (the page may have been created)
+        assert result.errors
+        assert len(result.errors) == server.requests["502"]
+        assert server.requests["pages.create"] == 30
+        for e in result.errors.values():
+            assert e.status == 502
+            assert "The page may have been created." in e.__notes__
+        assert db_json.num_rows == 10 + 30
+
+        retried = db.insert_many([_records(30)[i] for i in result.errors], key="name")
+    assert retried.ok and len(retried.existing) == len(result.errors)
+    assert db_json.num_rows == 10 + 30
@@ -0,0 +1,360 @@
+"""Process-wide metrics of the Notion requests & decoding.
+
+```python
+from auto_notion import metrics
+
+metrics.print_summary_at_exit()  # Or set `AUTO_NOTION_METRICS_SUMMARY=1`
+
+# Forward the measurements (e.g. to OpenTelemetry instruments)
+metrics.get_metrics().add_callback(
+    lambda m: otel_instruments[m.name].record(m.value, m.attributes)
+)
+```
+
+Recorded metrics:
+
+* `notion.requests` (counter): HTTP requests by `endpoint` and `status`
+* `notion.request.duration` (histogram, seconds): latency of each request
+  (including the JSON decoding of the response)
+* `notion.response.bytes` (counter): size of the response bodies
+* `notion.retries` (counter): retried requests, by error `code`
+* `notion.rate_limit.wait` (histogram, seconds): time blocked by the limiter
+* `auto_notion.json.duration` (histogram, seconds): JSON decoding of the
+  responses, by `endpoint`
+* `auto_notion.rows` (counter): rows returned, by `kind` (`iter` for
+  `for row in db:`, `table` for `db.snapshot()`, `columnar` for the dataframes)
+* `auto_notion.decode.duration` (histogram, seconds): property parsing of a
+  batch of rows, by `kind` (`table` / `columnar`)
+* `auto_notion.decoded_values` (counter): values decoded by `row.<name>`, by
+  `kind` (`proxy`). Added once per query page, not timed, to keep the per-cell
+  access fast
+* `auto_notion.iter.duration` (histogram, seconds): time spent inside
+  `for row in db:` (the user code of the loop body is excluded), by `stage`
+  (`fetch`: waiting for the query pages, i.e. network & JSON decoding, or the
+  prefetch thread; `rows`: `auto_notion` own per-row code)
+* `auto_notion.writes` (counter): property assignments, by `type`
+* `auto_notion.writes.skipped` (counter): assignments skipped because the
+  property already had the value
+* `auto_notion.page_cache` (counter): related pages served from the page
+  cache, by `result` (`hit` / `miss`)
+* `auto_notion.block_cache` (counter): page contents served from the block
+  cache, by `result`
+"""
+
+from __future__ import annotations
+
+import atexit
+import bisect
+import collections
+import contextlib
+import dataclasses
+import functools
+import math
+import os
+import re
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from typing import Any, Literal
+
+# Histogram bucket upper bounds (1ms to ~65s)
+_BUCKETS = tuple(0.001 * 2**i for i in range(17))
+
+_ID_PATTERN = re.compile(r"[0-9a-fA-F]{8}-?(?:[0-9a-fA-F]{4}-?){3}[0-9a-fA-F]{12}")
+
+_Key = tuple[str, tuple[tuple[str, Any], ...]]
+
+
+@dataclasses.dataclass(frozen=True)
+class Measurement:
+    """Single measurement, forwarded to the callbacks."""
+
+    name: str
+    kind: Literal["counter", "histogram"]
+    value: float
+    attributes: dict[str, Any]
+
+
+@dataclasses.dataclass
+class _Histogram:
+    counts: list[int] = dataclasses.field(
+        default_factory=lambda: [0] * (len(_BUCKETS) + 1)
+    )
+    count: int = 0
+    sum: float = 0.0
+    max: float = 0.0
+
+    def record(self, value: float) -> None:
+        self.counts[bisect.bisect_left(_BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket containing the `q` quantile."""
+        target = q * self.count
+        total = 0
+        for bound, count in zip(_BUCKETS, self.counts):
+            total += count
+            if total >= target:
+                return min(bound, self.max)
+        return self.max
+
+
+class Metrics:
+    """Thread-safe counters & histograms, keyed by name and attributes."""
+
+    def __init__(self):
+        self._counters: dict[_Key, float] = collections.defaultdict(float)
+        self._histograms: dict[_Key, _Histogram] = collections.defaultdict(_Histogram)
+        self._callbacks: list[Callable[[Measurement], None]] = []
+        self._lock = threading.Lock()
+
+    def add(self, name: str, value: float = 1, **attributes: Any) -> None:
+        """Increment the counter."""
+        with self._lock:
+            self._counters[_key(name, attributes)] += value
+        self._notify(name, "counter", value, attributes)
+
+    def record(self, name: str, value: float, **attributes: Any) -> None:
+        """Record the value in the histogram."""
+        with self._lock:
+            self._histograms[_key(name, attributes)].record(value)
+        self._notify(name, "histogram", value, attributes)
+
+    @contextlib.contextmanager
+    def timer(self, name: str, **attributes: Any) -> Iterator[None]:
+        """Record the duration of the block in the histogram."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, **attributes)
+
+    @contextlib.contextmanager
+    def track_request(self, endpoint: str) -> Iterator[None]:
+        """Count & time a single HTTP request."""
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            yield
+        except Exception as e:
+            status = getattr(e, "code", None) or type(e).__name__
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            self.add("notion.requests", endpoint=endpoint, status=status)
+            self.record("notion.request.duration", duration, endpoint=endpoint)
+
+    def add_callback(self, callback: Callable[[Measurement], None]) -> None:
+        """Call `callback(measurement)` on each new measurement."""
+        self._callbacks.append(callback)
+
+    def remove_callback(self, callback: Callable[[Measurement], None]) -> None:
+        self._callbacks.remove(callback)
+
+    def _notify(
+        self,
+        name: str,
+        kind: Literal["counter", "histogram"],
+        value: float,
+        attributes: dict[str, Any],
+    ) -> None:
+        for callback in self._callbacks:
+            callback(Measurement(name, kind, value, attributes))
+
+    def counter(self, name: str, **attributes: Any) -> float:
+        """Sum of the counter over all attributes matching `attributes`."""
+        with self._lock:
+            return sum(
+                value
+                for key, value in self._counters.items()
+                if _matches(key, name, attributes)
+            )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def summary(self) -> str:
+        """Human readable tables of the metrics."""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = dict(self._histograms)
+
+        lines = ["auto_notion metrics:"]
+        # Requests by endpoint
+        endpoints = collections.defaultdict(collections.Counter)
+        for (name, attrs), value in counters.items():
+            attrs = dict(attrs)
+            if name == "notion.requests":
+                endpoints[attrs["endpoint"]]["requests"] += value
+                if attrs["status"] != "ok":
+                    endpoints[attrs["endpoint"]]["errors"] += value
+            elif name == "notion.response.bytes":
+                endpoints[attrs["endpoint"]]["bytes"] += value
+        if endpoints:
+            lines.append(
+                f"  {'endpoint':<36}{'requests':>9}{'errors':>8}{'p50':>10}"
+                f"{'p95':>10}{'total':>10}{'bytes':>10}"
+            )
+            for endpoint, stats in sorted(endpoints.items()):
+                hist = histograms.get(
+                    _key("notion.request.duration", {"endpoint": endpoint}),
+                    _Histogram(),
+                )
+                lines.append(
+                    f"  {endpoint:<36}{stats['requests']:>9.0f}"
+                    f"{stats['errors']:>8.0f}{_ms(hist.quantile(0.5)):>10}"
+                    f"{_ms(hist.quantile(0.95)):>10}{hist.sum:>9.2f}s"
+                    f"{_bytes(stats['bytes']):>10}"
+                )
+
+        # Retries & waits
+        retries = collections.Counter()
+        for (name, attrs), value in counters.items():
+            if name == "notion.retries":
+                retries[dict(attrs)["code"]] += value
+        wait = histograms.get(_key("notion.rate_limit.wait", {}), _Histogram())
+        if retries or wait.count:
+            details = ", ".join(f"{k}: {v:.0f}" for k, v in retries.most_common())
+            lines.append(
+                f"  retries: {sum(retries.values()):.0f}"
+                + (f" ({details})" if details else "")
+                + f", rate limit wait: {wait.sum:.2f}s"
+            )
+
+        # Time breakdown: JSON decoding, iteration, property parsing
+        json_hist = _merged(histograms, "auto_notion.json.duration")
+        if json_hist.count:
+            lines.append(
+                f"  json decoding: {json_hist.sum:.3f}s "
+                f"({json_hist.count} responses)"
+            )
+        rows = collections.Counter()
+        for (name, attrs), value in counters.items():
+            if name == "auto_notion.rows":
+                rows[dict(attrs)["kind"]] += value
+        if rows["iter"]:
+            fetch = histograms.get(
+                _key("auto_notion.iter.duration", {"stage": "fetch"}), _Histogram()
+            )
+            own = histograms.get(
+                _key("auto_notion.iter.duration", {"stage": "rows"}), _Histogram()
+            )
+            lines.append(
+                f"  iteration: {rows['iter']:.0f} rows, {fetch.sum:.3f}s waiting "
+                f"for the pages, {own.sum:.3f}s building the rows"
+            )
+        kinds = sorted(
+            dict(attrs)["kind"]
+            for name, attrs in histograms
+            if name == "auto_notion.decode.duration"
+        )
+        if kinds:
+            lines.append(
+                f"  {'property parsing':<36}{'items':>9}{'seconds':>10}{'items/s':>12}"
+            )
+            for kind in kinds:
+                hist = histograms[_key("auto_notion.decode.duration", {"kind": kind})]
+                count = rows[kind] or hist.count
+                rate = count / hist.sum if hist.sum else math.inf
+                lines.append(
+                    f"  {kind:<36}{count:>9.0f}{hist.sum:>10.3f}{rate:>12,.0f}"
+                )
+
+        decoded = collections.Counter()
+        for (name, attrs), value in counters.items():
+            if name == "auto_notion.decoded_values":
+                decoded[dict(attrs)["kind"]] += value
+        for kind, count in sorted(decoded.items()):
+            lines.append(f"  {kind}: {count:.0f} values decoded")
+
+        writes = collections.Counter()
+        for (name, _), value in counters.items():
+            writes[name] += value
+        if writes["auto_notion.writes"]:
+            lines.append(
+                f"  property writes: {writes['auto_notion.writes']:.0f} "
+                f"({writes['auto_notion.writes.skipped']:.0f} skipped as no-op)"
+            )
+        for cache in ("page", "block"):
+            name = f"auto_notion.{cache}_cache"
+            if writes[name]:
+                hits = sum(
+                    value
+                    for (key_name, attrs), value in counters.items()
+                    if key_name == name and dict(attrs)["result"] == "hit"
+                )
+                lines.append(
+                    f"  {cache} cache: {hits:.0f} hits / {writes[name]:.0f} lookups"
+                )
+        if len(lines) == 1:
+            lines.append("  (no requests)")
+        return "\n".join(lines)
+
+
+def _key(name: str, attributes: dict[str, Any]) -> _Key:
+    return (name, tuple(sorted(attributes.items())))
+
+
+def _merged(histograms: dict[_Key, _Histogram], name: str) -> _Histogram:
+    """Histogram `name`, summed over all the attributes (buckets not merged)."""
+    merged = _Histogram()
+    for (key_name, _), hist in histograms.items():
+        if key_name == name:
+            merged.count += hist.count
+            merged.sum += hist.sum
+            merged.max = max(merged.max, hist.max)
+    return merged
+
+
+def _matches(key: _Key, name: str, attributes: dict[str, Any]) -> bool:
+    key_name, key_attrs = key
+    key_attrs = dict(key_attrs)
+    return key_name == name and all(
+        key_attrs.get(k) == v for k, v in attributes.items()
+    )
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.1f}ms"
+
+
+def _bytes(num_bytes: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if num_bytes < 1024:
+            return f"{num_bytes:.0f}{unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f}GB"
+
+
+def endpoint_name(method: str, path: str) -> str:
+    """Normalized endpoint (e.g. `POST databases/{id}/query`)."""
+    path = path.removeprefix("/").removeprefix("v1/")
+    return f"{method} {_ID_PATTERN.sub('{id}', path)}"
+
+
+@functools.cache
+def get_metrics() -> Metrics:
+    metrics = Metrics()
+    if os.environ.get("AUTO_NOTION_METRICS_SUMMARY"):
+        _register_summary(metrics)
+    return metrics
+
+
+def print_summary_at_exit() -> None:
+    """Print the metrics summary (to stderr) when the process exits."""
+    _register_summary(get_metrics())
+
+
+_registered = set()
+
+
+def _register_summary(metrics: Metrics) -> None:
+    if id(metrics) in _registered:
+        return
+    _registered.add(id(metrics))
+    atexit.register(lambda: print(metrics.summary(), file=sys.stderr))
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import auto_notion
+from auto_notion import blocks as blockslib
+from auto_notion import metrics as metricslib
+
+
+def _count(name: str, **attributes) -> float:
+    return metricslib.get_metrics().counter(name, **attributes)
+
+
+def test_iter_metrics(server):
+    db_json = server.add_database(num_rows=250)
+    db = auto_notion.Database(db_json.id)
+    db.props  # Schema & filters are not counted as decoded rows
+    db.filter
+    assert _count("auto_notion.rows") == 0
+
+    measurements = []
+    metricslib.get_metrics().add_callback(measurements.append)
+    priorities = [row.priority for row in db]
+    metricslib.get_metrics().remove_callback(measurements.append)
+    assert len(priorities) == 250
+    assert _count("auto_notion.rows", kind="iter") == 250
+    # Counted per page, without a measurement per value
+    assert _count("auto_notion.decoded_values", kind="proxy") == 250
+    names = [m.name for m in measurements if m.name.startswith("auto_notion.dec")]
+    assert names == ["auto_notion.decoded_values"] * 3  # 3 pages of 100 rows
+
+    summary = metricslib.get_metrics().summary()
+    assert "POST databases/{id}/query" in summary
+    assert "json decoding:" in summary
+    assert "iteration: 250 rows" in summary
+    assert "proxy" in summary
+    assert "250" in summary.split("proxy")[1].split("\n")[0]
+
+
+def test_snapshot_metrics(server):
+    db_json = server.add_database(num_rows=120)
+    db = auto_notion.Database(db_json.id)
+    table = db.snapshot()
+    assert len(table) == 120
+    assert _count("auto_notion.rows", kind="table") == 120
+    assert "table" in metricslib.get_metrics().summary()
+
+
+def test_cache_metrics(server):
+    db_json = server.add_database(num_rows=3)
+    pages = [row.INFO for row in auto_notion.Database(db_json.id)]
+    blockslib.load_contents(pages)
+    blockslib.load_contents(pages)
+    assert _count("auto_notion.block_cache", result="hit") == 3
+    assert _count("auto_notion.block_cache", result="miss") == 3
+    assert "block cache: 3 hits / 6 lookups" in metricslib.get_metrics().summary()
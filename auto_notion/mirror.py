@@ -0,0 +1,345 @@
+"""Local replica of a database, queried without network calls.
+
+```python
+mirror = db.mirror()  # Initial full scan
+
+mirror.sync()  # Fetch the rows edited since the last sync
+rows = mirror[~db.filter.done & (db.filter.priority > 3)]
+```
+
+Filters are the same `Filter` objects as for `db[...]`. They are evaluated
+on their `to_json()` form (so negations are already resolved), using:
+
+* Hash indexes for checkbox, select, status, multi-select, people, relation
+* Sorted indexes for number, date, created/last edited time
+
+Other conditions (text,...) fall back to a scan of the rows.
+
+Note: Archived pages are not returned by the Notion queries, so they stay in
+the mirror until the next `mirror.resync()`.
+"""
+
+from __future__ import annotations
+
+import bisect
+import collections
+import datetime
+import math
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from auto_notion import database
+from auto_notion import filters as filterslib
+from auto_notion.typing import Json
+
+_HASH_TYPES = frozenset(
+    {"checkbox", "select", "status", "multi_select", "people", "relation"}
+)
+_SORTED_TYPES = frozenset({"number", "date", "created_time", "last_edited_time"})
+_MULTI_TYPES = frozenset({"multi_select", "people", "relation"})
+
+# Relative date conditions -> (days before now, days after now)
+_RELATIVE_DATES = {
+    "past_week": (7, 0),
+    "past_month": (30, 0),
+    "past_year": (365, 0),
+    "next_week": (0, 7),
+    "next_month": (0, 30),
+    "next_year": (0, 365),
+}
+
+
+def _to_key(value: Any) -> Any:
+    """Normalize decoded values into hashable/comparable index keys."""
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is None:  # Dates (without time) are considered UTC
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        return value.timestamp()
+    return getattr(value, "id", value)  # `User`, relation `PageRef`
+
+
+def _to_keys(value: Any) -> list[Any]:
+    """Keys of a multi-valued property."""
+    if value is None:
+        return []
+    return [_to_key(v) for v in value]
+
+
+class _HashIndex:
+
+    def __init__(self):
+        self._ids = collections.defaultdict(set)
+
+    def add(self, id: str, keys: Iterable[Any]) -> None:
+        for key in keys:
+            self._ids[key].add(id)
+
+    def remove(self, id: str, keys: Iterable[Any]) -> None:
+        for key in keys:
+            self._ids[key].discard(id)
+
+    def get(self, key: Any) -> set[str]:
+        return self._ids.get(key, set())
+
+
+class _SortedIndex:
+
+    def __init__(self):
+        self._keys = []  # Sorted `(key, id)`
+        # `(key, id)` added since the last query, sorted in a single pass
+        self._pending = set()
+
+    def add(self, id: str, key: Any) -> None:
+        if key is not None:
+            self._pending.add((key, id))
+
+    def remove(self, id: str, key: Any) -> None:
+        if key is None:
+            return
+        if (key, id) in self._pending:
+            self._pending.remove((key, id))
+        else:
+            i = bisect.bisect_left(self._keys, (key, id))
+            del self._keys[i]
+
+    def _flush(self) -> None:
+        if self._pending:
+            self._keys.extend(self._pending)
+            self._keys.sort()
+            self._pending.clear()
+
+    def range(
+        self,
+        start: float = -math.inf,
+        stop: float = math.inf,
+        *,
+        include_start: bool = True,
+        include_stop: bool = False,
+    ) -> set[str]:
+        """Ids with `start <= key < stop` (bounds inclusion configurable)."""
+        self._flush()
+        bisect_start = bisect.bisect_left if include_start else bisect.bisect_right
+        bisect_stop = bisect.bisect_right if include_stop else bisect.bisect_left
+        lo = bisect_start(self._keys, start, key=lambda k: k[0])
+        hi = bisect_stop(self._keys, stop, key=lambda k: k[0])
+        return {id for _, id in self._keys[lo:hi]}
+
+
+class LocalMirror:
+    """In-memory replica of the database rows, kept current with `sync()`."""
+
+    def __init__(self, db: database.Database):
+        self._db = db
+        self._rows: dict[str, Json] = {}
+        # Decoded values, used for evaluation: id -> snake_name -> value
+        self._values: dict[str, dict[str, Any]] = {}
+        self._hash_indexes = {}
+        self._sorted_indexes = {}
+        for k, field in db.codec.fields.items():
+            if field.type in _HASH_TYPES:
+                self._hash_indexes[k] = _HashIndex()
+            elif field.type in _SORTED_TYPES:
+                self._sorted_indexes[k] = _SortedIndex()
+        # Page timestamps (for `filters.last_edited_time`,...)
+        for timestamp in ("created_time", "last_edited_time"):
+            self._sorted_indexes[_timestamp_key(timestamp)] = _SortedIndex()
+        self._id_to_field = {f.id: k for k, f in db.codec.fields.items()}
+        self._last_edited: datetime.datetime | None = None
+
+    # Sync
+
+    def sync(self) -> int:
+        """Fetch the rows edited since the last sync. Returns the number of rows."""
+        view = self._db.changed_since(self._last_edited)
+        num_rows = 0
+        for results in view._iter_raw_pages():
+            for page in results["results"]:
+                self.upsert(page)
+                num_rows += 1
+        return num_rows
+
+    def resync(self) -> int:
+        """Re-fetch all the rows (e.g. to drop archived pages)."""
+        for id in list(self._rows):
+            self._remove(id)
+        self._last_edited = None
+        return self.sync()
+
+    def upsert(self, page: Json) -> None:
+        """Insert or update the raw page (as returned by the query)."""
+        id = page["id"]
+        if id in self._rows:
+            self._remove(id)
+        props = page["properties"]
+        values = {
+            k: field.decode(props[field.name])
+            for k, field in self._db.codec.fields.items()
+            if field.name in props
+        }
+        values[_timestamp_key("created_time")] = _parse_time(page["created_time"])
+        values[_timestamp_key("last_edited_time")] = last_edited = _parse_time(
+            page["last_edited_time"]
+        )
+        self._rows[id] = page
+        self._values[id] = values
+        self._update_indexes(id, values, add=True)
+
+        if self._last_edited is None or last_edited > self._last_edited:
+            self._last_edited = last_edited
+
+    def _remove(self, id: str) -> None:
+        self._update_indexes(id, self._values[id], add=False)
+        del self._rows[id]
+        del self._values[id]
+
+    def _update_indexes(self, id: str, values: dict[str, Any], *, add: bool) -> None:
+        for k, index in self._hash_indexes.items():
+            if k not in values:
+                continue
+            keys = self._hash_keys(k, values[k])
+            index.add(id, keys) if add else index.remove(id, keys)
+        for k, index in self._sorted_indexes.items():
+            if k not in values:
+                continue
+            key = None if values[k] is None else _to_key(values[k])
+            index.add(id, key) if add else index.remove(id, key)
+
+    def _hash_keys(self, k: str, value: Any) -> list[Any]:
+        if self._db.codec.fields[k].type in _MULTI_TYPES:
+            return _to_keys(value) or [None]
+        return [value]
+
+    # Query
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self) -> Iterator[database.PropertyProxy]:
+        for json in self._rows.values():
+            yield database.PropertyProxy(json, codec=self._db.codec)
+
+    def __getitem__(self, filter: filterslib.Filter) -> list[database.PropertyProxy]:
+        """Returns the (unordered) rows matching the filter."""
+        return [
+            database.PropertyProxy(self._rows[id], codec=self._db.codec)
+            for id in self.ids(filter)
+        ]
+
+    def ids(self, filter: filterslib.Filter) -> set[str]:
+        """Returns the ids of the pages matching the filter."""
+        if not isinstance(filter, filterslib.Filter):
+            raise TypeError(f"Invalid filter: {filter!r}")
+        return self._eval(filter.to_json())
+
+    def _eval(self, json: Json) -> set[str]:
+        if "and" in json:
+            ids = None
+            for sub_json in json["and"]:
+                sub_ids = self._eval(sub_json)
+                ids = sub_ids if ids is None else ids & sub_ids
+                if not ids:
+                    break
+            return set() if ids is None else ids
+        if "or" in json:
+            ids = set()
+            for sub_json in json["or"]:
+                ids |= self._eval(sub_json)
+            return ids
+        if "timestamp" in json:
+            k = _timestamp_key(json["timestamp"])
+            type_ = json["timestamp"]
+        else:
+            k = self._id_to_field[json["property"]]
+            type_ = self._db.codec.fields[k].type
+        ((condition, value),) = json[type_].items()
+        return self._eval_condition(k, type_, condition, value)
+
+    def _eval_condition(
+        self, k: str, type_: str, condition: str, value: Any
+    ) -> set[str]:
+        if condition.startswith("does_not_") or condition == "is_not_empty":
+            positive = {
+                "does_not_equal": "equals",
+                "does_not_contain": "contains",
+                "is_not_empty": "is_empty",
+            }[condition]
+            return set(self._rows) - self._eval_condition(k, type_, positive, value)
+
+        if k in self._hash_indexes and condition in ("equals", "contains"):
+            return set(self._hash_indexes[k].get(value))
+        if k in self._hash_indexes and condition == "is_empty":
+            return set(self._hash_indexes[k].get(None))
+        if k in self._sorted_indexes:
+            return self._eval_range(k, condition, value)
+        return self._scan(k, condition, value)
+
+    def _eval_range(self, k: str, condition: str, value: Any) -> set[str]:
+        index = self._sorted_indexes[k]
+        if condition == "is_empty":
+            return {id for id, values in self._values.items() if values[k] is None}
+        if condition in _RELATIVE_DATES:
+            before, after = _RELATIVE_DATES[condition]
+            now = datetime.datetime.now(datetime.timezone.utc).timestamp()
+            day = datetime.timedelta(days=1).total_seconds()
+            return index.range(now - before * day, now + after * day, include_stop=True)
+
+        if isinstance(value, str):  # Date filter
+            start, stop = _parse_date_range(value)
+        else:  # Number
+            start, stop = value, value
+        exact = start == stop
+        if condition == "equals":
+            return index.range(start, stop, include_stop=exact)
+        elif condition in ("greater_than", "after"):
+            return index.range(stop, include_start=not exact)
+        elif condition in ("greater_than_or_equal_to", "on_or_after"):
+            return index.range(start)
+        elif condition in ("less_than", "before"):
+            return index.range(stop=start)
+        elif condition in ("less_than_or_equal_to", "on_or_before"):
+            return index.range(stop=stop, include_stop=exact)
+        raise ValueError(f"Unsupported local filter condition: {condition!r}")
+
+    def _scan(self, k: str, condition: str, value: Any) -> set[str]:
+        match_fn = _SCAN_CONDITIONS.get(condition)
+        if match_fn is None:
+            raise ValueError(f"Unsupported local filter condition: {condition!r}")
+        return {
+            id for id, values in self._values.items() if match_fn(values.get(k), value)
+        }
+
+
+def _timestamp_key(timestamp: str) -> str:
+    # Prefixed to never collide with the property snake names
+    return f"__{timestamp}"
+
+
+def _parse_time(value: str) -> datetime.datetime:
+    return datetime.datetime.fromisoformat(value)
+
+
+def _parse_date_range(value: str) -> tuple[float, float]:
+    """Date filter value -> `[start, stop)` timestamps.
+
+    A date (without time) matches the full day, a datetime matches exactly.
+    """
+    start = datetime.datetime.fromisoformat(value)
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=datetime.timezone.utc)
+    if "T" in value:
+        return start.timestamp(), start.timestamp()
+    stop = start + datetime.timedelta(days=1)
+    return start.timestamp(), stop.timestamp()
+
+
+def _text(value: Any) -> str:
+    return "" if value is None else str(value).casefold()
+
+
+_SCAN_CONDITIONS = {
+    "equals": lambda v, target: v == target,
+    "contains": lambda v, target: _text(target) in _text(v),
+    "starts_with": lambda v, target: _text(v).startswith(_text(target)),
+    "ends_with": lambda v, target: _text(v).endswith(_text(target)),
+    "is_empty": lambda v, target: v is None or v == "" or v == [],
+}
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import datetime
+
+import pytest
+
+import auto_notion
+from auto_notion import filters as filterslib
+
+
+def _ids(view) -> set[str]:
+    return {row.INFO.id for row in view}
+
+
+@pytest.mark.parametrize(
+    "make_filter",
+    [
+        lambda f: f.done,
+        lambda f: ~f.done,
+        lambda f: f.status == "Done",
+        lambda f: f.status != "Done",
+        lambda f: f.status.is_empty,
+        lambda f: f.tags.contains("work"),
+        lambda f: f.tags.is_empty,
+        lambda f: f.priority == 3,
+        lambda f: f.priority > 3,
+        lambda f: ~(f.priority > 3),
+        lambda f: f.priority <= 2,
+        lambda f: f.priority.is_empty,
+        lambda f: f.due == datetime.date(2024, 6, 1),
+        lambda f: f.due >= datetime.date(2025, 1, 1),
+        lambda f: f.due < datetime.date(2024, 3, 1),
+        lambda f: f.name.contains("call"),
+        lambda f: filterslib.last_edited_time > datetime.date(2024, 2, 1),
+        lambda f: ~f.done & ((f.priority > 3) | f.tags.contains("home")),
+        lambda f: ~(f.done | (f.status == "Blocked")),
+    ],
+)
+def test_query(server, make_filter):
+    db_json = server.add_database(num_rows=300)
+    db = auto_notion.Database(db_json.id)
+    mirror = db.mirror()
+    assert len(mirror) == 300
+
+    filter = make_filter(db.filter)
+    num_requests = server.requests.total()
+    ids = mirror.ids(filter)
+    assert server.requests.total() == num_requests  # No network call
+    assert ids == _ids(db[filter])
+    assert _ids(mirror[filter]) == ids
+
+
+def test_sync(server):
+    db_json = server.add_database(num_rows=100)
+    db = auto_notion.Database(db_json.id)
+    mirror = db.mirror()
+    before = mirror.ids(db.filter.priority > 4)
+
+    row = next(row for row in db if row.priority != 10)
+    row.priority = 10
+    assert mirror.sync() >= 1
+    assert len(mirror) == 100
+    assert mirror.ids(db.filter.priority > 4) == before | {row.INFO.id}
+    assert mirror.ids(db.filter.priority == 10) == {row.INFO.id}
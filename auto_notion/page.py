@@ -2,17 +2,22 @@
 
 from __future__ import annotations
 
+import contextlib
 import dataclasses
 import datetime
 import functools
-from typing import Self
-
-import notion_client
+import typing
+from collections.abc import Iterator
+from typing import Any, Self
 
+from auto_notion import blocks as blockslib
 from auto_notion import database
 from auto_notion import property as propertylib
 from auto_notion.typing import Json
 
+if typing.TYPE_CHECKING:
+    import notion_client
+
 
 @dataclasses.dataclass
 class User:
@@ -46,6 +51,10 @@ class DatabasePage:  # TODO(epot): 2 class for DB page and non-db page
     created: EditInfo
     last_edited: EditInfo
     json: Json
+    # Property id -> (value, query), when writes are batched
+    _pending: dict[str, tuple[Any, Json]] | None = dataclasses.field(
+        default=None, repr=False
+    )
 
     @classmethod
     def from_json(cls, json: Json, *, db: database.Database) -> Self:
@@ -69,3 +78,52 @@ class DatabasePage:  # TODO(epot): 2 class for DB page and non-db page
     @property
     def api(self) -> notion_client.Client:
         return self.db.api
+
+    def content(self, *, max_concurrency: int = 8) -> list[blockslib.Block]:
+        """Page body, as nested blocks (cached, see `blocks.py`)."""
+        return blockslib.load_contents([self], max_concurrency=max_concurrency)[self.id]
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator[None]:
+        """Group all property assignments into a single `pages.update`.
+
+        ```python
+        with row.batch():
+            row.reminder = reminder
+            row.snooze = None
+        ```
+
+        Nothing is sent if the block raises an error.
+        """
+        if self._pending is not None:  # Nested batch
+            yield
+            return
+
+        self._pending = {}
+        try:
+            yield
+            pending = self._pending
+        finally:
+            self._pending = None
+        if pending:
+            self.update({id: query for id, (_, query) in pending.items()})
+
+    def update(self, properties: Json) -> None:
+        """Send the `pages.update` and merge back the new values."""
+        try:
+            new_page = self.api.pages.update(
+                self.id,
+                properties=properties,
+            )
+        except Exception as e:
+            e.add_note(f"query: {properties}")
+            raise
+        self._merge(new_page)
+
+    def _merge(self, new_page: Json) -> None:
+        # Update in-place, as the `Property` share the same `json` dicts.
+        for name, prop in self.json["properties"].items():
+            if name in new_page["properties"]:
+                prop.update(new_page["properties"][name])
+        self.json["last_edited_time"] = new_page["last_edited_time"]
+        self.last_edited = EditInfo.from_json(new_page, prefix="last_edited")
@@ -6,17 +6,21 @@ import dataclasses
 import datetime
 import enum
 import functools
+import typing
 from collections.abc import Callable
 from typing import Any, ClassVar, Generic, Self, TypeVar
 
-from etils import epy
-
+from auto_notion import metrics as metricslib
 from auto_notion import page as pagelib
 from auto_notion import property_base, property_info
+from auto_notion import relation as relationlib
 from auto_notion import text as textlib
 from auto_notion import utils
 from auto_notion.typing import Json
 
+if typing.TYPE_CHECKING:
+    from etils import epy
+
 _T = TypeVar("_T")
 
 
@@ -29,6 +33,8 @@ class Property(property_base.PropertyBase, Generic[_T]):
 
     @property
     def value(self) -> _T:
+        if self.page._pending is not None and self.id in self.page._pending:
+            return self.page._pending[self.id][0]
         val = self.json[self.TYPE]
         if val is None:
             return val
@@ -37,20 +43,36 @@ class Property(property_base.PropertyBase, Generic[_T]):
 
     @value.setter
     def value(self, new_val: _T) -> None:
+        query = self.to_query(new_val)
+        metrics = metricslib.get_metrics()
+        metrics.add("auto_notion.writes", type=self.type)
+        pending = self.page._pending
+        if (pending is None or self.id not in pending) and self.is_noop(
+            self.json, query
+        ):
+            metrics.add("auto_notion.writes.skipped", type=self.type)
+        elif pending is not None:  # Inside `with page.batch():`
+            pending[self.id] = (new_val, query)
+        else:
+            self.page.update({self.id: query})
+
+    def to_query(self, new_val: _T) -> Json:
+        """Returns the `pages.update` payload for the value."""
         if new_val is not None:  # Otherwise clear the field
             new_val = self.serialize(new_val)
-
         # TODO(epot): Validate the value (type, range,...)
-        query = {self.id: {self.type: new_val}}
-        try:
-            new_page = self.api.pages.update(
-                self.page.id,
-                properties=query,
-            )
-        except Exception as e:
-            e.add_note(f"query: {query}")
-            raise
-        self.json[self.TYPE] = new_page["properties"][self.name][self.TYPE]
+        return {self.type: new_val}
+
+    def is_noop(self, json: Json, query: Json) -> bool:
+        """Returns whether writing `query` would leave the property `json` as-is."""
+        old, new = json[self.type], query[self.type]
+        if _is_empty(old) or _is_empty(new):
+            return _is_empty(old) and _is_empty(new)
+        return self._same_value(old, new)
+
+    def _same_value(self, old: Json, new: Json) -> bool:
+        """Compare the current (non-empty) json value with the serialized one."""
+        return old == new
 
     @functools.cached_property
     def info(self) -> property_info.PropertyInfo:
@@ -79,6 +101,13 @@ class _Text(Property[str]):
     def serialize(self, value) -> Json:
         return textlib.str_to_json(value)
 
+    def is_noop(self, json: Json, query: Json) -> bool:
+        old, new = json[self.type] or [], query[self.type] or []
+        # Re-writing the text would drop the formatting, links, mentions,...
+        return all(textlib.is_plain(v) for v in old) and textlib.json_to_str(
+            old
+        ) == "".join(v["text"]["content"] for v in new)
+
 
 class Title(_Text):
     TYPE = "title"
@@ -120,6 +149,13 @@ class Select(Property["epy.StrEnum | None"]):
             raise ValueError(f"Unexpected {self.name!r} value: {value!r}.")
         return {"name": value}
 
+    def _same_value(self, old: Json, new: Json) -> bool:
+        return old["name"] == new["name"]
+
+
+class Status(Select):
+    TYPE = "status"
+
 
 class MultiSelect(Property["list[epy.StrEnum]"]):
     TYPE = "multi_select"
@@ -135,6 +171,10 @@ class MultiSelect(Property["list[epy.StrEnum]"]):
             raise ValueError(f"Unexpected {self.name!r} value: {value!r}.")
         return [{"name": v} for v in value]
 
+    def _same_value(self, old: Json, new: Json) -> bool:
+        # Options order is not significant
+        return sorted(v["name"] for v in old) == sorted(v["name"] for v in new)
+
 
 class Date(Property["datetime.datetime | None"]):
     TYPE = "date"
@@ -149,13 +189,18 @@ class Date(Property["datetime.datetime | None"]):
             "end": None,
         }
 
+    def _same_value(self, old: Json, new: Json) -> bool:
+        return all(
+            _same_time(old.get(k), new.get(k)) for k in ("start", "end")
+        ) and old.get("time_zone") == new.get("time_zone")
+
 
 class _Time(Property[datetime.datetime]):
 
     def parse(self, value: Json):
         return datetime.datetime.fromisoformat(value)
 
-    def serialize(self) -> Json:
+    def serialize(self, value) -> Json:
         raise ValueError(f"{self.TYPE} ({self.name}) property is read-only.")
 
 
@@ -163,14 +208,111 @@ class CreatedTime(_Time):
     TYPE = "created_time"
 
 
-class LastEditedBy(_Time):
+class LastEditedTime(_Time):
     TYPE = "last_edited_time"
 
 
+class People(Property["list[pagelib.User]"]):
+    TYPE = "people"
+
+    def parse(self, value: Json) -> list[pagelib.User]:
+        return [pagelib.User.from_json(v) for v in value]
+
+    def serialize(self, value) -> Json:
+        if not isinstance(value, (list, tuple)):
+            raise TypeError(f"Unexpected {self.name!r} value (not a list): {value!r}")
+        # Accept both `User` and raw ids
+        return [{"object": "user", "id": getattr(v, "id", v)} for v in value]
+
+    def _same_value(self, old: Json, new: Json) -> bool:
+        return sorted(v["id"] for v in old) == sorted(v["id"] for v in new)
+
+
+class _User(Property[pagelib.User]):
+
+    def parse(self, value: Json) -> pagelib.User:
+        return pagelib.User.from_json(value)
+
+    def serialize(self, value) -> Json:
+        raise ValueError(f"{self.TYPE} ({self.name}) property is read-only.")
+
+
+class CreatedBy(_User):
+    TYPE = "created_by"
+
+
+class LastEditedBy(_User):
+    TYPE = "last_edited_by"
+
+
+class Relation(Property["list[relationlib.PageRef]"]):
+    TYPE = "relation"
+
+    def parse(self, value: Json) -> list[relationlib.PageRef]:
+        return [relationlib.PageRef(id=v["id"]) for v in value]
+
+    def serialize(self, value) -> Json:
+        if not isinstance(value, (list, tuple)):
+            raise TypeError(f"Unexpected {self.name!r} value (not a list): {value!r}")
+        # Accept `PageRef`, `DatabasePage` and raw ids
+        return [{"id": getattr(v, "id", v)} for v in value]
+
+    def _same_value(self, old: Json, new: Json) -> bool:
+        return sorted(v["id"] for v in old) == sorted(v["id"] for v in new)
+
+
+class Rollup(Property[Any]):
+    """Aggregate computed by Notion (number, date or list of values).
+
+    Date ranges (e.g. the `date_range` function) are returned as `(start, end)`.
+    """
+
+    TYPE = "rollup"
+
+    def parse(self, value: Json) -> Any:
+        type_ = value["type"]
+        if type_ == "array":
+            return [self._parse_item(v) for v in value["array"]]
+        return self._parse_item(value)
+
+    def _parse_item(self, item: Json) -> Any:
+        type_ = item["type"]
+        if item[type_] is None or type_ not in self._TYPE_TO_CLS:
+            return item[type_]
+        if type_ == "date" and item["date"]["end"] is not None:
+            return tuple(
+                datetime.datetime.fromisoformat(item["date"][k])
+                for k in ("start", "end")
+            )
+        # Decode the values with the property class of their type
+        prop = Property.from_json(
+            {"id": self.id, **item}, name=self.name, db=self.db, page=self.page
+        )
+        return prop.parse(item[type_])
+
+    def serialize(self, value) -> Json:
+        raise ValueError(f"{self.TYPE} ({self.name}) property is read-only.")
+
+
+def _is_empty(value: Json) -> bool:
+    return value is None or value == [] or value == ""
+
+
+def _same_time(old: str | None, new: str | None) -> bool:
+    if old is None or new is None:
+        return old == new
+    # Dates and datetimes are different values, even at midnight
+    return ("T" in old) == ("T" in new) and datetime.datetime.fromisoformat(
+        old
+    ) == datetime.datetime.fromisoformat(new)
+
+
 class Properties(property_base.PropertiesBase[Property]):
     _PROP_CLS = Property
 
     def __repr__(self) -> str:
+        from etils import epy
+
         return epy.Lines.make_block(
             type(self).__qualname__,
             {k: v.value for k, v in self._props.items()},
@@ -4,17 +4,18 @@ from __future__ import annotations
 
 import dataclasses
 import functools
+import typing
 from collections.abc import Callable
 from typing import Any, ClassVar, Generic, Self, TypeVar
 
-import notion_client
-from etils import epy
-
 from auto_notion import database
 from auto_notion import page as pagelib
 from auto_notion import utils
 from auto_notion.typing import Json
 
+if typing.TYPE_CHECKING:
+    import notion_client
+
 _PropT = TypeVar("_PropT")
 
 
@@ -90,6 +91,8 @@ class PropertiesBase(Generic[_PropT]):
         object.__setattr__(self, "_props", state)
 
     def __repr__(self) -> str:
+        from etils import epy
+
         return epy.Lines.make_block(
             type(self).__qualname__,
             {k: v.name for k, v in self._props.items()},
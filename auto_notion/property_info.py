@@ -34,3 +34,7 @@ class Select(_Select):
 
 class MultiSelect(_Select):
     TYPE = "multi_select"
+
+
+class Status(_Select):
+    TYPE = "status"
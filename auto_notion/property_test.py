@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import datetime
+
+import auto_notion
+from auto_notion import metrics as metricslib
+from auto_notion import property as propertylib
+
+
+def _skipped() -> float:
+    return metricslib.get_metrics().counter("auto_notion.writes.skipped")
+
+
+def _first_row(server, **kwargs):
+    db_json = server.add_database(num_rows=20, **kwargs)
+    db = auto_notion.Database(db_json.id)
+    row = next(row for row in db if row.status and row.tags and row.due)
+    return db_json, row
+
+
+def test_noop_writes(server):
+    _, row = _first_row(server)
+    row.name = row.name
+    row.done = row.done
+    row.status = row.status
+    row.tags = list(reversed(row.tags))  # Order is not significant
+    row.priority = row.priority
+    row.due = row.due.date()
+    row.notes = row.notes
+    assert server.requests["pages.update"] == 0
+    assert _skipped() == 7
+
+
+def test_writes(server):
+    db_json, row = _first_row(server)
+    row.done = not row.done
+    row.tags = row.tags[:-1]
+    row.name = row.name + "!"
+    assert server.requests["pages.update"] == 3
+    assert _skipped() == 0
+    page = db_json.retrieve(row.INFO.id)
+    assert page["properties"]["Name"]["title"][0]["plain_text"] == row.name
+
+
+def test_noop_empty_values(server):
+    _, row = _first_row(server)
+    row.priority = None
+    assert server.requests["pages.update"] == 1
+    row.priority = None  # Already empty
+    row.tags = []
+    row.tags = None
+    assert server.requests["pages.update"] == 2
+    assert _skipped() == 2
+
+
+def test_noop_dates(server):
+    _, row = _first_row(server)
+    day = row.due
+    assert "T" not in row.INFO.json["properties"]["Due"]["date"]["start"]
+    row.due = day.date()
+    assert server.requests["pages.update"] == 0
+    # A datetime (even at midnight) is a different value than a date
+    row.due = day.replace(tzinfo=datetime.timezone.utc)
+    assert server.requests["pages.update"] == 1
+    row.due = day.replace(tzinfo=datetime.timezone.utc)
+    # Same instant, in another time zone
+    row.due = row.due.astimezone(datetime.timezone(datetime.timedelta(hours=2)))
+    assert server.requests["pages.update"] == 1
+
+
+def test_noop_formatted_text(server):
+    db_json, row = _first_row(server)
+    field = row._codec.fields["notes"]
+    json = row.INFO.json["properties"]["Notes"]
+    query = field.encode(row.notes)
+    assert field.prop.is_noop(json, query)
+    # Re-writing the same text would drop the formatting
+    json["rich_text"][0]["annotations"]["bold"] = True
+    assert not field.prop.is_noop(json, query)
+
+
+def test_noop_batch(server):
+    _, row = _first_row(server)
+    priority = row.priority
+    with row.batch():
+        row.priority = 100
+        row.priority = priority  # Pending value is sent, even if unchanged
+        row.done = row.done  # Skipped
+    assert server.requests["pages.update"] == 1
+    assert _skipped() == 1
+
+
+def test_noop_page_properties(server):
+    _, row = _first_row(server)
+    props = row.INFO.props
+    props.priority.value = row.priority
+    assert server.requests["pages.update"] == 0
+    props.priority.value = (row.priority or 0) + 1
+    assert server.requests["pages.update"] == 1
+
+
+def _rollup(value: dict):
+    json = {"id": "r1", "type": "rollup", "rollup": value}
+    prop = propertylib.Property.from_json(json, name="Rollup", db=None, page=None)
+    return prop.parse(value)
+
+
+def test_rollup():
+    number = {"type": "number", "number": 3, "function": "sum"}
+    assert _rollup(number) == 3
+
+    date = {"start": "2024-01-01", "end": None, "time_zone": None}
+    rollup = {"type": "date", "date": date, "function": "earliest_date"}
+    assert _rollup(rollup) == datetime.datetime(2024, 1, 1)
+
+    date = {"start": "2024-01-01", "end": "2024-03-01T12:00:00.000Z"}
+    rollup = {"type": "date", "date": date, "function": "date_range"}
+    assert _rollup(rollup) == (
+        datetime.datetime(2024, 1, 1),
+        datetime.datetime(2024, 3, 1, 12, tzinfo=datetime.timezone.utc),
+    )
+
+    items = [
+        {"type": "date", "date": {"start": "2024-01-01", "end": "2024-01-05"}},
+        {"type": "date", "date": None},
+        {"type": "rich_text", "rich_text": [{"plain_text": "a", "type": "text"}]},
+    ]
+    rollup = {"type": "array", "array": items, "function": "show_original"}
+    assert _rollup(rollup) == [
+        (datetime.datetime(2024, 1, 1), datetime.datetime(2024, 1, 5)),
+        None,
+        "a",
+    ]
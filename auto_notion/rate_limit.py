@@ -0,0 +1,225 @@
+"""Client-side rate limiting & retries.
+
+Notion allows an average of ~3 requests/second per integration. All the
+requests of the process (sync & async clients, every `Database`) share a
+single token bucket, so the limit is respected by construction rather than
+after receiving `429` errors.
+
+`429` and `5xx` errors are retried for all requests. Timeouts and connection
+errors are only retried for idempotent requests: the page of a timed out
+`pages.create` may have been created, so retrying could duplicate it.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import functools
+import os
+import random
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from auto_notion import metrics as metricslib
+
+_T = TypeVar("_T")
+
+_RETRYABLE_CODES = frozenset(
+    {
+        "rate_limited",
+        "conflict_error",
+        "internal_server_error",
+        "service_unavailable",
+    }
+)
+# Errors for which the request was rejected before being processed
+_REJECTED_CODES = frozenset({"rate_limited", "conflict_error"})
+
+# Endpoints creating a new object at each call (see `metrics.endpoint_name`)
+_NON_IDEMPOTENT_ENDPOINTS = frozenset(
+    {
+        "POST pages",
+        "POST databases",
+        "POST comments",
+        "PATCH blocks/{id}/children",
+    }
+)
+
+
+class RateLimiter:
+    """Thread-safe token bucket.
+
+    Each request reserves a token (the count can go negative), and waits until
+    the bucket would have refilled. This keep the order of the requests and
+    smooth bursts to `rate` requests/second.
+    """
+
+    def __init__(self, rate: float, *, burst: float | None = None):
+        self.rate = rate
+        self.burst = rate if burst is None else burst
+        self._tokens = self.burst
+        self._last = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Reserve a token and returns how long to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._last) * self.rate
+            )
+            self._last = now
+            self._tokens -= 1
+            return max(-self._tokens / self.rate, self._paused_until - now, 0.0)
+
+    def acquire(self) -> None:
+        time.sleep(self._reserve())
+
+    async def acquire_async(self) -> None:
+        import asyncio
+
+        await asyncio.sleep(self._reserve())
+
+    def pause(self, delay: float) -> None:
+        """Block all requests for `delay` seconds (after a `429`)."""
+        with self._lock:
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + delay)
+            self._tokens = min(self._tokens, 0.0)
+
+
+@functools.cache
+def get_rate_limiter() -> RateLimiter:
+    return RateLimiter(rate=float(os.environ.get("AUTO_NOTION_RATE_LIMIT", 3)))
+
+
+@dataclasses.dataclass(frozen=True)
+class RetryOptions:
+    """Jittered exponential backoff."""
+
+    max_retries: int = 5
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+
+    def should_retry(
+        self, error: Exception, *, attempt: int, idempotent: bool = True
+    ) -> bool:
+        return attempt < self.max_retries and is_retryable(error, idempotent=idempotent)
+
+    def delay(self, error: Exception, *, attempt: int) -> float:
+        if (retry_after := _retry_after(error)) is not None:
+            return retry_after
+        # "Full jitter", so concurrent clients don't retry in lockstep
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+def is_retryable(error: Exception, *, idempotent: bool = True) -> bool:
+    """Whether the request can be safely retried after `error`.
+
+    Args:
+        error: Error raised by the request
+        idempotent: If `False`, errors after which the request may have been
+            processed (5xx, timeouts, lost connections) are not retried
+    """
+    import httpx
+    import notion_client
+
+    if isinstance(error, notion_client.APIResponseError):
+        codes = _RETRYABLE_CODES if idempotent else _REJECTED_CODES
+        return error.code in codes
+    elif isinstance(error, notion_client.errors.HTTPResponseError):
+        return error.status == 429 or (idempotent and error.status >= 500)
+    elif isinstance(error, httpx.ConnectError):  # The request was never sent
+        return True
+    return idempotent and isinstance(
+        error,
+        (notion_client.errors.RequestTimeoutError, httpx.TransportError),
+    )
+
+
+def is_idempotent(endpoint: str | None) -> bool:
+    """Whether sending the request twice has the same effect as once."""
+    return endpoint not in _NON_IDEMPOTENT_ENDPOINTS
+
+
+def _is_rate_limited(error: Exception) -> bool:
+    return getattr(error, "status", None) == 429
+
+
+def _retry_after(error: Exception) -> float | None:
+    headers = getattr(error, "headers", None)
+    if not headers or "retry-after" not in headers:
+        return None
+    try:
+        return float(headers["retry-after"])
+    except ValueError:  # HTTP-date format is not supported
+        return None
+
+
+def _record_retry(error: Exception, endpoint: str | None) -> None:
+    metricslib.get_metrics().add(
+        "notion.retries",
+        endpoint=endpoint,
+        code=getattr(error, "code", None) or type(error).__name__,
+    )
+
+
+def call(
+    fn: Callable[[], _T],
+    *,
+    limiter: RateLimiter,
+    retry: RetryOptions,
+    endpoint: str | None = None,
+) -> _T:
+    """Call `fn` once a token is available, retrying on transient errors.
+
+    Timeouts are not retried for the non-idempotent `endpoint`s.
+    """
+    metrics = metricslib.get_metrics()
+    idempotent = is_idempotent(endpoint)
+    attempt = 0
+    while True:
+        with metrics.timer("notion.rate_limit.wait"):
+            limiter.acquire()
+        try:
+            return fn()
+        except Exception as e:
+            if not retry.should_retry(e, attempt=attempt, idempotent=idempotent):
+                raise
+            _record_retry(e, endpoint)
+            delay = retry.delay(e, attempt=attempt)
+            if _is_rate_limited(e):
+                limiter.pause(delay)
+            time.sleep(delay)
+            attempt += 1
+
+
+async def call_async(
+    fn: Callable[[], Awaitable[_T]],
+    *,
+    limiter: RateLimiter,
+    retry: RetryOptions,
+    endpoint: str | None = None,
+) -> _T:
+    """Async version of `call`."""
+    import asyncio
+
+    metrics = metricslib.get_metrics()
+    idempotent = is_idempotent(endpoint)
+    attempt = 0
+    while True:
+        with metrics.timer("notion.rate_limit.wait"):
+            await limiter.acquire_async()
+        try:
+            return await fn()
+        except Exception as e:
+            if not retry.should_retry(e, attempt=attempt, idempotent=idempotent):
+                raise
+            _record_retry(e, endpoint)
+            delay = retry.delay(e, attempt=attempt)
+            if _is_rate_limited(e):
+                limiter.pause(delay)
+            await asyncio.sleep(delay)
+            attempt += 1
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import httpx
+import notion_client
+import pytest
+
+import auto_notion
+from auto_notion import client as clientlib
+from auto_notion import metrics as metricslib
+from auto_notion import rate_limit
+
+_REQUEST = httpx.Request("POST", "https://api.notion.com/v1/pages")
+
+
+def _http_error(status: int, **headers: str) -> Exception:
+    response = httpx.Response(status, headers=headers, request=_REQUEST)
+    return notion_client.errors.HTTPResponseError(response)
+
+
+def _api_error(code: str) -> Exception:
+    response = httpx.Response(400, request=_REQUEST)
+    return notion_client.APIResponseError(response, "Error", code)
+
+
+@pytest.mark.parametrize(
+    "error, idempotent, retryable",
+    [
+        (_http_error(429), False, True),
+        (_http_error(503), True, True),
+        (_http_error(502), False, False),
+        (_http_error(504), False, False),
+        (_http_error(400), True, False),
+        (_api_error("rate_limited"), False, True),
+        (_api_error("conflict_error"), False, True),
+        (_api_error("internal_server_error"), True, True),
+        (_api_error("internal_server_error"), False, False),
+        (_api_error("validation_error"), True, False),
+        (notion_client.errors.RequestTimeoutError(), True, True),
+        (notion_client.errors.RequestTimeoutError(), False, False),
+        (httpx.ReadError("Lost", request=_REQUEST), True, True),
+        (httpx.ReadError("Lost", request=_REQUEST), False, False),
+        (httpx.ConnectError("Refused", request=_REQUEST), False, True),
+        (ValueError(), True, False),
+    ],
+)
+def test_is_retryable(error, idempotent, retryable):
+    assert rate_limit.is_retryable(error, idempotent=idempotent) == retryable
+
+
+def test_is_idempotent():
+    assert rate_limit.is_idempotent("POST databases/{id}/query")
+    assert rate_limit.is_idempotent("PATCH pages/{id}")
+    assert not rate_limit.is_idempotent("POST pages")
+
+
+def test_retry_after():
+    retry = rate_limit.RetryOptions(base_delay=100)
+    assert retry.delay(_http_error(429, **{"Retry-After": "0.5"}), attempt=3) == 0.5
+    # Without (or with an unsupported) `Retry-After`: jittered backoff
+    assert 0 <= retry.delay(_http_error(429), attempt=0) <= 100
+    date = "Wed, 21 Oct 2015 07:28:00 GMT"
+    assert 0 <= retry.delay(_http_error(429, **{"Retry-After": date}), attempt=0)
+
+
+def test_call_pauses_the_limiter(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(rate_limit.time, "sleep", sleeps.append)
+    limiter = rate_limit.RateLimiter(rate=1e6)
+    errors = [_http_error(429, **{"Retry-After": "2"}), _http_error(503)]
+
+    def fn():
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    retry = rate_limit.RetryOptions(base_delay=0.001)
+    assert rate_limit.call(fn, limiter=limiter, retry=retry, endpoint="GET x") == "ok"
+    assert 2.0 in sleeps
+    # The `Retry-After` delay also applies to the following requests
+    assert limiter._reserve() > 1.5
+    assert metricslib.get_metrics().counter("notion.retries", endpoint="GET x") == 2
+
+
+def test_call_gives_up(monkeypatch):
+    monkeypatch.setattr(rate_limit.time, "sleep", lambda _: None)
+    calls = []
+
+    def fn():
+        calls.append(1)
+        raise _http_error(503)
+
+    retry = rate_limit.RetryOptions(max_retries=2)
+    limiter = rate_limit.RateLimiter(rate=1e6)
+    with pytest.raises(notion_client.errors.HTTPResponseError):
+        rate_limit.call(fn, limiter=limiter, retry=retry)
+    assert len(calls) == 3
+
+
+def test_rate_limited_server(monkeypatch):
+    monkeypatch.setattr(
+        clientlib._Client, "retry", rate_limit.RetryOptions(max_retries=20)
+    )
+    server = auto_notion.testing.FakeNotion(
+        page_size=10, error_rate=0.3, retry_after=0.001
+    )
+    db_json = server.add_database(num_rows=200)
+    with server.install():
+        rows = list(auto_notion.Database(db_json.id))
+    assert len(rows) == 200
+    assert server.requests["429"] > 0
+    retries = metricslib.get_metrics().counter("notion.retries", code="rate_limited")
+    assert retries == server.requests["429"]
@@ -0,0 +1,185 @@
+"""Relation resolution, with a process-wide page cache.
+
+```python
+for row in db.resolve('project'):
+    row.project[0].page.name  # No extra request
+```
+
+`db.resolve(...)` collects the related page ids of each query page and fetches
+them together (deduplicated, concurrently, throttled by the rate limiter)
+before the rows are returned. Fetched pages are kept in a shared cache (keyed
+by id, only replaced by a more recent `last_edited_time`), so walking a
+relation costs one `pages.retrieve` per distinct target, across views.
+
+Without `resolve`, `ref.page` fetches the page on first access (still cached).
+"""
+
+from __future__ import annotations
+
+import collections
+import dataclasses
+import functools
+import threading
+import typing
+from collections.abc import Iterable, Iterator
+
+from auto_notion import database
+from auto_notion import metrics as metricslib
+from auto_notion import utils
+from auto_notion.typing import Json
+
+if typing.TYPE_CHECKING:
+    import notion_client
+
+_DEFAULT_MAX_SIZE = 10_000
+
+
+@dataclasses.dataclass(frozen=True)
+class PageRef:
+    """Related page (`row.project[0].page.name`)."""
+
+    id: str
+
+    @property
+    def page(self) -> database.PropertyProxy | None:
+        """The related page (`None` if deleted or not shared with the integration)."""
+        json = get_page_cache().fetch_many(utils.get_client(), [self.id])[self.id]
+        if json is None:
+            return None
+        db = _get_database(json["parent"]["database_id"])
+        return database.PropertyProxy(json, codec=db.codec)
+
+
+@functools.cache
+def _get_database(id: str) -> database.Database:
+    return database.Database(id)
+
+
+class PageCache:
+    """Thread-safe LRU of `pages.retrieve` responses, keyed by page id.
+
+    Args:
+        max_size: Maximum number of cached pages
+    """
+
+    def __init__(self, *, max_size: int = _DEFAULT_MAX_SIZE):
+        self.max_size = max_size
+        # Page id -> page json (`None` for the pages which could not be fetched)
+        self._pages: collections.OrderedDict[str, Json | None] = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, id: str) -> Json | None:
+        with self._lock:
+            page = self._pages.get(id)
+            if page is not None:
+                self._pages.move_to_end(id)
+            return page
+
+    def put(self, page: Json) -> None:
+        """Add the page, unless a more recent version is already cached."""
+        with self._lock:
+            self._put(page["id"], page)
+
+    def _put(self, id: str, page: Json | None) -> None:
+        old = self._pages.get(id)
+        if (
+            old is not None
+            and page is not None
+            and old["last_edited_time"] > page["last_edited_time"]
+        ):
+            return
+        self._pages[id] = page
+        self._pages.move_to_end(id)
+        while len(self._pages) > self.max_size:
+            self._pages.popitem(last=False)
+
+    def invalidate(self, id: str | None = None) -> None:
+        """Drop the page (or all pages)."""
+        with self._lock:
+            if id is None:
+                self._pages.clear()
+            else:
+                self._pages.pop(id, None)
+
+    def fetch_many(
+        self,
+        api: notion_client.Client,
+        ids: Iterable[str],
+        *,
+        max_concurrency: int = 8,
+    ) -> dict[str, Json | None]:
+        """Returns the pages, only fetching the ones missing from the cache."""
+        ids = list(dict.fromkeys(ids))
+        with self._lock:
+            pages = {id: self._pages[id] for id in ids if id in self._pages}
+        missing = [id for id in ids if id not in pages]
+        metrics = metricslib.get_metrics()
+        if pages:
+            metrics.add("auto_notion.page_cache", len(pages), result="hit")
+        if not missing:
+            return pages
+        metrics.add("auto_notion.page_cache", len(missing), result="miss")
+
+        import concurrent.futures
+
+        import notion_client
+
+        def retrieve(id: str) -> Json | None:
+            try:
+                return api.pages.retrieve(id)
+            except notion_client.APIResponseError as e:
+                if e.code == notion_client.APIErrorCode.ObjectNotFound:
+                    return None
+                raise
+
+        # Requests are throttled by the process-wide rate limiter of the client
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(max_concurrency, len(missing))
+        ) as executor:
+            fetched = dict(zip(missing, executor.map(retrieve, missing)))
+        with self._lock:
+            for id, page in fetched.items():
+                self._put(id, page)
+        return {**pages, **fetched}
+
+
+@functools.cache
+def get_page_cache() -> PageCache:
+    return PageCache()
+
+
+def resolve_pages(
+    pages: Iterator[Json],
+    *,
+    api: notion_client.Client,
+    names: Iterable[str],
+    cache_rows: bool,
+    max_concurrency: int = 8,
+) -> Iterator[Json]:
+    """Fetch the pages related by the `names` properties, one query page at a time.
+
+    Args:
+        pages: `databases.query` responses
+        api: Client used to fetch the related pages
+        names: Relation property names
+        cache_rows: Also add the query rows to the cache (only if they contain
+            all properties), so self-relations are not re-fetched
+        max_concurrency: Number of concurrent `pages.retrieve`
+    """
+    cache = get_page_cache()
+    names = list(names)
+    for results in pages:
+        rows = results["results"]
+        if cache_rows:
+            for row in rows:
+                cache.put(row)
+        ids = [
+            ref["id"]
+            for row in rows
+            for name in names
+            for ref in row["properties"].get(name, {}).get("relation") or ()
+        ]
+        cache.fetch_many(api, ids, max_concurrency=max_concurrency)
+        yield results
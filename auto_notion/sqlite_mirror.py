@@ -0,0 +1,208 @@
+"""Persistent SQLite mirror of a database.
+
+```python
+mirror = auto_notion.SQLiteMirror(db, 'todo.sqlite')
+mirror.sync()  # Only fetch the rows edited since the last sync
+
+mirror.execute('SELECT snooze, COUNT(*) FROM pages GROUP BY snooze').fetchall()
+```
+
+Each property is stored in its own typed column (named by its snake name),
+multi-valued properties (multi-select, people, relation,...) as JSON arrays.
+Rows are upserted on the page id, using `last_edited_time` as version.
+Datetimes (including the page `created_time` / `last_edited_time`) are stored
+in UTC, as ISO strings of fixed precision, so they can be compared & sorted.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import os
+import sqlite3
+import typing
+from collections.abc import Iterable
+from typing import Any
+
+from auto_notion import database
+from auto_notion.typing import Json
+
+if typing.TYPE_CHECKING:
+    import pandas as pd
+
+# Notion type -> SQLite column type (others are stored as JSON `TEXT`)
+_SQL_TYPES = {
+    "title": "TEXT",
+    "rich_text": "TEXT",
+    "url": "TEXT",
+    "email": "TEXT",
+    "phone_number": "TEXT",
+    "select": "TEXT",
+    "status": "TEXT",
+    "number": "REAL",
+    "checkbox": "INTEGER",
+    "date": "TEXT",
+    "created_time": "TEXT",
+    "last_edited_time": "TEXT",
+    "created_by": "TEXT",
+    "last_edited_by": "TEXT",
+}
+
+
+# Page columns
+_RESERVED = frozenset({"id", "created_time", "last_edited_time"})
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _format_time(value: datetime.datetime) -> str:
+    if value.tzinfo is not None:  # Normalize to UTC so columns are sortable
+        value = value.astimezone(datetime.timezone.utc)
+    return value.isoformat(timespec="milliseconds")
+
+
+def _page_time(value: str) -> str:
+    """Page `created_time` / `last_edited_time` (`...Z`), like the properties."""
+    return _format_time(datetime.datetime.fromisoformat(value))
+
+
+def _to_sql(type_: str, value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, datetime.datetime):
+        return _format_time(value)
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    if type_ in ("created_by", "last_edited_by"):
+        return value.id
+    if type_ not in _SQL_TYPES:  # Multi-valued or unsupported: JSON
+        return json.dumps(value, default=lambda v: getattr(v, "id", str(v)))
+    return value
+
+
+class SQLiteMirror:
+    """Mirror the database pages into a SQLite table.
+
+    Args:
+        db: Database to mirror
+        path: SQLite file
+        table: Table name
+    """
+
+    def __init__(
+        self,
+        db: database.Database,
+        path: str | os.PathLike[str],
+        *,
+        table: str = "pages",
+    ):
+        self._db = db
+        self.table = table
+        self.conn = sqlite3.connect(os.fspath(path))
+        self._create_table()
+
+    def _create_table(self) -> None:
+        # Column name -> property snake name
+        self._columns = {
+            f"prop_{k}" if k in _RESERVED else k: k for k in self._db.props._props
+        }
+        table = _quote(self.table)
+        with self.conn:
+            self.conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "id TEXT PRIMARY KEY, "
+                "created_time TEXT NOT NULL, "
+                "last_edited_time TEXT NOT NULL)"
+            )
+            self.conn.execute(
+                f"CREATE INDEX IF NOT EXISTS "
+                f"{_quote(f'{self.table}_last_edited_time')} "
+                f"ON {table} (last_edited_time)"
+            )
+            # Add the columns (including the ones added since the last sync)
+            existing = {
+                row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")
+            }
+            for col, k in self._columns.items():
+                if col not in existing:
+                    sql_type = _SQL_TYPES.get(self._db.props._props[k].type, "TEXT")
+                    self.conn.execute(
+                        f"ALTER TABLE {table} ADD COLUMN {_quote(col)} {sql_type}"
+                    )
+
+    @property
+    def last_edited_time(self) -> datetime.datetime | None:
+        """Latest `last_edited_time` of the mirror."""
+        (value,) = self.conn.execute(
+            f"SELECT MAX(last_edited_time) FROM {_quote(self.table)}"
+        ).fetchone()
+        return None if value is None else datetime.datetime.fromisoformat(value)
+
+    def sync(self) -> int:
+        """Upsert the rows edited since the last sync. Returns the number of rows."""
+        view = self._db.changed_since(self.last_edited_time)
+        num_rows = 0
+        for results in view._iter_raw_pages():
+            self.upsert(results["results"])
+            num_rows += len(results["results"])
+        return num_rows
+
+    def upsert(self, pages: Iterable[Json]) -> None:
+        """Insert or update the raw pages (as returned by the query).
+
+        Pages older than the version already stored are ignored.
+        """
+        fields = self._db.codec.fields
+        columns = ["id", "created_time", "last_edited_time", *self._columns]
+        quoted = [_quote(c) for c in columns]
+        updates = ", ".join(f"{c} = excluded.{c}" for c in quoted[1:])
+        table = _quote(self.table)
+        sql = (
+            f"INSERT INTO {table} ({', '.join(quoted)}) "
+            f"VALUES ({', '.join('?' * len(columns))}) "
+            f"ON CONFLICT(id) DO UPDATE SET {updates} "
+            f"WHERE excluded.last_edited_time >= {table}.last_edited_time"
+        )
+        rows = []
+        for page in pages:
+            props = page["properties"]
+            row = [
+                page["id"],
+                _page_time(page["created_time"]),
+                _page_time(page["last_edited_time"]),
+            ]
+            for k in self._columns.values():
+                field = fields[k]
+                if field.name in props:
+                    value = _to_sql(field.type, field.decode(props[field.name]))
+                else:
+                    value = None
+                row.append(value)
+            rows.append(row)
+        with self.conn:
+            self.conn.executemany(sql, rows)
+
+    def execute(self, sql: str, parameters: Iterable[Any] = ()) -> sqlite3.Cursor:
+        return self.conn.execute(sql, parameters)
+
+    def create_index(self, *columns: str) -> None:
+        """Add an index on the given property column(s)."""
+        name = _quote("_".join([self.table, *columns]))
+        cols = ", ".join(_quote(c) for c in columns)
+        with self.conn:
+            self.conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {name} ON {_quote(self.table)} ({cols})"
+            )
+
+    def df(self, sql: str | None = None) -> pd.DataFrame:
+        """Returns the SQL query result (default to the full table)."""
+        import pandas as pd
+
+        if sql is None:
+            sql = f"SELECT * FROM {_quote(self.table)}"
+        return pd.read_sql_query(sql, self.conn)
+
+    def close(self) -> None:
+        self.conn.close()
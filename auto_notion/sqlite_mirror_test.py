@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import datetime
+import json
+import pathlib
+import subprocess
+import sys
+
+import pytest
+
+import auto_notion
+
+
+@pytest.fixture
+def db_json(server):
+    return server.add_database(num_rows=150)
+
+
+@pytest.fixture
+def db(db_json):
+    return auto_notion.Database(db_json.id)
+
+
+@pytest.fixture
+def mirror(db, tmp_path):
+    mirror = auto_notion.SQLiteMirror(db, tmp_path / "db.sqlite")
+    yield mirror
+    mirror.close()
+
+
+def _columns(mirror) -> dict[str, str]:
+    return {
+        row[1]: row[2] for row in mirror.execute(f"PRAGMA table_info({mirror.table})")
+    }
+
+
+def test_lazy_import():
+    code = (
+        "import sys, auto_notion; "
+        "assert 'sqlite3' not in sys.modules; "
+        "assert auto_notion.SQLiteMirror.__module__ == 'auto_notion.sqlite_mirror'"
+    )
+    root = pathlib.Path(auto_notion.__file__).parent.parent
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=root)
+    with pytest.raises(AttributeError, match="unknown"):
+        auto_notion.unknown
+
+
+def test_create_table(mirror):
+    assert _columns(mirror) == {
+        "id": "TEXT",
+        "created_time": "TEXT",
+        "last_edited_time": "TEXT",
+        "name": "TEXT",
+        "done": "INTEGER",
+        "status": "TEXT",
+        "tags": "TEXT",
+        "priority": "REAL",
+        "due": "TEXT",
+        "notes": "TEXT",
+        "created": "TEXT",
+    }
+
+
+def test_sync(server, db_json, db, mirror):
+    assert mirror.last_edited_time is None
+    assert mirror.sync() == 150
+    assert mirror.execute("SELECT COUNT(*) FROM pages").fetchone() == (150,)
+
+    row = next(iter(db))
+    (values,) = mirror.execute(
+        "SELECT name, done, tags, priority, created_time, created "
+        "FROM pages WHERE id = ?",
+        [row.INFO.id],
+    ).fetchall()
+    name, done, tags, priority, created_time, created = values
+    assert (name, bool(done), json.loads(tags)) == (row.name, row.done, row.tags)
+    assert priority == row.priority
+    # Page & property datetimes share the same format
+    assert created_time == created == row.created.isoformat(timespec="milliseconds")
+    assert created_time.endswith("+00:00")
+
+    # Only the rows edited since the last sync are fetched
+    row.notes = "edited"
+    num_pages = server.requests["databases.query"]
+    assert mirror.sync() < 150
+    assert server.requests["databases.query"] == num_pages + 1
+    assert mirror.execute(
+        "SELECT notes FROM pages WHERE id = ?", [row.INFO.id]
+    ).fetchone() == ("edited",)
+    assert mirror.execute("SELECT COUNT(*) FROM pages").fetchone() == (150,)
+    assert mirror.last_edited_time == row.INFO.last_edited.time
+
+
+def test_upsert_ordering(db_json, mirror):
+    page = db_json.retrieve(db_json.page_id(0))
+    old = json.loads(json.dumps(page))
+    old["last_edited_time"] = "2023-01-01T00:00:00.000Z"
+    old["properties"]["Notes"]["rich_text"] = []
+    mirror.upsert([page])
+    # Older versions are ignored
+    mirror.upsert([old])
+    notes, edited = mirror.execute(
+        "SELECT notes, last_edited_time FROM pages"
+    ).fetchone()
+    assert edited == (
+        datetime.datetime.fromisoformat(page["last_edited_time"]).isoformat(
+            timespec="milliseconds"
+        )
+    )
+    assert notes == page["properties"]["Notes"]["rich_text"][0]["plain_text"]
+    # Newer versions replace the row
+    new = json.loads(json.dumps(old))
+    new["last_edited_time"] = "2030-01-01T00:00:00.000Z"
+    mirror.upsert([new])
+    assert mirror.execute("SELECT notes, last_edited_time FROM pages").fetchone() == (
+        "",
+        "2030-01-01T00:00:00.000+00:00",
+    )
+
+
+def test_new_column(db_json, db, mirror, tmp_path):
+    mirror.sync()
+    mirror.close()
+    db_json.update_property("Notes", new_name="Comments")
+    db.refresh()
+
+    # Re-opening the mirror adds the new column
+    mirror = auto_notion.SQLiteMirror(db, tmp_path / "db.sqlite")
+    assert "comments" in _columns(mirror)
+    assert "notes" in _columns(mirror)  # Existing columns are kept
+    db_json.update(db_json.page_id(3), {"properties": {"p6": {"rich_text": []}}})
+    mirror.sync()
+    (comments,) = mirror.execute(
+        "SELECT comments FROM pages WHERE id = ?", [db_json.page_id(3)]
+    ).fetchone()
+    assert comments == ""
+    mirror.close()
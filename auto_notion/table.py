@@ -0,0 +1,324 @@
+"""Compact in-memory snapshot of a database.
+
+```python
+table = db.snapshot()
+for row in table:
+    row.<field_name>
+```
+
+Rather than keeping the raw JSON and the `DatabasePage` / `Property` objects
+of each page, values are stored per column in typed arrays:
+
+* Numbers, checkboxes, dates in `array.array`
+* Select / status values and user ids are dictionary-encoded
+"""
+
+from __future__ import annotations
+
+import array
+import datetime
+import sys
+import time
+import typing
+from collections.abc import Iterable, Iterator
+from typing import Any, ClassVar
+
+from auto_notion import codec as codeclib
+from auto_notion import metrics as metricslib
+from auto_notion import page as pagelib
+from auto_notion import relation as relationlib
+from auto_notion.typing import Json
+
+if typing.TYPE_CHECKING:
+    import pandas as pd
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_NAIVE = -(2**15)  # Offset sentinel for naive datetimes
+
+
+class ColumnStore:
+    """Values of a single column (default: plain list)."""
+
+    TYPES: ClassVar[tuple[str, ...]] = ()
+
+    _TYPE_TO_CLS: ClassVar[dict[str, type[ColumnStore]]] = {}
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        for type_ in cls.TYPES:
+            cls._TYPE_TO_CLS[type_] = cls
+        super().__init_subclass__(**kwargs)
+
+    @classmethod
+    def for_type(cls, type_: str) -> ColumnStore:
+        return cls._TYPE_TO_CLS.get(type_, cls)()
+
+    def __init__(self):
+        self._values = []
+
+    def append(self, value: Any) -> None:
+        self._values.append(value)
+
+    def __getitem__(self, i: int) -> Any:
+        return self._values[i]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+class _NumberStore(ColumnStore):
+    TYPES = ("number",)
+
+    def __init__(self):
+        self._values = array.array("d")
+        self._is_null = bytearray()
+        self._is_int = True
+
+    def append(self, value: float | int | None) -> None:
+        self._is_null.append(value is None)
+        self._values.append(0.0 if value is None else value)
+        self._is_int = self._is_int and (value is None or isinstance(value, int))
+
+    def __getitem__(self, i: int) -> float | int | None:
+        if self._is_null[i]:
+            return None
+        value = self._values[i]
+        return int(value) if self._is_int else value
+
+
+class _BoolStore(ColumnStore):
+    TYPES = ("checkbox",)
+
+    def __init__(self):
+        self._values = bytearray()  # 0: False, 1: True, 2: None
+
+    def append(self, value: bool | None) -> None:
+        self._values.append(2 if value is None else int(value))
+
+    def __getitem__(self, i: int) -> bool | None:
+        value = self._values[i]
+        return None if value == 2 else bool(value)
+
+
+class _DictStore(ColumnStore):
+    """Dictionary-encoded values (select, status)."""
+
+    TYPES = ("select", "status")
+
+    def __init__(self):
+        self._values = array.array("l")  # -1: None
+        self._dictionary = []
+        self._index = {}
+
+    def _encode(self, value: Any) -> int:
+        key = self._to_key(value)
+        code = self._index.get(key)
+        if code is None:
+            code = self._index[key] = len(self._dictionary)
+            self._dictionary.append(key)
+        return code
+
+    def append(self, value: Any) -> None:
+        self._values.append(-1 if value is None else self._encode(value))
+
+    def __getitem__(self, i: int) -> Any:
+        code = self._values[i]
+        return None if code == -1 else self._from_key(self._dictionary[code])
+
+    def _to_key(self, value: Any) -> Any:
+        return value
+
+    def _from_key(self, key: Any) -> Any:
+        return key
+
+    @property
+    def categories(self) -> list[Any]:
+        return list(self._dictionary)
+
+
+class _UserStore(_DictStore):
+    TYPES = ("created_by", "last_edited_by")
+
+    def _to_key(self, value: pagelib.User) -> str:
+        return value.id
+
+    def _from_key(self, key: str) -> pagelib.User:
+        return pagelib.User(id=key)
+
+
+class _InternedListStore(ColumnStore):
+    """Lists of strings (multi-select names, user/page ids), interned."""
+
+    TYPES = ("multi_select",)
+
+    def append(self, value: list[str] | None) -> None:
+        if value is not None:
+            value = tuple(sys.intern(v) for v in value)
+        self._values.append(value)
+
+    def __getitem__(self, i: int) -> list[str] | None:
+        value = self._values[i]
+        return None if value is None else list(value)
+
+
+class _PeopleStore(_InternedListStore):
+    TYPES = ("people",)
+
+    def append(self, value: list[pagelib.User] | None) -> None:
+        super().append(None if value is None else [u.id for u in value])
+
+    def __getitem__(self, i: int) -> list[pagelib.User] | None:
+        value = super().__getitem__(i)
+        return None if value is None else [pagelib.User(id=id) for id in value]
+
+
+class _RelationStore(_InternedListStore):
+    TYPES = ("relation",)
+
+    def append(self, value: list[relationlib.PageRef] | None) -> None:
+        super().append(None if value is None else [ref.id for ref in value])
+
+    def __getitem__(self, i: int) -> list[relationlib.PageRef] | None:
+        value = super().__getitem__(i)
+        return None if value is None else [relationlib.PageRef(id=id) for id in value]
+
+
+class _DateStore(ColumnStore):
+    """Datetimes stored as (seconds since epoch, UTC offset in minutes)."""
+
+    TYPES = ("date", "created_time", "last_edited_time")
+
+    def __init__(self):
+        self._values = array.array("d")
+        self._offsets = array.array("h")  # `_NAIVE` for naive, `None` is NaN
+
+    def append(self, value: datetime.datetime | None) -> None:
+        if value is None:
+            self._values.append(float("nan"))
+            self._offsets.append(0)
+        elif value.tzinfo is None:
+            self._values.append((value - _EPOCH).total_seconds())
+            self._offsets.append(_NAIVE)
+        else:
+            self._values.append(value.timestamp())
+            offset = value.utcoffset() // datetime.timedelta(minutes=1)
+            self._offsets.append(offset)
+
+    def __getitem__(self, i: int) -> datetime.datetime | None:
+        value = self._values[i]
+        if value != value:  # NaN
+            return None
+        offset = self._offsets[i]
+        if offset == _NAIVE:
+            return _EPOCH + datetime.timedelta(seconds=value)
+        tz = datetime.timezone(datetime.timedelta(minutes=offset))
+        return datetime.datetime.fromtimestamp(value, tz=tz)
+
+
+class DatabaseTable:
+    """Columnar snapshot of the database rows."""
+
+    def __init__(self, codec: codeclib.RowCodec, names: Iterable[str]):
+        self._codec = codec
+        self._fields = {k: codec.fields[k] for k in names}
+        self._columns = {
+            k: ColumnStore.for_type(f.type) for k, f in self._fields.items()
+        }
+        self._ids = []
+
+    @classmethod
+    def from_pages(
+        cls,
+        pages: Iterable[Json],
+        *,
+        codec: codeclib.RowCodec,
+        names: Iterable[str] | None = None,
+    ) -> DatabaseTable:
+        """Build the table from the raw `databases.query` results."""
+        self = cls(codec, codec.fields if names is None else names)
+        # Only the decoding is timed (not the fetching of the pages)
+        seconds = 0.0
+        for page in pages:
+            start = time.perf_counter()
+            self.append(page)
+            seconds += time.perf_counter() - start
+        metrics = metricslib.get_metrics()
+        metrics.add("auto_notion.rows", len(self), kind="table")
+        metrics.record("auto_notion.decode.duration", seconds, kind="table")
+        return self
+
+    def append(self, page: Json) -> None:
+        props = page["properties"]
+        self._ids.append(page["id"])
+        for k, field in self._fields.items():
+            self._columns[k].append(field.decode(props[field.name]))
+
+    @property
+    def columns(self) -> list[str]:
+        return list(self._columns)
+
+    @property
+    def ids(self) -> list[str]:
+        return list(self._ids)
+
+    def column(self, name: str) -> list[Any]:
+        col = self._columns[name]
+        return [col[i] for i in range(len(col))]
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, i: int) -> TableRow:
+        if not -len(self) <= i < len(self):
+            raise IndexError(f"Row {i} out of range ({len(self)} rows)")
+        return TableRow(self, i % len(self))
+
+    def __iter__(self) -> Iterator[TableRow]:
+        for i in range(len(self)):
+            yield TableRow(self, i)
+
+    @property
+    def df(self) -> pd.DataFrame:
+        import pandas as pd
+
+        return pd.DataFrame(
+            {k: self.column(k) for k in self._columns},
+            index=pd.Index(self._ids, name="id"),
+        )
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(rows={len(self)}, columns={self.columns})"
+
+
+class TableRow:
+    """Read-only row view, with the same attribute API as `PropertyProxy`."""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: DatabaseTable, index: int):
+        object.__setattr__(self, "_table", table)
+        object.__setattr__(self, "_index", index)
+
+    def __dir__(self) -> list[str]:
+        return self._table.columns + ["ID"]
+
+    def __getattr__(self, key: str) -> Any:
+        try:
+            col = self._table._columns[key]
+        except KeyError:
+            raise AttributeError(
+                f"{type(self).__name__} has no property {key!r}. Available: "
+                f"{self._table.columns}"
+            ) from None
+        return col[self._index]
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        raise AttributeError("Snapshot rows are read-only.")
+
+    @property
+    def ID(self) -> str:
+        """Notion page id."""
+        return self._table._ids[self._index]
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{k}={getattr(self, k)!r}" for k in self._table.columns)
+        return f"{type(self).__name__}({fields})"
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import datetime
+
+import pytest
+
+import auto_notion
+
+
+@pytest.fixture
+def db_json(server):
+    return server.add_database(num_rows=150)
+
+
+@pytest.fixture
+def db(db_json):
+    return auto_notion.Database(db_json.id)
+
+
+def test_snapshot(db):
+    table = db.snapshot()
+    rows = list(db)
+    assert len(table) == 150
+    assert table.ids == [row.INFO.id for row in rows]
+    assert table.columns == list(db.codec.fields)
+    # Same values as the `PropertyProxy`
+    for row, snapshot_row in zip(rows, table):
+        assert snapshot_row.ID == row.INFO.id
+        for name in table.columns:
+            assert getattr(snapshot_row, name) == getattr(row, name), name
+    assert table.column("priority") == [row.priority for row in rows]
+    assert {type(v) for v in table.column("priority")} <= {int, type(None)}
+
+
+def test_snapshot_dates(db_json, db):
+    cet = datetime.timezone(datetime.timedelta(hours=2))
+    due = datetime.datetime(2024, 6, 1, 10, 30, tzinfo=cet)
+    db_json.update(
+        db_json.page_id(0), {"properties": {"p5": {"date": {"start": due.isoformat()}}}}
+    )
+    table = db.snapshot()
+    # The UTC offset is kept
+    assert table[0].due == due
+    assert table[0].due.utcoffset() == datetime.timedelta(hours=2)
+    # Naive dates & missing values
+    dues = {row.INFO.id: row.due for row in db}
+    assert [row.due for row in table] == [dues[id] for id in table.ids]
+    assert any(v is None for v in dues.values())
+
+
+def test_snapshot_select(db):
+    table = db[db.filter.done].select("name", "done").snapshot()
+    assert table.columns == ["name", "done"]
+    assert len(table) == sum(row.done for row in db)
+    assert all(row.done for row in table)
+    with pytest.raises(AttributeError, match="priority"):
+        table[0].priority
+
+
+def test_table_rows(db):
+    table = db.snapshot()
+    assert table[-1].ID == table.ids[-1]
+    with pytest.raises(IndexError):
+        table[150]
+    with pytest.raises(AttributeError, match="read-only"):
+        table[0].name = "new"
+    assert set(dir(table[0])) == {*table.columns, "ID"}
+    assert "rows=150" in repr(table)
+
+    df = table.df
+    assert df.index.tolist() == table.ids
+    assert df["name"].tolist() == table.column("name")
@@ -0,0 +1,4 @@
+"""Testing utils (offline fake of the Notion API, benchmarks)."""
+
+from auto_notion.testing.fake_notion import FakeNotion
+from auto_notion.testing.fake_notion import SyntheticDatabase
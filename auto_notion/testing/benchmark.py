@@ -0,0 +1,354 @@
+r"""Benchmarks of `auto_notion`, against the offline `FakeNotion` server.
+
+```sh
+python -m auto_notion.testing.benchmark --rows=10000 --latency=0.05
+```
+
+`client` is the time spent in `auto_notion` (excluding the time the fake
+server spends generating the responses, but including the simulated latency),
+`rows/s` is computed from it.
+
+Results are appended to a JSON-lines file (default
+`~/.cache/auto_notion/benchmarks.jsonl`, one line per benchmark, with the
+git commit and the options), and compared with the previous run using the
+same options.
+
+`--import-time` instead checks the startup cost: `import auto_notion` (as
+measured by `python -X importtime`) should stay below `IMPORT_TIME_BUDGET`,
+without loading any of the `LAZY_MODULES` (exits with an error otherwise).
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import dataclasses
+import datetime
+import itertools
+import json
+import math
+import os
+import pathlib
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+
+import auto_notion
+from auto_notion import blocks as blockslib
+from auto_notion import cache as cachelib
+from auto_notion import relation as relationlib
+from auto_notion.testing import fake_notion
+
+_NUM_WRITES = 20
+# Written values differ at each write, so writes are never skipped as no-op
+_WRITE_VALUES = itertools.count(1)
+
+# Maximum `import auto_notion` time (seconds, cumulative `-X importtime`)
+IMPORT_TIME_BUDGET = 0.1
+# Heavy dependencies, only imported on first use
+LAZY_MODULES = (
+    "notion_client",
+    "httpx",
+    "etils",
+    "pandas",
+    "pyarrow",
+    "asyncio",
+    "sqlite3",
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class Options:
+    rows: int = 10_000
+    latency: float = 0.0
+    page_size: int = 100
+    error_rate: float = 0.0
+    seed: int = 0
+
+
+@dataclasses.dataclass
+class Result:
+    name: str
+    seconds: float  # Median of the repeats
+    # Time spent in the fake server (excluding the simulated latency)
+    server_seconds: float
+    rows: int
+    requests: int
+
+    @property
+    def client_seconds(self) -> float:
+        return self.seconds - self.server_seconds
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.client_seconds if self.client_seconds else math.inf
+
+
+def full_scan(db: auto_notion.Database) -> int:
+    num_rows = 0
+    for row in db:
+        row.priority
+        num_rows += 1
+    return num_rows
+
+
+def filtered_scan(db: auto_notion.Database) -> int:
+    rows = db[~db.filter.done & (db.filter.priority >= 4)]
+    return sum(1 for _ in rows)
+
+
+def df(db: auto_notion.Database) -> int:
+    return len(db.df)
+
+
+def single_writes(db: auto_notion.Database) -> int:
+    for row in itertools.islice(db.select("priority", "done"), _NUM_WRITES):
+        row.priority = next(_WRITE_VALUES)
+        row.done = not row.done
+    return _NUM_WRITES
+
+
+def batched_writes(db: auto_notion.Database) -> int:
+    for row in itertools.islice(db.select("priority", "done"), _NUM_WRITES):
+        with row.batch():
+            row.priority = next(_WRITE_VALUES)
+            row.done = not row.done
+    return _NUM_WRITES
+
+
+def cold_start(db: auto_notion.Database) -> int:
+    """First row of a new `Database`, without schema cache."""
+    cachelib.get_schema_cache().invalidate(db.id)
+    next(iter(auto_notion.Database(db.id)))
+    return 1
+
+
+def warm_start(db: auto_notion.Database) -> int:
+    """First row of a new `Database`, with schema cache."""
+    next(iter(auto_notion.Database(db.id)))
+    return 1
+
+
+BENCHMARKS: dict[str, Callable[[auto_notion.Database], int]] = {
+    fn.__name__: fn
+    for fn in (
+        full_scan,
+        filtered_scan,
+        df,
+        single_writes,
+        batched_writes,
+        cold_start,
+        warm_start,
+    )
+}
+
+
+def run(
+    options: Options,
+    *,
+    names: list[str] | None = None,
+    repeats: int = 3,
+) -> list[Result]:
+    """Run the benchmarks on a new fake server.
+
+    The caches are isolated in a temporary directory (so cold/warm starts are
+    reproducible and the user cache is untouched).
+    """
+    with tempfile.TemporaryDirectory() as cache_dir, _isolated_caches(cache_dir):
+        return _run(options, names=names, repeats=repeats)
+
+
+@contextlib.contextmanager
+def _isolated_caches(cache_dir: str) -> Iterator[None]:
+    old_cache_dir = os.environ.get("AUTO_NOTION_CACHE_DIR")
+    os.environ["AUTO_NOTION_CACHE_DIR"] = cache_dir
+    _clear_caches()
+    try:
+        yield
+    finally:
+        if old_cache_dir is None:
+            del os.environ["AUTO_NOTION_CACHE_DIR"]
+        else:
+            os.environ["AUTO_NOTION_CACHE_DIR"] = old_cache_dir
+        _clear_caches()
+
+
+def _clear_caches() -> None:
+    cachelib.get_schema_cache.cache_clear()
+    blockslib.get_block_cache.cache_clear()
+    relationlib.get_page_cache.cache_clear()
+
+
+def _run(options: Options, *, names: list[str] | None, repeats: int) -> list[Result]:
+    server = fake_notion.FakeNotion(
+        latency=options.latency,
+        page_size=options.page_size,
+        error_rate=options.error_rate,
+        seed=options.seed,
+    )
+    db_json = server.add_database(num_rows=options.rows, seed=options.seed)
+    results = []
+    with server.install():
+        db = auto_notion.Database(db_json.id)
+        db.props  # Fetch the schema once
+        for name in names or BENCHMARKS:
+            fn = BENCHMARKS[name]
+            times = []
+            server_times = []
+            for _ in range(repeats):
+                server.reset_stats()
+                start = time.perf_counter()
+                num_rows = fn(db)
+                times.append(time.perf_counter() - start)
+                server_times.append(server.processing_time)
+            results.append(
+                Result(
+                    name=name,
+                    seconds=statistics.median(times),
+                    server_seconds=statistics.median(server_times),
+                    rows=num_rows,
+                    requests=server.requests.total(),
+                )
+            )
+    return results
+
+
+def import_time(repeats: int = 5) -> tuple[float, list[str]]:
+    """Returns the (best) `import auto_notion` time & the eagerly loaded `LAZY_MODULES`.
+
+    Each import is measured in a new interpreter.
+    """
+    root = pathlib.Path(auto_notion.__file__).parent.parent
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([os.fspath(root), *sys.path])}
+    code = (
+        "import sys, auto_notion; "
+        f"print(*[m for m in {LAZY_MODULES!r} if m in sys.modules])"
+    )
+    times = []
+    for _ in range(repeats):
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+            env=env,
+        )
+        # `import time: <self us> | <cumulative us> | auto_notion`
+        match = re.search(r"\|\s*(\d+) \| auto_notion$", process.stderr, re.MULTILINE)
+        times.append(int(match.group(1)) / 1e6)
+    return min(times), process.stdout.split()
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=pathlib.Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _load_previous(path: pathlib.Path, options: Options) -> dict[str, float]:
+    """Latest client time of each benchmark run with the same options."""
+    previous = {}
+    if not path.exists():
+        return previous
+    for line in path.read_text().splitlines():
+        record = json.loads(line)
+        if record["options"] == dataclasses.asdict(options):
+            previous[record["name"]] = record["seconds"] - record["server_seconds"]
+    return previous
+
+
+def record(path: pathlib.Path, options: Options, results: list[Result]) -> None:
+    """Append the results to the history file."""
+    common = {
+        "time": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "options": dataclasses.asdict(options),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a") as f:
+        for result in results:
+            f.write(json.dumps({**common, **dataclasses.asdict(result)}) + "\n")
+
+
+def _format(results: list[Result], previous: dict[str, float]) -> str:
+    lines = [
+        f"{'benchmark':<16}{'time':>12}{'client':>12}{'rows/s':>12}"
+        f"{'requests':>10}{'vs prev':>10}"
+    ]
+    for r in results:
+        delta = ""
+        if previous.get(r.name):
+            delta = f"{(r.client_seconds / previous[r.name] - 1) * 100:+.1f}%"
+        lines.append(
+            f"{r.name:<16}{r.seconds * 1000:>10.1f}ms"
+            f"{r.client_seconds * 1000:>10.1f}ms{r.rows_per_second:>12,.0f}"
+            f"{r.requests:>10}{delta:>10}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    defaults = Options()
+    parser.add_argument("--rows", type=int, default=defaults.rows)
+    parser.add_argument("--latency", type=float, default=defaults.latency)
+    parser.add_argument("--page-size", type=int, default=defaults.page_size)
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS))
+    parser.add_argument(
+        "--import-time",
+        action="store_true",
+        help="Check the `import auto_notion` time budget.",
+    )
+    parser.add_argument(
+        "--output",
+        type=pathlib.Path,
+        default=cachelib.default_cache_dir() / "benchmarks.jsonl",
+        help="History file (`''` to not record the results).",
+    )
+    args = parser.parse_args()
+    if args.import_time:
+        seconds, eager_modules = import_time()
+        print(
+            f"import auto_notion: {seconds * 1000:.1f}ms "
+            f"(budget: {IMPORT_TIME_BUDGET * 1000:.0f}ms)"
+        )
+        if eager_modules:
+            sys.exit(f"Modules imported eagerly: {eager_modules}")
+        if seconds > IMPORT_TIME_BUDGET:
+            sys.exit("Over the import time budget.")
+        return
+    options = Options(
+        rows=args.rows,
+        latency=args.latency,
+        page_size=args.page_size,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+
+    results = run(options, names=args.only, repeats=args.repeats)
+
+    previous = {}
+    if args.output.name:
+        previous = _load_previous(args.output, options)
+        record(args.output, options, results)
+    print(_format(results, previous))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,867 @@
+"""In-process fake of the Notion REST API (no `NOTION_API_TOKEN` required).
+
+```python
+from auto_notion import testing
+
+server = testing.FakeNotion(latency=0.1, error_rate=0.01)
+db_json = server.add_database(num_rows=10_000, seed=0)
+
+with server.install():
+    db = auto_notion.Database(db_json.id)
+    for row in db[db.filter.done]:
+        ...
+```
+
+The fake is plugged as `httpx` transport below the real `notion_client`
+clients, so requests still go through the rate limiter, retries, JSON
+(de)serialization,...
+
+Supported endpoints: `databases.retrieve`, `databases.query` (with cursors,
+filters, sorts and `filter_properties`), `pages.retrieve`, `pages.create`,
+`pages.update` and `blocks.children.list`.
+
+Rows of the synthetic databases are generated on-the-fly from the seed and
+row index (only the edited rows are stored), so databases of 1M rows are
+cheap to create. Page contents (up to 3 levels of nested blocks) are generated
+the same way.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import contextlib
+import dataclasses
+import datetime
+import functools
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any
+from unittest import mock
+
+import httpx
+import notion_client
+
+from auto_notion import client as clientlib
+from auto_notion import rate_limit
+from auto_notion import transport as transportlib
+from auto_notion import utils
+from auto_notion.typing import Json
+
+_BASE_TIME = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+_USER_ID = "00000000-0000-4000-8000-000000000001"
+_FAKE_TOKEN = "fake-token"
+
+_STATUSES = ("Not started", "In progress", "Blocked", "Done")
+_TAGS = ("home", "work", "errand", "health", "admin", "finance")
+_WORDS = (
+    "call", "email", "review", "plan", "buy", "fix", "write", "read", "book",
+    "clean", "send", "prepare", "schedule", "update", "check", "cancel",
+)  # fmt: skip
+
+# (type, name) of the synthetic database columns
+_COLUMNS = (
+    ("title", "Name"),
+    ("checkbox", "Done"),
+    ("select", "Status"),
+    ("multi_select", "Tags"),
+    ("number", "Priority"),
+    ("date", "Due"),
+    ("rich_text", "Notes"),
+    ("created_time", "Created"),
+)
+
+# Computed properties, rejected by `pages.update`
+_READ_ONLY_TYPES = frozenset(
+    {"created_time", "created_by", "last_edited_time", "last_edited_by", "formula"}
+)
+
+_BLOCK_TYPES = ("paragraph", "heading_2", "bulleted_list_item", "to_do", "toggle")
+
+_DAY = datetime.timedelta(days=1).total_seconds()
+# Relative date conditions -> (days before now, days after now)
+_RELATIVE_DATES = {
+    "past_week": (7, 0),
+    "past_month": (30, 0),
+    "past_year": (365, 0),
+    "next_week": (0, 7),
+    "next_month": (0, 30),
+    "next_year": (0, 365),
+}
+
+
+class _FakeError(Exception):
+    """Error returned as Notion JSON error response."""
+
+    def __init__(self, status: int, code: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+
+    def to_json(self) -> Json:
+        return {
+            "object": "error",
+            "status": self.status,
+            "code": self.code,
+            "message": str(self),
+        }
+
+
+def _format_time(time: datetime.datetime) -> str:
+    return time.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _rich_text(content: str) -> list[Json]:
+    return [
+        {
+            "type": "text",
+            "text": {"content": content, "link": None},
+            "annotations": {
+                "bold": False,
+                "italic": False,
+                "strikethrough": False,
+                "underline": False,
+                "code": False,
+                "color": "default",
+            },
+            "plain_text": content,
+            "href": None,
+        }
+    ]
+
+
+def _option(name: str, i: int) -> Json:
+    return {"id": f"opt-{i}", "name": name, "color": "default"}
+
+
+@dataclasses.dataclass
+class SyntheticDatabase:
+    """Database whose rows are generated from `seed`.
+
+    Attributes:
+        id: Database id
+        num_rows: Number of (generated) rows
+        seed: Seed of the generated values
+        related: If set, rows have a `Project` relation to (up to 2) rows of
+            this database
+    """
+
+    id: str
+    num_rows: int
+    seed: int = 0
+    related: SyntheticDatabase | None = dataclasses.field(default=None, repr=False)
+    # Row index -> page json, for the pages updated since creation
+    _edits: dict[int, Json] = dataclasses.field(default_factory=dict, repr=False)
+    _lock: threading.Lock = dataclasses.field(
+        default_factory=threading.Lock, repr=False
+    )
+
+    @functools.cached_property
+    def schema(self) -> Json:
+        """`databases.retrieve` response."""
+        properties = {}
+        columns = _COLUMNS
+        if self.related is not None:
+            columns += (("relation", "Project"),)
+        for i, (type_, name) in enumerate(columns):
+            info = {}
+            if type_ == "select":
+                info = {"options": [_option(n, j) for j, n in enumerate(_STATUSES)]}
+            elif type_ == "multi_select":
+                info = {"options": [_option(n, j) for j, n in enumerate(_TAGS)]}
+            elif type_ == "number":
+                info = {"format": "number"}
+            elif type_ == "relation":
+                info = {
+                    "database_id": self.related.id,
+                    "type": "single_property",
+                    "single_property": {},
+                }
+            properties[name] = {
+                "id": "title" if type_ == "title" else f"p{i}",
+                "name": name,
+                "type": type_,
+                type_: info,
+            }
+        return {
+            "object": "database",
+            "id": self.id,
+            "created_time": _format_time(_BASE_TIME),
+            "last_edited_time": _format_time(_BASE_TIME),
+            "title": _rich_text(f"Synthetic {self.num_rows} rows"),
+            "properties": properties,
+            "archived": False,
+        }
+
+    @functools.cached_property
+    def _props_by_id(self) -> dict[str, Json]:
+        props = self.schema["properties"]
+        return {**props, **{p["id"]: p for p in props.values()}}
+
+    def update_property(
+        self,
+        name: str,
+        *,
+        new_name: str | None = None,
+        type: str | None = None,
+    ) -> None:
+        """Rename and/or change the type of a column (like in the Notion UI)."""
+        new_name = new_name or name
+        with self._lock:
+            prop = self.schema["properties"][name]
+            if type is not None and type != prop["type"]:
+                prop = {"id": prop["id"], "name": new_name, "type": type, type: {}}
+            else:
+                prop = {**prop, "name": new_name}
+            self.schema["properties"] = {
+                new_name if k == name else k: prop if k == name else v
+                for k, v in self.schema["properties"].items()
+            }
+            self.__dict__.pop("_props_by_id", None)
+            for page in self._edits.values():
+                value = page["properties"].pop(name)
+                if value["type"] != prop["type"]:
+                    value = {
+                        "id": prop["id"],
+                        "type": prop["type"],
+                        prop["type"]: _normalize(prop, None),
+                    }
+                page["properties"][new_name] = value
+
+    def page_id(self, index: int) -> str:
+        return f"{self.id[:24]}{index:012x}"
+
+    def page(self, index: int) -> Json:
+        """Returns the page json of the row."""
+        with self._lock:
+            if index in self._edits:
+                return self._edits[index]
+        return self._generate(index)
+
+    def _generate(self, index: int) -> Json:
+        rng = random.Random(self.seed * 2**32 + index)
+        created = _BASE_TIME + datetime.timedelta(minutes=index)
+        edited = created + datetime.timedelta(seconds=rng.randrange(int(90 * _DAY)))
+        due = None
+        if rng.random() < 0.7:
+            day = _BASE_TIME.date() + datetime.timedelta(days=rng.randrange(730))
+            due = {"start": day.isoformat(), "end": None, "time_zone": None}
+        status = rng.choice(_STATUSES) if rng.random() < 0.9 else None
+        values = {
+            "title": _rich_text(f"{rng.choice(_WORDS)} {index}"),
+            "checkbox": rng.random() < 0.3,
+            "select": status and _option(status, _STATUSES.index(status)),
+            "multi_select": [
+                _option(t, _TAGS.index(t)) for t in rng.sample(_TAGS, rng.randrange(3))
+            ],
+            "number": rng.randint(1, 5) if rng.random() < 0.8 else None,
+            "date": due,
+            "rich_text": _rich_text(" ".join(rng.choices(_WORDS, k=rng.randrange(8)))),
+            "created_time": _format_time(created),
+        }
+        if self.related is not None:
+            targets = rng.sample(range(self.related.num_rows), rng.randrange(3))
+            values["relation"] = [{"id": self.related.page_id(i)} for i in targets]
+        user = {"object": "user", "id": _USER_ID}
+        return {
+            "object": "page",
+            "id": self.page_id(index),
+            "created_time": _format_time(created),
+            "last_edited_time": _format_time(edited),
+            "created_by": user,
+            "last_edited_by": user,
+            "cover": None,
+            "icon": None,
+            "parent": {"type": "database_id", "database_id": self.id},
+            "archived": False,
+            "properties": {
+                name: {
+                    "id": prop["id"],
+                    "type": prop["type"],
+                    prop["type"]: values[prop["type"]],
+                }
+                for name, prop in self.schema["properties"].items()
+            },
+            "url": f"https://www.notion.so/{self.page_id(index).replace('-', '')}",
+        }
+
+    def retrieve(self, page_id: str) -> Json:
+        """`pages.retrieve` response."""
+        index = int(page_id[-12:], 16)
+        if index >= self.num_rows:
+            raise _FakeError(404, "object_not_found", f"Could not find {page_id!r}.")
+        return self.page(index)
+
+    def block_id(self, index: int, path: tuple[int, ...]) -> str:
+        """Id of the block at `path` (positions in the parents) in the row."""
+        a, b, c = (p + 1 for p in (*path, -1, -1, -1)[:3])
+        return f"{self.id[:8]}-{c:04x}-4{a:03x}-8{b:03x}-{index:012x}"
+
+    def children(self, parent_id: str, *, start_cursor: int, page_size: int) -> Json:
+        """`blocks.children.list` response."""
+        index = int(parent_id[-12:], 16)
+        if parent_id == self.page_id(index):
+            path = ()
+        else:
+            a, b, c = (
+                int(parent_id[i:j], 16) for i, j in ((15, 18), (20, 23), (9, 13))
+            )
+            path = tuple(p - 1 for p in (a, b, c) if p)
+        if index >= self.num_rows or parent_id not in (
+            self.page_id(index),
+            self.block_id(index, path),
+        ):
+            raise _FakeError(404, "object_not_found", f"Could not find {parent_id!r}.")
+        blocks = self._generate_blocks(index, path)
+        results = blocks[start_cursor : start_cursor + page_size]
+        next_cursor = start_cursor + page_size
+        has_more = next_cursor < len(blocks)
+        return {
+            "object": "list",
+            "results": results,
+            "next_cursor": str(next_cursor) if has_more else None,
+            "has_more": has_more,
+            "type": "block",
+            "block": {},
+        }
+
+    def _generate_blocks(self, index: int, path: tuple[int, ...]) -> list[Json]:
+        rng = random.Random(f"{self.seed}/{index}/{path}")
+        if path:
+            num_blocks = rng.randrange(1, 4)
+        else:  # Some long pages, to exercise the pagination
+            num_blocks = 150 if index % 50 == 0 else rng.randrange(8)
+        created = _format_time(_BASE_TIME + datetime.timedelta(minutes=index))
+        parent_id = self.block_id(index, path) if path else self.page_id(index)
+        blocks = []
+        for i in range(num_blocks):
+            type_ = rng.choice(_BLOCK_TYPES)
+            text = " ".join(rng.choices(_WORDS, k=rng.randrange(1, 8)))
+            blocks.append(
+                {
+                    "object": "block",
+                    "id": self.block_id(index, (*path, i)),
+                    "parent": {
+                        "type": "block_id" if path else "page_id",
+                        ("block_id" if path else "page_id"): parent_id,
+                    },
+                    "created_time": created,
+                    "last_edited_time": created,
+                    "has_children": len(path) < 2 and rng.random() < 0.3,
+                    "archived": False,
+                    "type": type_,
+                    type_: {"rich_text": _rich_text(text), "color": "default"},
+                }
+            )
+        return blocks
+
+    def query(self, body: Json, *, filter_properties: list[str]) -> Json:
+        """`databases.query` response."""
+        page_size = body.get("page_size") or 100
+        if not 0 < page_size <= 100:
+            raise _FakeError(400, "validation_error", f"page_size: {page_size}")
+        filter = body.get("filter")
+        sorts = body.get("sorts")
+        start = int(body.get("start_cursor") or 0)
+        if sorts:
+            # Cursor is the position in the sorted results
+            indices = self._sorted_indices(filter, sorts)
+            rows = [self.page(i) for i in indices[start : start + page_size]]
+            next_cursor = start + page_size
+            has_more = next_cursor < len(indices)
+        else:
+            # Cursor is the index of the next row to scan
+            rows = []
+            index = start
+            while index < self.num_rows and len(rows) < page_size:
+                page = self.page(index)
+                index += 1
+                if not page["archived"] and self._matches(page, filter):
+                    rows.append(page)
+            next_cursor = index
+            has_more = index < self.num_rows
+        if filter_properties:
+            rows = [_select_properties(p, filter_properties) for p in rows]
+        return {
+            "object": "list",
+            "results": rows,
+            "next_cursor": str(next_cursor) if has_more else None,
+            "has_more": has_more,
+            "type": "page",
+            "page": {},
+        }
+
+    def _sorted_indices(self, filter: Json | None, sorts: list[Json]) -> list[int]:
+        pages = {}
+        for index in range(self.num_rows):
+            page = self.page(index)
+            if not page["archived"] and self._matches(page, filter):
+                pages[index] = page
+        indices = list(pages)
+        for sort in reversed(sorts):  # Stable sorts, from the last key
+            values = {i: self._sort_value(p, sort) for i, p in pages.items()}
+            indices.sort(
+                key=lambda i: values[i] if values[i] is not None else 0,
+                reverse=sort.get("direction") == "descending",
+            )
+            indices.sort(key=lambda i: values[i] is None)  # Empty values last
+        return indices
+
+    def _sort_value(self, page: Json, sort: Json) -> Any:
+        if "timestamp" in sort:
+            return _to_timestamp(page[sort["timestamp"]])
+        prop = self._get_prop(sort["property"])
+        value = _extract(page["properties"][prop["name"]])
+        if prop["type"] in ("date", "created_time", "last_edited_time"):
+            return None if value is None else _to_timestamp(value)
+        if isinstance(value, list):
+            return ",".join(value) if value else None
+        return value
+
+    def _matches(self, page: Json, filter: Json | None) -> bool:
+        if filter is None:
+            return True
+        if "and" in filter:
+            return all(self._matches(page, f) for f in filter["and"])
+        if "or" in filter:
+            return any(self._matches(page, f) for f in filter["or"])
+        if "timestamp" in filter:
+            type_ = filter["timestamp"]
+            value = page[type_]
+        else:
+            prop = self._get_prop(filter["property"])
+            type_ = prop["type"]
+            value = _extract(page["properties"][prop["name"]])
+        if type_ not in filter:
+            raise _FakeError(400, "validation_error", f"Invalid filter: {filter}")
+        ((condition, target),) = filter[type_].items()
+        return _eval_condition(type_, condition, value, target)
+
+    def _get_prop(self, key: str) -> Json:
+        try:
+            return self._props_by_id[key]
+        except KeyError:
+            raise _FakeError(
+                400, "validation_error", f"Could not find property {key!r}."
+            ) from None
+
+    def create(self, body: Json) -> Json:
+        """`pages.create` response."""
+        with self._lock:
+            index = self.num_rows
+            self.num_rows += 1
+            # Placeholder, so concurrent creates get distinct indices
+            self._edits[index] = page = self._generate(index)
+        page["created_time"] = _format_time(
+            datetime.datetime.now(datetime.timezone.utc)
+        )
+        for prop in page["properties"].values():  # Empty values
+            if prop["type"] == "created_time":
+                prop["created_time"] = page["created_time"]
+            elif prop["type"] not in _READ_ONLY_TYPES:
+                prop[prop["type"]] = _normalize(self._props_by_id[prop["id"]], None)
+        return self.update(page["id"], body)
+
+    def update(self, page_id: str, body: Json) -> Json:
+        """`pages.update` response."""
+        index = int(page_id[-12:], 16)
+        page = json.loads(json.dumps(self.page(index)))  # Deep copy
+        for key, value in body.get("properties", {}).items():
+            prop = self._get_prop(key)
+            type_ = prop["type"]
+            if type_ in _READ_ONLY_TYPES:
+                raise _FakeError(
+                    400, "validation_error", f"{prop['name']!r} is read-only."
+                )
+            if type_ not in value:
+                raise _FakeError(
+                    400, "validation_error", f"{key!r} is expected to be {type_}."
+                )
+            page["properties"][prop["name"]] = {
+                "id": prop["id"],
+                "type": type_,
+                type_: _normalize(prop, value[type_]),
+            }
+        if "archived" in body:
+            page["archived"] = body["archived"]
+        # Like Notion, truncated to the minute
+        now = datetime.datetime.now(datetime.timezone.utc)
+        page["last_edited_time"] = _format_time(now.replace(second=0, microsecond=0))
+        with self._lock:
+            self._edits[index] = page
+        return page
+
+
+def _select_properties(page: Json, ids: list[str]) -> Json:
+    props = {k: v for k, v in page["properties"].items() if v["id"] in ids}
+    return {**page, "properties": props}
+
+
+def _normalize(prop: Json, value: Any) -> Any:
+    """Normalize the `pages.update` input into the returned page value."""
+    type_ = prop["type"]
+    if value is None:
+        if type_ == "checkbox":
+            return False
+        return (
+            [] if type_ in ("multi_select", "relation", "title", "rich_text") else None
+        )
+    if type_ in ("title", "rich_text"):
+        return [
+            _rich_text(item.get("plain_text") or item["text"]["content"])[0]
+            for item in value
+        ]
+    if type_ in ("select", "status"):
+        return _find_option(prop, value)
+    if type_ == "multi_select":
+        return [_find_option(prop, v) for v in value]
+    if type_ == "date":
+        return {"end": None, "time_zone": None, **value}
+    if type_ == "relation":
+        return [{"id": v["id"]} for v in value]
+    return value
+
+
+def _find_option(prop: Json, value: Json) -> Json:
+    for option in prop[prop["type"]]["options"]:
+        if option["name"] == value.get("name") or option["id"] == value.get("id"):
+            return option
+    return {"id": f"opt-{value['name']}", "color": "default", **value}
+
+
+def _extract(prop: Json) -> Any:
+    """Property json -> plain value used to evaluate filters."""
+    type_ = prop["type"]
+    value = prop[type_]
+    if type_ in ("title", "rich_text"):
+        return "".join(v["plain_text"] for v in value)
+    elif type_ in ("select", "status"):
+        return value and value["name"]
+    elif type_ == "multi_select":
+        return [v["name"] for v in value]
+    elif type_ == "date":
+        return value and value["start"]
+    elif type_ in ("people", "relation"):
+        return [v["id"] for v in value]
+    elif type_ in ("created_by", "last_edited_by"):
+        return [value["id"]]
+    return value
+
+
+def _to_timestamp(value: str) -> float:
+    time = datetime.datetime.fromisoformat(value)
+    if time.tzinfo is None:  # Dates (without time) are considered UTC
+        time = time.replace(tzinfo=datetime.timezone.utc)
+    return time.timestamp()
+
+
+def _date_range(value: str) -> tuple[float, float]:
+    """Date filter value -> `[start, stop)` (full day for dates without time)."""
+    start = _to_timestamp(value)
+    if "T" in value:
+        return start, math.nextafter(start, math.inf)
+    return start, start + _DAY
+
+
+_POSITIVE_CONDITIONS = {
+    "does_not_equal": "equals",
+    "does_not_contain": "contains",
+    "is_not_empty": "is_empty",
+}
+
+
+_DATE_TYPES = ("date", "created_time", "last_edited_time")
+
+
+def _eval_condition(type_: str, condition: str, value: Any, target: Any) -> bool:
+    if type_ in _DATE_TYPES and condition == "does_not_equal":
+        # Like Notion, dates only support `before`, `after`,...
+        raise _FakeError(
+            400, "validation_error", f"Unsupported {type_} condition: {condition!r}"
+        )
+    if condition in _POSITIVE_CONDITIONS:
+        positive = _POSITIVE_CONDITIONS[condition]
+        return not _eval_condition(type_, positive, value, target)
+    if condition == "is_empty":
+        return value is None or value == "" or value == []
+    if value is None or value == []:  # Empty values never match comparisons
+        return False
+
+    if type_ in _DATE_TYPES:
+        value = _to_timestamp(value)
+        if condition in _RELATIVE_DATES:
+            before, after = _RELATIVE_DATES[condition]
+            now = time.time()
+            return now - before * _DAY <= value <= now + after * _DAY
+        start, stop = _date_range(target)
+        fn = {
+            "equals": lambda: start <= value < stop,
+            "before": lambda: value < start,
+            "after": lambda: value >= stop,
+            "on_or_before": lambda: value < stop,
+            "on_or_after": lambda: value >= start,
+        }.get(condition)
+    elif isinstance(value, list):  # Multi-select, people, relation
+        fn = {"contains": lambda: target in value}.get(condition)
+    elif isinstance(value, str):
+        value_, target_ = value.casefold(), str(target).casefold()
+        fn = {
+            "equals": lambda: value == target,
+            "contains": lambda: target_ in value_,
+            "starts_with": lambda: value_.startswith(target_),
+            "ends_with": lambda: value_.endswith(target_),
+        }.get(condition)
+    else:  # Number, checkbox
+        fn = {
+            "equals": lambda: value == target,
+            "greater_than": lambda: value > target,
+            "greater_than_or_equal_to": lambda: value >= target,
+            "less_than": lambda: value < target,
+            "less_than_or_equal_to": lambda: value <= target,
+        }.get(condition)
+    if fn is None:
+        raise _FakeError(
+            400, "validation_error", f"Unsupported {type_} condition: {condition!r}"
+        )
+    return fn()
+
+
+# Endpoints: (method, path regex) -> handler name
+_ROUTES = (
+    ("GET", re.compile(r"databases/(?P<id>[^/]+)"), "databases.retrieve"),
+    ("POST", re.compile(r"databases/(?P<id>[^/]+)/query"), "databases.query"),
+    ("GET", re.compile(r"pages/(?P<id>[^/]+)"), "pages.retrieve"),
+    ("POST", re.compile(r"pages"), "pages.create"),
+    ("GET", re.compile(r"blocks/(?P<id>[^/]+)/children"), "blocks.children.list"),
+    ("PATCH", re.compile(r"pages/(?P<id>[^/]+)"), "pages.update"),
+)
+
+
+class FakeNotion:
+    """Fake Notion server.
+
+    Args:
+        latency: Delay (in seconds) of each response
+        page_size: Maximum number of results per query page (the requested
+            `page_size` is capped to this value)
+        error_rate: Fraction of the requests answered with a `429`
+        retry_after: `Retry-After` header of the `429` responses
+        timeout_rate: Fraction of the requests which time out after being
+            processed (like a lost response)
+        server_error_rate: Fraction of the requests answered with a `502` after
+            being processed
+        seed: Seed of the error injection
+    """
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        page_size: int = 100,
+        error_rate: float = 0.0,
+        retry_after: float = 0.0,
+        timeout_rate: float = 0.0,
+        server_error_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.page_size = page_size
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.timeout_rate = timeout_rate
+        self.server_error_rate = server_error_rate
+        self.databases: dict[str, SyntheticDatabase] = {}
+        # Number of requests per endpoint (e.g. `databases.query`, `429`,
+        # `timeout`, `502`)
+        self.requests = collections.Counter()
+        # Time spent generating the responses (excluding `latency`), to
+        # subtract from the measurements
+        self.processing_time = 0.0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def add_database(
+        self,
+        num_rows: int,
+        *,
+        seed: int = 0,
+        related: SyntheticDatabase | None = None,
+    ) -> SyntheticDatabase:
+        """Register a new synthetic database of `num_rows` rows."""
+        id = f"{len(self.databases):08x}-{seed % 2**16:04x}-4000-8000-{0:012x}"
+        db = SyntheticDatabase(id=id, num_rows=num_rows, seed=seed, related=related)
+        self.databases[id] = db
+        return db
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.requests.clear()
+            self.processing_time = 0.0
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        """Returns the response of the request (without latency)."""
+        start = time.perf_counter()
+        response = self._handle(request)
+        with self._lock:
+            self.processing_time += time.perf_counter() - start
+            timed_out = self._rng.random() < self.timeout_rate
+            if timed_out:
+                self.requests["timeout"] += 1
+            server_error = self._rng.random() < self.server_error_rate
+            if server_error:
+                self.requests["502"] += 1
+        if timed_out:
+            raise httpx.ReadTimeout("Fake timeout.", request=request)
+        if server_error:
+            return httpx.Response(502, content=b"Bad Gateway", request=request)
+        return response
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path.removeprefix("/v1/")
+        try:
+            if not request.headers.get("Authorization", "").startswith("Bearer "):
+                raise _FakeError(401, "unauthorized", "API token is invalid.")
+            endpoint, match = self._route(request.method, path)
+            with self._lock:
+                self.requests[endpoint] += 1
+                rate_limited = self._rng.random() < self.error_rate
+            if rate_limited:
+                with self._lock:
+                    self.requests["429"] += 1
+                raise _FakeError(429, "rate_limited", "Rate limited.")
+            body = json.loads(request.content) if request.content else {}
+            content = self._dispatch(
+                endpoint, match.groupdict().get("id"), request, body
+            )
+            status = 200
+        except _FakeError as e:
+            content = e.to_json()
+            status = e.status
+        headers = {}
+        if status == 429:
+            headers["Retry-After"] = str(self.retry_after)
+        return httpx.Response(
+            status,
+            content=json.dumps(content).encode(),
+            headers={"Content-Type": "application/json", **headers},
+            request=request,
+        )
+
+    def _route(self, method: str, path: str) -> tuple[str, re.Match[str]]:
+        for route_method, pattern, endpoint in _ROUTES:
+            if method == route_method and (match := pattern.fullmatch(path)):
+                return endpoint, match
+        raise _FakeError(400, "invalid_request_url", f"{method} {path}")
+
+    def _dispatch(
+        self, endpoint: str, id: str | None, request: httpx.Request, body: Json
+    ) -> Json:
+        if endpoint == "pages.create":
+            return self._get_database(body["parent"]["database_id"]).create(body)
+        if endpoint == "blocks.children.list":
+            params = request.url.params
+            return self._get_database(id[:8]).children(
+                id,
+                start_cursor=int(params.get("start_cursor") or 0),
+                page_size=min(int(params.get("page_size") or 100), self.page_size),
+            )
+        if endpoint == "pages.retrieve":
+            return self._get_database(id[:24]).retrieve(id)
+        if endpoint == "pages.update":
+            return self._get_database(id[:24]).update(id, body)
+        db = self._get_database(id)
+        if endpoint == "databases.retrieve":
+            return db.schema
+        body["page_size"] = min(body.get("page_size") or 100, self.page_size)
+        return db.query(
+            body,
+            filter_properties=request.url.params.get_list("filter_properties"),
+        )
+
+    def _get_database(self, id: str) -> SyntheticDatabase:
+        for db_id, db in self.databases.items():
+            if db_id.startswith(id):
+                return db
+        raise _FakeError(404, "object_not_found", f"Could not find {id!r}.")
+
+    # Clients
+
+    def transport(self) -> _Transport:
+        return _Transport(self)
+
+    def client(self) -> notion_client.Client:
+        """Returns a client (with rate limit & retries) connected to the fake."""
+        options = notion_client.client.ClientOptions(auth=_FAKE_TOKEN)
+        transport = transportlib.get_options()
+        return clientlib._Client(options, client=transport.client(_Transport(self)))
+
+    def async_client(self) -> notion_client.AsyncClient:
+        options = notion_client.client.ClientOptions(auth=_FAKE_TOKEN)
+        transport = transportlib.get_options()
+        return clientlib._AsyncClient(
+            options, client=transport.async_client(_Transport(self))
+        )
+
+    @contextlib.contextmanager
+    def install(self, *, rate: float = 1e6) -> Iterator[None]:
+        """Route the `auto_notion` clients to the fake.
+
+        Args:
+            rate: Client-side rate limit (requests/second). Virtually
+                unlimited by default, as `latency` already models the server.
+        """
+        limiter = rate_limit.RateLimiter(rate)
+
+        # Only the `httpx` transport is replaced, so the clients are created by
+        # `utils.get_client` with the `transport.configure` options
+        @functools.cache
+        def get_http_client() -> httpx.Client:
+            return transportlib.get_options().client(_Transport(self))
+
+        @functools.cache
+        def get_async_http_client() -> httpx.AsyncClient:
+            return transportlib.get_options().async_client(_Transport(self))
+
+        with contextlib.ExitStack() as stack:
+            for obj, name, new in (
+                (transportlib, "get_http_client", get_http_client),
+                (transportlib, "get_async_http_client", get_async_http_client),
+                (rate_limit, "get_rate_limiter", lambda: limiter),
+            ):
+                stack.enter_context(mock.patch.object(obj, name, new))
+            stack.enter_context(
+                mock.patch.dict(os.environ, {"NOTION_API_TOKEN": _FAKE_TOKEN})
+            )
+            stack.callback(_clear_clients)
+            _clear_clients()
+            yield
+
+
+def _clear_clients() -> None:
+    utils.get_client.cache_clear()
+    utils.get_async_client.cache_clear()
+
+
+class _Transport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """`httpx` transport answering from the fake server."""
+
+    def __init__(self, server: FakeNotion):
+        self._server = server
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        if self._server.latency:
+            time.sleep(self._server.latency)
+        return self._server.handle(request)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        if self._server.latency:
+            await asyncio.sleep(self._server.latency)
+        return self._server.handle(request)
@@ -9,6 +9,17 @@ def json_to_str(json: Json) -> str:
     return "".join(parts)
 
 
+def is_plain(elem: Json) -> bool:
+    """Returns whether the rich text element is unformatted plain text."""
+    annotations = elem.get("annotations", {})
+    return (
+        elem.get("type", "text") == "text"
+        and elem.get("href") is None
+        and not any(v for k, v in annotations.items() if k != "color")
+        and annotations.get("color", "default") == "default"
+    )
+
+
 def str_to_json(text: str) -> Json:
     return [
         {
@@ -0,0 +1,136 @@
+"""HTTP transport of the Notion clients.
+
+```python
+from auto_notion import transport
+
+# Before creating the `Database`s
+transport.configure(max_connections=64, http2=True, read_timeout=30)
+```
+
+All the `auto_notion` clients share a single connection pool per process (one
+for the sync clients, used by every `Database`, `Property.api`,... and one for
+the async clients), so concurrent requests reuse the warm TLS connections.
+The pool is also shared by the clients of the different tokens (the token is
+sent with each request).
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import functools
+import typing
+from typing import Any
+
+if typing.TYPE_CHECKING:
+    import httpx
+
+
+@dataclasses.dataclass(frozen=True)
+class TransportOptions:
+    """Connection pool, timeouts & compression of the clients.
+
+    Attributes:
+        max_connections: Maximum number of concurrent connections
+        max_keepalive_connections: Idle connections kept open for reuse
+        keepalive_expiry: Seconds an idle connection is kept open
+        http2: Use HTTP/2 (requires `pip install httpx[http2]`)
+        connect_timeout: Seconds to establish a connection
+        read_timeout: Seconds to wait for the response data
+        write_timeout: Seconds to send the request data
+        pool_timeout: Seconds to wait for a free connection of the pool
+        compression: Request compressed (gzip) responses
+    """
+
+    max_connections: int = 32
+    max_keepalive_connections: int = 16
+    keepalive_expiry: float = 60.0
+    http2: bool = False
+    connect_timeout: float = 10.0
+    read_timeout: float = 60.0
+    write_timeout: float = 60.0
+    pool_timeout: float = 60.0
+    compression: bool = True
+
+    @property
+    def limits(self) -> httpx.Limits:
+        import httpx
+
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    @property
+    def timeout(self) -> httpx.Timeout:
+        import httpx
+
+        return httpx.Timeout(
+            connect=self.connect_timeout,
+            read=self.read_timeout,
+            write=self.write_timeout,
+            pool=self.pool_timeout,
+        )
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {"Accept-Encoding": "gzip, deflate" if self.compression else "identity"}
+
+    def client(self, transport: httpx.BaseTransport | None = None) -> httpx.Client:
+        import httpx
+
+        return httpx.Client(
+            limits=self.limits,
+            http2=self.http2,
+            timeout=self.timeout,
+            headers=self.headers,
+            transport=transport,
+        )
+
+    def async_client(
+        self, transport: httpx.AsyncBaseTransport | None = None
+    ) -> httpx.AsyncClient:
+        import httpx
+
+        return httpx.AsyncClient(
+            limits=self.limits,
+            http2=self.http2,
+            timeout=self.timeout,
+            headers=self.headers,
+            transport=transport,
+        )
+
+
+_options = TransportOptions()
+
+
+def get_options() -> TransportOptions:
+    return _options
+
+
+@functools.cache
+def get_http_client() -> httpx.Client:
+    """Process-wide connection pool of the sync clients (all tokens)."""
+    return _options.client()
+
+
+@functools.cache
+def get_async_http_client() -> httpx.AsyncClient:
+    """Process-wide connection pool of the async clients (all tokens)."""
+    return _options.async_client()
+
+
+def configure(**kwargs: Any) -> None:
+    """Update the process-wide `TransportOptions` (see attributes).
+
+    The clients are re-created with the new options, but already created
+    `Database`s keep their previous client.
+    """
+    global _options
+    from auto_notion import utils
+
+    _options = dataclasses.replace(_options, **kwargs)
+    get_http_client.cache_clear()
+    get_async_http_client.cache_clear()
+    utils.get_client.cache_clear()
+    utils.get_async_client.cache_clear()
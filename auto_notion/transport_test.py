@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import pytest
+
+import auto_notion
+from auto_notion import transport as transportlib
+from auto_notion import utils
+
+
+@pytest.fixture
+def headers(server, monkeypatch) -> list:
+    """Headers of the requests received by the fake server."""
+    headers = []
+    handle = server.handle
+
+    def record(request):
+        headers.append(request.headers)
+        return handle(request)
+
+    monkeypatch.setattr(server, "handle", record)
+    # Restore the default options after the test
+    monkeypatch.setattr(transportlib, "_options", transportlib.TransportOptions())
+    return headers
+
+
+def test_configure(server, headers):
+    db_json = server.add_database(num_rows=3)
+    old_client = utils.get_client().client
+    transportlib.configure(read_timeout=5, compression=False)
+
+    db = auto_notion.Database(db_json.id)
+    assert len(list(db)) == 3
+    assert db.api.client is not old_client
+    assert db.api.client.timeout.read == 5
+    assert headers and all(h["Accept-Encoding"] == "identity" for h in headers)
+
+
+def test_default_options(server, headers):
+    db_json = server.add_database(num_rows=3)
+    db = auto_notion.Database(db_json.id)
+    assert len(list(db)) == 3
+    options = transportlib.TransportOptions()
+    assert db.api.client.timeout.read == options.read_timeout
+    assert all(h["Accept-Encoding"] == "gzip, deflate" for h in headers)
+
+
+def test_shared_pool(server, headers):
+    db_json = server.add_database(num_rows=1)
+    client_a = utils.get_client("token-a")
+    client_b = utils.get_client("token-b")
+    # A single connection pool, but each client sends its own token
+    assert client_a is not client_b
+    assert client_a.client is client_b.client
+    assert utils.get_async_client("token-a").client is (
+        utils.get_async_client("token-b").client
+    )
+    client_a.databases.retrieve(db_json.id)
+    client_b.databases.retrieve(db_json.id)
+    client_a.databases.retrieve(db_json.id)
+    assert [h["Authorization"] for h in headers] == [
+        "Bearer token-a",
+        "Bearer token-b",
+        "Bearer token-a",
+    ]
@@ -7,20 +7,59 @@ import dataclasses
 import datetime
 import functools
 import os
-from typing import Any
+import pathlib
+import queue
+import tempfile
+import threading
+import typing
+from collections.abc import Iterator
+from typing import Any, TypeVar
 
-import notion_client
-from etils import epy
+from auto_notion import transport as transportlib
+
+if typing.TYPE_CHECKING:
+    import notion_client
 
 Json = Any
 
+_T = TypeVar("_T")
+
 
 @functools.cache
 def get_client(token: str | None = None) -> notion_client.Client:
-    options = notion_client.client.ClientOptions(
-        auth=os.environ["NOTION_API_TOKEN"],
+    """Process-wide client (default to `$NOTION_API_TOKEN`), see `transport.py`."""
+    from auto_notion import client as clientlib
+
+    return clientlib._Client(
+        _client_options(token), client=transportlib.get_http_client()
+    )
+
+
+@functools.cache
+def get_async_client(token: str | None = None) -> notion_client.AsyncClient:
+    from auto_notion import client as clientlib
+
+    return clientlib._AsyncClient(
+        _client_options(token), client=transportlib.get_async_http_client()
+    )
+
+
+def _client_options(token: str | None) -> notion_client.client.ClientOptions:
+    import notion_client
+
+    return notion_client.client.ClientOptions(
+        auth=token or os.environ["NOTION_API_TOKEN"],
     )
-    return notion_client.Client(options)
+
+
+def atomic_write(path: pathlib.Path, content: str) -> None:
+    """Write the file such as concurrent readers never see partial content."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        "w", dir=path.parent, suffix=".tmp", delete=False
+    ) as f:
+        f.write(content)
+    os.replace(f.name, path)
 
 
 def to_snake_case(name: str) -> str:
@@ -37,3 +76,52 @@ def to_snake_case(name: str) -> str:
         else:
             continue
     return "".join(chars)
+
+
+_DONE = object()
+
+
+def prefetch(it: Iterator[_T], *, depth: int) -> Iterator[_T]:
+    """Consume `it` in a background thread, at most `depth` items ahead.
+
+    Items are read ahead of the one currently processed by the consumer, so at
+    most `depth` items are fetched but not yet returned.
+    """
+    if depth < 1:
+        raise ValueError(f"Invalid prefetch depth: {depth}")
+    q = queue.SimpleQueue()
+    # One slot per item fetched ahead, released when the consumer takes it
+    slots = threading.Semaphore(depth)
+    stop = threading.Event()
+
+    def _acquire() -> bool:
+        # Regularly check whether the consumer is gone, so the thread exits
+        # even when the iterator is never exhausted.
+        while not stop.is_set():
+            if slots.acquire(timeout=0.1):
+                return True
+        return False
+
+    def _worker():
+        try:
+            while _acquire():
+                item = next(it, _DONE)
+                q.put((item, None))
+                if item is _DONE:
+                    return
+        except BaseException as e:  # Forward the error to the consumer
+            q.put((_DONE, e))
+
+    thread = threading.Thread(target=_worker, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = q.get()
+            if error is not None:
+                raise error
+            if item is _DONE:
+                return
+            slots.release()
+            yield item
+    finally:
+        stop.set()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import notion_client
+import pytest
+
+import auto_notion
+from auto_notion import utils
+
+
+def _wait_for(condition, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out"
+        time.sleep(0.01)
+
+
+@pytest.mark.parametrize("depth", [1, 3])
+def test_prefetch_depth(depth):
+    produced = []
+
+    def source():
+        for i in range(10):
+            produced.append(i)
+            yield i
+
+    it = utils.prefetch(source(), depth=depth)
+    assert next(it) == 0
+    # While the first item is processed, `depth` items are read ahead
+    _wait_for(lambda: len(produced) == 1 + depth)
+    time.sleep(0.05)
+    assert len(produced) == 1 + depth
+    assert list(it) == list(range(1, 10))
+
+
+def test_prefetch_error():
+    def source():
+        yield 1
+        raise ValueError("Boom")
+
+    it = utils.prefetch(source(), depth=2)
+    assert next(it) == 1
+    with pytest.raises(ValueError, match="Boom"):
+        next(it)
+
+
+def test_prefetch_abandoned():
+    def source():
+        yield from range(100)
+
+    num_threads = threading.active_count()
+    it = utils.prefetch(source(), depth=2)
+    assert next(it) == 0
+    it.close()  # The consumer stops early
+    _wait_for(lambda: threading.active_count() == num_threads)
+
+
+def test_prefetch_invalid_depth():
+    with pytest.raises(ValueError, match="depth"):
+        next(utils.prefetch(iter([1]), depth=0))
+
+
+def test_prefetch_view(server):
+    server.page_size = 10
+    db_json = server.add_database(num_rows=95)
+    db = auto_notion.Database(db_json.id)
+    assert [row.name for row in db.prefetch(2)] == [row.name for row in db]
+
+    # API errors are raised in the consumer thread
+    missing = auto_notion.Database("ffffffff-0000-4000-8000-000000000000")
+    with pytest.raises(notion_client.APIResponseError, match="Could not find"):
+        list(missing.prefetch(2))
@@ -92,12 +92,9 @@ def main():
 
     print("Processing rows...")
 
-    # TODO(epot): Should filter done & archived
-    for row in db:
-        if row.done:
-            continue
-        if not row.snooze:
-            continue
+    # Only fetch the rows to update (archived pages are never returned)
+    rows = db[~db.filter.done & db.filter.snooze.is_not_empty]
+    for row in rows.select("snooze", "reminder"):
         if row.snooze not in OPTION_TO_DELTA:
             raise ValueError(f"Unexpected snooze value: {row.snooze!r}")
 
@@ -107,8 +104,9 @@ def main():
 
         reminder = delta_fn().date()
         print(f"{row.snooze} -> {reminder}")
-        row.reminder = reminder
-        row.snooze = None
+        with row.batch():  # Single update for both fields
+            row.reminder = reminder
+            row.snooze = None
     print("Processing done!")
 
 
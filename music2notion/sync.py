@@ -1,19 +1,26 @@
 """Music to notion."""
 
 import os
+import pathlib
+import sys
 
-import my_chrome_bookmarks
-import notion_client
+# Root of the repo, for `applications/common.py` (`sys.path` only contains the
+# script directory when run as `python music2notion/sync.py`)
+_ROOT_DIR = pathlib.Path(__file__).resolve().parent.parent
+if os.fspath(_ROOT_DIR) not in sys.path:
+    sys.path.append(os.fspath(_ROOT_DIR))
+
+import my_chrome_bookmarks  # pylint: disable=g-import-not-at-top
+
+from applications import common  # pylint: disable=g-import-not-at-top
 
 
 class NotionAPI:
     """Notion API."""
 
     def __init__(self) -> None:
-        self._notion = notion_client.Client(
-            auth=os.environ["NOTION_TOKEN"],
-            # log_level=logging.DEBUG,
-        )
+        # Shares the connection pool, rate limiter & retries of `auto_notion`
+        self._notion = common.get_client(os.environ["NOTION_TOKEN"])
 
 
 class Database: